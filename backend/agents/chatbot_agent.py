@@ -1,65 +1,166 @@
+import asyncio
 import cohere
 try:
     from cohere import CohereAPIError
 except ImportError:
     from cohere.core.api_error import ApiError as CohereAPIError
-from typing import Dict, Any, List
-from core.cohere_client import cohere_client
-from utils.conversation_helpers import get_conversation_history, create_new_conversation, save_message_to_conversation
-from tools.mcp_tools import add_task, list_tasks, update_task, complete_task, delete_task, get_user_info
+from typing import Callable, Dict, Any, List, Optional
+import os
+from core.resilience import CircuitOpenError
+from sqlmodel import Session
+from utils.conversation_helpers import (
+    verify_conversation_owner, get_recent_messages, fit_history_to_budget,
+    create_new_conversation, save_message_to_conversation
+)
+from agents.intent_router import IntentRouter, Intent, intent_router, CHAT_INTENT_ROUTER_ENABLED
+from agents.tool_executor import ToolExecutor
+from llm import LLMProvider, LLM_MODEL, create_llm_provider
+from utils.message_writer import MessageWriteBehindQueue, message_queue, CHAT_MESSAGE_WRITE_BEHIND
+from agents.response_cache import ChatResponseCache, response_cache
+from agents.summarizer import ConversationSummarizer, CHAT_SUMMARY_ENABLED
+from models.database import Conversation
+from tools.mcp_tools import add_task, list_tasks, update_task, complete_task, delete_task, get_user_info, search_tasks
 
 
-class ChatbotAgent:
-    def __init__(self):
-        self.tools = {
-            "add_task": {
-                "description": "Add a new task",
-                "parameter_definitions": {
-                    "title": {"type": "str", "description": "Title of the task", "required": True},
-                    "description": {"type": "str", "description": "Optional description of the task"}
-                }
-            },
-            "list_tasks": {
-                "description": "List tasks with optional status filter",
-                "parameter_definitions": {
-                    "status": {"type": "str", "description": "Optional status filter (all, pending, completed)"}
-                }
-            },
-            "update_task": {
-                "description": "Update an existing task",
-                "parameter_definitions": {
-                    "task_id": {"type": "str", "description": "The numeric ID of the task to update (NOT your user ID)", "required": True},
-                    "title": {"type": "str", "description": "Optional new title"},
-                    "description": {"type": "str", "description": "Optional new description"}
-                }
-            },
-            "complete_task": {
-                "description": "Mark a task as completed",
-                "parameter_definitions": {
-                    "task_id": {"type": "str", "description": "The numeric ID of the task to complete (NOT your user ID)", "required": True}
-                }
-            },
-            "delete_task": {
-                "description": "Delete a task",
-                "parameter_definitions": {
-                    "task_id": {"type": "str", "description": "The numeric ID of the task to delete (NOT your user ID)", "required": True}
-                }
-            },
-            "get_user_info": {
-                "description": "Get current user information",
-                "parameter_definitions": {}
-            },
-            "search_tasks": {
-                "description": "Search for tasks by title",
-                "parameter_definitions": {
-                    "query": {"type": "str", "description": "The search query to match against task titles", "required": True}
-                }
-            }
+# History sent to the model per turn: at most this many recent messages,
+# further trimmed (oldest first) to an estimated token budget
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "20"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+
+# Model calls per turn (the last one must answer) and the turn's time budget
+CHAT_MAX_STEPS = max(1, int(os.getenv("CHAT_MAX_STEPS", "4")))
+CHAT_TURN_TIMEOUT = float(os.getenv("CHAT_TURN_TIMEOUT", "30"))
+
+# Text the model writes in different steps of a turn (e.g. a plan before its
+# tool calls, then the answer) is joined with this, streamed or not
+STEP_TEXT_SEPARATOR = "\n\n"
+
+conversation_summarizer = ConversationSummarizer(keep_recent=CHAT_HISTORY_MAX_MESSAGES)
+
+SYSTEM_PREAMBLE = "You are an intelligent task assistant. You have access to tools to manage the user's todo list. You MUST use these tools whenever a user asks to add, list, search, update, or delete tasks. IMPORTANT: If a user refers to a task by name, you MUST FIRST use `search_tasks` or `list_tasks` to find the correct numeric 'id'. You CANNOT guess the ID. You CANNOT use the title as the ID. Once you have the ID from the search/list result, use that ID in `update_task`, `complete_task`, or `delete_task`. If you don't find a task with search, tell the user you couldn't find it. Be concise and professional."
+
+# Reply while the Cohere circuit breaker is open; simple commands still work
+DEGRADED_REPLY = (
+    "The assistant is temporarily unavailable. You can still use simple commands like "
+    "\"add task buy milk\", \"list my pending tasks\", \"complete task 3\" or \"delete task 3\"."
+)
+
+# Tool schema, Cohere payload and dispatch table are built once at import
+TOOL_DEFINITIONS = {
+    "add_task": {
+        "description": "Add a new task",
+        "parameter_definitions": {
+            "title": {"type": "str", "description": "Title of the task", "required": True},
+            "description": {"type": "str", "description": "Optional description of the task"}
+        }
+    },
+    "list_tasks": {
+        "description": "List tasks with optional status filter",
+        "parameter_definitions": {
+            "status": {"type": "str", "description": "Optional status filter (all, pending, completed)"},
+            "limit": {"type": "int", "description": "Optional maximum number of tasks to return"}
+        }
+    },
+    "update_task": {
+        "description": "Update an existing task",
+        "parameter_definitions": {
+            "task_id": {"type": "str", "description": "The numeric ID of the task to update (NOT your user ID)", "required": True},
+            "title": {"type": "str", "description": "Optional new title"},
+            "description": {"type": "str", "description": "Optional new description"}
+        }
+    },
+    "complete_task": {
+        "description": "Mark a task as completed",
+        "parameter_definitions": {
+            "task_id": {"type": "str", "description": "The numeric ID of the task to complete (NOT your user ID)", "required": True}
         }
+    },
+    "delete_task": {
+        "description": "Delete a task",
+        "parameter_definitions": {
+            "task_id": {"type": "str", "description": "The numeric ID of the task to delete (NOT your user ID)", "required": True}
+        }
+    },
+    "get_user_info": {
+        "description": "Get current user information",
+        "parameter_definitions": {}
+    },
+    "search_tasks": {
+        "description": "Search for tasks by title and description; partial words and typos still match",
+        "parameter_definitions": {
+            "query": {"type": "str", "description": "The search query to match against task titles and descriptions", "required": True},
+            "limit": {"type": "int", "description": "Optional maximum number of tasks to return"}
+        }
+    }
+}
+
+COHERE_TOOLS = [
+    {
+        "name": tool_name,
+        "description": tool_info["description"],
+        "parameter_definitions": tool_info["parameter_definitions"]
+    }
+    for tool_name, tool_info in TOOL_DEFINITIONS.items()
+]
+
+TOOL_DISPATCH = {
+    "add_task": add_task,
+    "list_tasks": list_tasks,
+    "update_task": update_task,
+    "complete_task": complete_task,
+    "delete_task": delete_task,
+    "get_user_info": get_user_info,
+    "search_tasks": search_tasks,
+}
+
+
+def _default_session() -> Session:
+    from core.database import engine
+    return Session(engine)
+
+
+class ChatbotAgent:
+    def __init__(
+        self, summarizer: ConversationSummarizer = None, router: IntentRouter = None, model: str = LLM_MODEL,
+        cache: ChatResponseCache = None, llm: LLMProvider = None,
+        message_writer: Optional[MessageWriteBehindQueue] = None,
+        session_factory: Callable[[], Session] = _default_session
+    ):
+        self.llm = llm or create_llm_provider(model)
+        self.summarizer = summarizer or conversation_summarizer
+        self.router = router or intent_router
+        self.response_cache = cache or response_cache
+        # Write-behind message persistence (None writes messages inline)
+        self.message_writer = message_writer or (message_queue if CHAT_MESSAGE_WRITE_BEHIND else None)
+        # Opens the session of each chat turn (tests pass their own database)
+        self.session_factory = session_factory
+        self.tool_executor = ToolExecutor(self.execute_tool)
+        self.model = self.llm.model
+        self.tools = TOOL_DEFINITIONS
+        self.cohere_tools = COHERE_TOOLS
 
     def process_message(self, user_id: str, message: str, conversation_id: int = None):
+        """
+        Synchronous wrapper around process_message_async for scripts and tests.
+        """
+        async def run():
+            try:
+                return await self.process_message_async(user_id, message, conversation_id)
+            finally:
+                if self.message_writer is not None:
+                    await self.message_writer.close()
+
+        return asyncio.run(run())
+
+    async def process_message_async(self, user_id: str, message: str, conversation_id: int = None):
         """
         Process a user message and return the AI response.
+
+        LLM calls go through the async LLM provider and all database work
+        (including tool execution) runs in worker threads, so a chat turn
+        never blocks the event loop. The whole turn shares one session:
+        ownership is verified once, and writes are committed together per
+        stage (opening, each tool round, assistant reply).
         
         Args:
             user_id: ID of the user sending the message
@@ -69,136 +170,48 @@ class ChatbotAgent:
         Returns:
             Dictionary with response, conversation_id, and any tool calls
         """
-        # Get or create conversation
-        if conversation_id is None:
-            from core.database import get_session
-            with next(get_session()) as db:
-                conversation = create_new_conversation(db, user_id)
-                conversation_id = conversation.id
-        else:
-            # Verify conversation belongs to user
-            from core.database import get_session
-            with next(get_session()) as db:
-                conversation_history = get_conversation_history(db, conversation_id, user_id)
-                if conversation_history is None:
-                    return {
-                        "response": "Error: Conversation not found or access denied.",
-                        "conversation_id": conversation_id,
-                        "tool_calls": []
-                    }
-
-        # Save user message to conversation
-        from core.database import get_session
-        with next(get_session()) as db:
-            save_message_to_conversation(db, conversation_id, user_id, "user", message)
-
-        # Get conversation history for context
-        with next(get_session()) as db:
-            history = get_conversation_history(db, conversation_id, user_id)
-            chat_history = []
-            for msg in history:
-                chat_history.append({
-                    "role": "USER" if msg.role == "user" else "CHATBOT",
-                    "message": msg.content
-                })
+        with self.session_factory() as db:
+            return await self._process_turn(db, user_id, message, conversation_id)
+
+    async def _process_turn(self, db: Session, user_id: str, message: str, conversation_id: int = None):
+        """
+        Run a chat turn against the given unit-of-work session.
+        """
+        # Get or create conversation, save the user message and load history
+        prepared = await self._open_turn(db, user_id, message, conversation_id)
+        if prepared is None:
+            return {
+                "response": "Error: Conversation not found or access denied.",
+                "conversation_id": conversation_id,
+                "tool_calls": []
+            }
+        conversation_id, chat_history, system_preamble, user_saved = prepared
 
         try:
-            # Prepare the tools for Cohere
-            tools = []
-            for tool_name, tool_info in self.tools.items():
-                tool_def = {
-                    "name": tool_name,
-                    "description": tool_info["description"],
-                    "parameter_definitions": tool_info["parameter_definitions"]
+            # Simple commands are answered without calling Cohere
+            intent = self._route(message)
+            if intent is not None:
+                tool_call, ai_response = await self._run_intent(db, intent, user_id)
+                await self._store_reply(db, conversation_id, user_id, ai_response, user_saved)
+                self._schedule_summary(conversation_id)
+                return {
+                    "response": ai_response,
+                    "conversation_id": conversation_id,
+                    "tool_calls": [tool_call]
                 }
-                tools.append(tool_def)
 
-            # Call Cohere with tools - Let Cohere handle multi-step natively
-            system_preamble = "You are an intelligent task assistant. You have access to tools to manage the user's todo list. You MUST use these tools whenever a user asks to add, list, search, update, or delete tasks. IMPORTANT: If a user refers to a task by name, you MUST FIRST use `search_tasks` or `list_tasks` to find the correct numeric 'id'. You CANNOT guess the ID. You CANNOT use the title as the ID. Once you have the ID from the search/list result, use that ID in `update_task`, `complete_task`, or `delete_task`. If you don't find a task with search, tell the user you couldn't find it. Be concise and professional."
-            
-            all_tool_calls = []
-            ai_response = ""
-            
-            # Initial call - Cohere will handle multi-step internally
-            response = cohere_client.chat(
-                model="command-r-08-2024",
-                message=message,
-                chat_history=chat_history[:-1],  # Exclude current message
-                tools=tools,
-                preamble=system_preamble
-                # Note: No force_single_step, allowing multi-step reasoning
-            )
-
-            # If tool calls were made, execute them and get final response
-            if response.tool_calls:
-                tool_results_for_cohere = []
-                
-                for tool_call in response.tool_calls:
-                    tool_name = tool_call.name
-                    tool_parameters = tool_call.parameters
-
-                    # Execute the tool
-                    tool_result = self.execute_tool(tool_name, tool_parameters, user_id)
-                    
-                    tool_results_for_cohere.append({
-                        "call": tool_call,
-                        "outputs": [tool_result]
-                    })
-                    
-                    all_tool_calls.append({
-                        "name": tool_name,
-                        "arguments": tool_parameters,
-                        "result": tool_result
-                    })
-
-                # Get final response with tool results
-                final_response = cohere_client.chat(
-                    model="command-r-08-2024",
-                    message=message,
-                    chat_history=chat_history[:-1],
-                    tools=tools,
-                    tool_results=tool_results_for_cohere,
-                    preamble=system_preamble
-                )
-                
-                # Check if there are more tool calls (multi-turn scenario)
-                if final_response.tool_calls:
-                    # Execute second round of tool calls
-                    for tool_call in final_response.tool_calls:
-                        tool_name = tool_call.name
-                        tool_parameters = tool_call.parameters
-                        tool_result = self.execute_tool(tool_name, tool_parameters, user_id)
-                        
-                        tool_results_for_cohere.append({
-                            "call": tool_call,
-                            "outputs": [tool_result]
-                        })
-                        
-                        all_tool_calls.append({
-                            "name": tool_name,
-                            "arguments": tool_parameters,
-                            "result": tool_result
-                        })
-                    
-                    # Get truly final response
-                    final_response = cohere_client.chat(
-                        model="command-r-08-2024",
-                        message="",  # Empty message for continuation
-                        chat_history=chat_history[:-1],
-                        tools=tools,
-                        tool_results=tool_results_for_cohere,
-                        force_single_step=True,  # Force final answer
-                        preamble=system_preamble
-                    )
-                
-                ai_response = final_response.text
-            else:
-                # No tool calls, direct response
-                ai_response = response.text
+            # Let Cohere call tools step by step until it answers, unless an
+            # identical read-only turn can be replayed from the response cache
+            outcome = {}
+            async for event in self._run_cached_steps(db, user_id, message, chat_history, system_preamble, stream=False):
+                if event["event"] == "done":
+                    outcome = event
+            ai_response = outcome["response"]
+            all_tool_calls = outcome["tool_calls"]
 
             # Save assistant response to conversation
-            with next(get_session()) as db:
-                save_message_to_conversation(db, conversation_id, user_id, "assistant", ai_response or "")
+            await self._store_reply(db, conversation_id, user_id, ai_response or "", user_saved)
+            self._schedule_summary(conversation_id)
 
             return {
                 "response": ai_response,
@@ -206,6 +219,18 @@ class ChatbotAgent:
                 "tool_calls": all_tool_calls
             }
 
+        except CircuitOpenError:
+            # Cohere is failing; answer without it instead of waiting on retries
+            try:
+                await asyncio.to_thread(db.rollback)
+                await self._store_reply(db, conversation_id, user_id, DEGRADED_REPLY, user_saved)
+            except:
+                pass
+            return {
+                "response": DEGRADED_REPLY,
+                "conversation_id": conversation_id,
+                "tool_calls": []
+            }
         except CohereAPIError as e:
             # Handle specific Cohere API errors
             print(f"DEBUG: Cohere API Error: {e}")
@@ -213,9 +238,8 @@ class ChatbotAgent:
             traceback.print_exc()
             error_response = f"Sorry, I encountered an API error: {str(e)}"
             try:
-                from core.database import get_session
-                with next(get_session()) as db:
-                    save_message_to_conversation(db, conversation_id, user_id, "assistant", error_response)
+                await asyncio.to_thread(db.rollback)
+                await self._store_reply(db, conversation_id, user_id, error_response, user_saved)
             except:
                 pass
             return {
@@ -230,9 +254,8 @@ class ChatbotAgent:
             import traceback
             traceback.print_exc()
             try:
-                from core.database import get_session
-                with next(get_session()) as db:
-                    save_message_to_conversation(db, conversation_id, user_id, "assistant", error_response)
+                await asyncio.to_thread(db.rollback)
+                await self._store_reply(db, conversation_id, user_id, error_response, user_saved)
             except:
                 pass
             return {
@@ -241,8 +264,391 @@ class ChatbotAgent:
                 "tool_calls": []
             }
 
+    async def stream_message(self, user_id: str, message: str, conversation_id: int = None):
+        """
+        Process a user message, yielding events as the turn progresses.
+
+        Emits a "conversation" event first, "tool_call_start"/"tool_call_end"
+        around each tool execution, "text" events for assistant tokens as they
+        arrive from Cohere, and a final "done" event with the same payload
+        process_message returns. The assistant message is persisted once the
+        model stream has finished.
+
+        Args:
+            user_id: ID of the user sending the message
+            message: The user's message
+            conversation_id: Optional ID of an existing conversation
 
-    def execute_tool(self, tool_name: str, parameters: Dict[str, Any], user_id: str) -> Any:
+        Yields:
+            Dictionaries with an "event" key and event-specific data
+        """
+        with self.session_factory() as db:
+            async for event in self._stream_turn(db, user_id, message, conversation_id):
+                yield event
+
+    async def _stream_turn(self, db: Session, user_id: str, message: str, conversation_id: int = None):
+        """
+        Stream a chat turn against the given unit-of-work session.
+        """
+        prepared = await self._open_turn(db, user_id, message, conversation_id)
+        if prepared is None:
+            yield {
+                "event": "error",
+                "response": "Error: Conversation not found or access denied.",
+                "conversation_id": conversation_id
+            }
+            return
+        conversation_id, chat_history, system_preamble, user_saved = prepared
+
+        yield {"event": "conversation", "conversation_id": conversation_id}
+
+        all_tool_calls = []
+        ai_response = ""
+        try:
+            # Simple commands are answered without calling Cohere
+            intent = self._route(message)
+            if intent is not None:
+                yield {"event": "tool_call_start", "name": intent.tool, "arguments": intent.parameters}
+                tool_call, ai_response = await self._run_intent(db, intent, user_id)
+                all_tool_calls.append(tool_call)
+                yield {
+                    "event": "tool_call_end",
+                    "name": intent.tool,
+                    "result": tool_call["result"],
+                    "duration_ms": tool_call["duration_ms"]
+                }
+                yield {"event": "text", "text": ai_response}
+            else:
+                async for event in self._run_cached_steps(db, user_id, message, chat_history, system_preamble, stream=True):
+                    if event["event"] == "done":
+                        ai_response = event["response"]
+                        all_tool_calls = event["tool_calls"]
+                    else:
+                        yield event
+
+        except CircuitOpenError:
+            ai_response = DEGRADED_REPLY
+            all_tool_calls = []
+            await asyncio.to_thread(db.rollback)
+            yield {"event": "text", "text": DEGRADED_REPLY}
+        except Exception as e:
+            print(f"CRITICAL ERROR in stream_message: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            ai_response = f"Sorry, I encountered an unexpected error: {str(e)}"
+            all_tool_calls = []
+            await asyncio.to_thread(db.rollback)
+            yield {"event": "error", "response": ai_response, "conversation_id": conversation_id}
+
+        # Save assistant response to conversation once the stream has closed
+        try:
+            await self._store_reply(db, conversation_id, user_id, ai_response or "", user_saved)
+        except Exception as e:
+            print(f"Error saving streamed assistant message: {str(e)}")
+        self._schedule_summary(conversation_id)
+
+        yield {
+            "event": "done",
+            "response": ai_response,
+            "conversation_id": conversation_id,
+            "tool_calls": all_tool_calls
+        }
+
+    async def _run_cached_steps(
+        self, db: Session, user_id: str, message: str, chat_history: List[Dict[str, str]],
+        system_preamble: str, stream: bool
+    ):
+        """
+        Run the step loop, or replay the reply of an identical read-only turn.
+
+        A turn is served from the response cache when the same user sent the
+        same message with the same history while their task list was
+        unchanged; otherwise its reply is cached if it only read tasks.
+        Yields the same events as _run_steps.
+        """
+        cache_key = self.response_cache.key(user_id, self.model, message, chat_history, system_preamble)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            if stream:
+                yield {"event": "text", "text": cached["response"]}
+            yield {"event": "done", "response": cached["response"], "tool_calls": cached["tool_calls"], "timed_out": False}
+            return
+
+        async for event in self._run_steps(db, user_id, message, chat_history, system_preamble, stream):
+            if event["event"] == "done" and not event["timed_out"]:
+                self.response_cache.store(cache_key, event["response"], event["tool_calls"])
+            yield event
+
+    async def _run_steps(
+        self, db: Session, user_id: str, message: str, chat_history: List[Dict[str, str]],
+        system_preamble: str, stream: bool
+    ):
+        """
+        Run the model/tool step loop of a chat turn.
+
+        Each step is one LLM call; when it asks for tools they are executed,
+        committed, and only their results are sent back with the
+        conversation state the provider returned. The loop stops as soon as the
+        model answers without tool calls. The last of CHAT_MAX_STEPS steps is
+        forced to answer, and once CHAT_TURN_TIMEOUT seconds have passed the
+        turn ends with a partial answer instead of waiting for the model.
+        The reply is the text of every step, joined by STEP_TEXT_SEPARATOR,
+        in both modes.
+
+        Args:
+            stream: Use chat_stream and yield "text" events as tokens arrive
+
+        Yields:
+            "tool_call_start", "tool_call_end" and (when streaming) "text"
+            events, then a final "done" event with the response text and the
+            executed tool calls
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CHAT_TURN_TIMEOUT
+        tools = self._build_cohere_tools()
+
+        all_tool_calls = []
+        ai_response = ""
+        chat_kwargs = {
+            "message": message,
+            "chat_history": chat_history,
+            "tools": tools,
+            "preamble": system_preamble
+        }
+        accumulated_results = []
+        timed_out = False
+
+        for step in range(CHAT_MAX_STEPS):
+            if step == CHAT_MAX_STEPS - 1:
+                chat_kwargs["force_single_step"] = True  # Force final answer
+
+            response = None
+            separator = STEP_TEXT_SEPARATOR if ai_response else ""
+            try:
+                if stream:
+                    events = self.llm.chat_stream(**chat_kwargs).__aiter__()
+                    try:
+                        while True:
+                            try:
+                                event = await asyncio.wait_for(events.__anext__(), deadline - loop.time())
+                            except StopAsyncIteration:
+                                break
+                            if event.type == "text" and event.text:
+                                text = separator + event.text
+                                separator = ""
+                                ai_response += text
+                                yield {"event": "text", "text": text}
+                            elif event.type == "end":
+                                response = event.response
+                    finally:
+                        # Release the HTTP stream if the deadline cut it short
+                        if hasattr(events, "aclose"):
+                            try:
+                                await events.aclose()
+                            except Exception:
+                                pass
+                else:
+                    response = await asyncio.wait_for(
+                        self.llm.chat(**chat_kwargs), deadline - loop.time()
+                    )
+                    if response.text:
+                        ai_response += separator + response.text
+            except asyncio.TimeoutError:
+                timed_out = True
+                break
+
+            tool_calls = response.tool_calls if response is not None else None
+            if not tool_calls or step == CHAT_MAX_STEPS - 1:
+                break
+
+            for tool_call in tool_calls:
+                yield {"event": "tool_call_start", "name": tool_call.name, "arguments": tool_call.parameters}
+
+            executed = await self._execute_tool_calls(tool_calls, user_id, db)
+            step_results = []
+            for tool_call, entry in zip(tool_calls, executed):
+                step_results.append({
+                    "call": tool_call,
+                    "outputs": [entry["result"]]
+                })
+                all_tool_calls.append(entry)
+                yield {
+                    "event": "tool_call_end",
+                    "name": entry["name"],
+                    "result": entry["result"],
+                    "duration_ms": entry["duration_ms"]
+                }
+
+            # Commit this step's tool writes together
+            await asyncio.to_thread(db.commit)
+
+            if response.chat_history:
+                # The returned history already holds the earlier steps
+                chat_kwargs["chat_history"] = response.chat_history
+                chat_kwargs["message"] = ""
+                chat_kwargs["tool_results"] = step_results
+            else:
+                accumulated_results.extend(step_results)
+                chat_kwargs["tool_results"] = accumulated_results
+
+            if loop.time() >= deadline:
+                timed_out = True
+                break
+
+        if timed_out:
+            partial = self._partial_answer(ai_response, all_tool_calls)
+            if stream:
+                yield {"event": "text", "text": partial[len(ai_response):]}
+            ai_response = partial
+
+        yield {"event": "done", "response": ai_response, "tool_calls": all_tool_calls, "timed_out": timed_out}
+
+    def _partial_answer(self, text: str, tool_calls: List[Dict[str, Any]]) -> str:
+        """
+        Build the reply for a turn that hit CHAT_TURN_TIMEOUT.
+        """
+        note = "Sorry, I ran out of time before finishing."
+        if tool_calls:
+            steps = ", ".join(call["name"] for call in tool_calls)
+            note += f" Steps already completed: {steps}."
+        return f"{text}\n\n{note}" if text else note
+
+    def _build_cohere_tools(self) -> List[Dict[str, Any]]:
+        """
+        Tool definitions in the format Cohere expects (precomputed).
+        """
+        return self.cohere_tools
+
+    async def _open_turn(self, db: Session, user_id: str, message: str, conversation_id: int = None):
+        """
+        Open a chat turn, persisting the user message inline or write-behind.
+
+        With the write-behind queue, earlier messages of the conversation are
+        flushed first so the history is complete, and the user message is
+        queued instead of inserted; its future is awaited before the reply is
+        queued (see _store_reply), so the insert overlaps the LLM call but a
+        turn never answers before the user's message is durable.
+
+        Returns:
+            _prepare_turn's tuple plus the user message future (None when
+            saved inline), or None if the conversation doesn't belong to the user
+        """
+        write_behind = self.message_writer is not None
+        if write_behind and conversation_id is not None:
+            await self.message_writer.wait_for_conversation(conversation_id)
+
+        prepared = await asyncio.to_thread(
+            self._prepare_turn, db, user_id, message, conversation_id, not write_behind
+        )
+        if prepared is None:
+            return None
+
+        user_saved = None
+        if write_behind:
+            user_saved = self.message_writer.enqueue(prepared[0], user_id, "user", message)
+        return (*prepared, user_saved)
+
+    async def _store_reply(self, db: Session, conversation_id: int, user_id: str, content: str, user_saved=None):
+        """
+        Persist the assistant reply once the user message is durable.
+        """
+        if self.message_writer is None:
+            await asyncio.to_thread(self._save_message, db, conversation_id, user_id, "assistant", content)
+            return
+        if user_saved is not None:
+            await user_saved
+        self.message_writer.enqueue(conversation_id, user_id, "assistant", content)
+
+    def _prepare_turn(
+        self, db: Session, user_id: str, message: str, conversation_id: int = None,
+        save_user_message: bool = True
+    ):
+        """
+        Open a chat turn (runs in a worker thread).
+
+        Creates the conversation or verifies its ownership once, loads the
+        recent history, and saves the user message (unless the caller queues
+        it), committing in a single round. Only the last CHAT_HISTORY_MAX_MESSAGES messages not yet covered
+        by the conversation summary are read, and they are trimmed further to
+        fit CHAT_HISTORY_TOKEN_BUDGET. The summary itself is appended to the
+        preamble.
+
+        Returns:
+            Tuple of (conversation_id, prior chat_history in Cohere's format,
+            preamble), or None if the conversation doesn't belong to the user
+        """
+        chat_history = []
+        preamble = SYSTEM_PREAMBLE
+        if conversation_id is None:
+            conversation = create_new_conversation(db, user_id, commit=False)
+            conversation_id = conversation.id
+        elif not verify_conversation_owner(db, conversation_id, user_id):
+            return None
+        else:
+            # Already in the session's identity map from the ownership check
+            conversation = db.get(Conversation, conversation_id)
+            if conversation.summary:
+                preamble = f"{SYSTEM_PREAMBLE}\n\nSummary of the earlier conversation: {conversation.summary}"
+            recent_messages = get_recent_messages(
+                db, conversation_id, CHAT_HISTORY_MAX_MESSAGES, after_id=conversation.summarized_until_id
+            )
+            for msg in recent_messages:
+                chat_history.append({
+                    "role": "USER" if msg.role == "user" else "CHATBOT",
+                    "message": msg.content
+                })
+
+        if save_user_message:
+            save_message_to_conversation(db, conversation_id, user_id, "user", message, commit=False)
+
+        db.commit()
+        return conversation_id, fit_history_to_budget(chat_history, CHAT_HISTORY_TOKEN_BUDGET), preamble
+
+    def _route(self, message: str):
+        """
+        Match the message against the intent fast-path, if it is enabled.
+        """
+        if not CHAT_INTENT_ROUTER_ENABLED:
+            return None
+        return self.router.route(message)
+
+    async def _run_intent(self, db: Session, intent: Intent, user_id: str):
+        """
+        Execute a recognized command directly and build the templated reply.
+
+        Returns:
+            Tuple of (tool call entry for the response, assistant reply)
+        """
+        [tool_call] = await self.tool_executor.run([(intent.tool, dict(intent.parameters))], user_id, db)
+        await asyncio.to_thread(db.commit)
+        tool_call["arguments"] = intent.parameters
+        return tool_call, intent.format_reply(intent.parameters, tool_call["result"])
+
+    async def _execute_tool_calls(self, tool_calls, user_id: str, db: Session) -> List[Dict[str, Any]]:
+        """
+        Execute Cohere tool calls through the tool executor.
+
+        Returns:
+            {"name", "arguments", "result", "duration_ms"} per call, in call order
+        """
+        return await self.tool_executor.run(
+            [(tool_call.name, tool_call.parameters) for tool_call in tool_calls], user_id, db
+        )
+
+    def _schedule_summary(self, conversation_id: int):
+        """
+        Let the summarizer condense older messages in the background.
+        """
+        if CHAT_SUMMARY_ENABLED:
+            self.summarizer.schedule(conversation_id)
+
+    def _save_message(self, db: Session, conversation_id: int, user_id: str, role: str, content: str):
+        """
+        Save a message to the conversation (runs in a worker thread).
+        """
+        save_message_to_conversation(db, conversation_id, user_id, role, content)
+
+    def execute_tool(self, tool_name: str, parameters: Dict[str, Any], user_id: str, db: Session = None) -> Any:
         # Add user_id to parameters for all tools
         parameters["user_id"] = user_id
         
@@ -253,24 +659,29 @@ class ChatbotAgent:
             tool_name: Name of the tool to execute
             parameters: Parameters for the tool
             user_id: ID of the user executing the tool
+            db: Optional session of the chat turn; tool writes are flushed
+                into it and committed by the caller
             
         Returns:
             Result of the tool execution
         """
-        if tool_name == "add_task":
-            return add_task(**parameters)
-        elif tool_name == "list_tasks":
-            return list_tasks(**parameters)
-        elif tool_name == "update_task":
-            return update_task(**parameters)
-        elif tool_name == "complete_task":
-            return complete_task(**parameters)
-        elif tool_name == "delete_task":
-            return delete_task(**parameters)
-        elif tool_name == "get_user_info":
-            return get_user_info(**parameters)
-        elif tool_name == "search_tasks":
-            from tools.mcp_tools import search_tasks
-            return search_tasks(**parameters)
-        else:
-            return {"error": f"Unknown tool: {tool_name}"}
\ No newline at end of file
+        tool = TOOL_DISPATCH.get(tool_name)
+        if tool is None:
+            return {"error": f"Unknown tool: {tool_name}"}
+        if db is not None:
+            parameters = {**parameters, "db": db}
+        return tool(**parameters)
+
+
+# One agent per model, shared by all requests; agents hold no per-request state
+_agents: Dict[str, ChatbotAgent] = {}
+
+
+def get_chatbot_agent(model: str = LLM_MODEL) -> ChatbotAgent:
+    """
+    Return the shared ChatbotAgent for a model, creating it on first use.
+    """
+    agent = _agents.get(model)
+    if agent is None:
+        agent = _agents.setdefault(model, ChatbotAgent(model=model))
+    return agent
\ No newline at end of file
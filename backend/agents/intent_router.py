@@ -0,0 +1,213 @@
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Pattern
+
+CHAT_INTENT_ROUTER_ENABLED = os.getenv("CHAT_INTENT_ROUTER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# A second command inside a matched message ("add task x and delete task 3")
+# makes it ambiguous, so it goes to the LLM instead
+_SECOND_COMMAND = re.compile(
+    r"\b(?:and|then|also)\s+(?:add|create|list|show|complete|finish|mark|delete|remove|update|rename)\b",
+    re.IGNORECASE
+)
+
+_STATUS_ALIASES = {
+    "all": "all",
+    "pending": "pending",
+    "open": "pending",
+    "incomplete": "pending",
+    "unfinished": "pending",
+    "completed": "completed",
+    "complete": "completed",
+    "done": "completed",
+    "finished": "completed",
+}
+
+
+@dataclass
+class Intent:
+    """
+    A chat message recognized as a single tool call.
+
+    Attributes:
+        name: Rule that matched, used for the hit counters
+        tool: Name of the tool in tools/mcp_tools.py to execute
+        parameters: Tool arguments extracted from the message
+        format_reply: Builds the assistant reply from the tool result
+    """
+    name: str
+    tool: str
+    parameters: Dict[str, Any]
+    format_reply: Callable[[Dict[str, Any], Any], str]
+
+
+@dataclass
+class _Rule:
+    name: str
+    tool: str
+    pattern: Pattern
+    extract: Callable[[re.Match], Optional[Dict[str, Any]]]
+    format_reply: Callable[[Dict[str, Any], Any], str]
+
+
+def _format_task_line(task: Dict[str, Any]) -> str:
+    mark = "x" if task.get("completed") else " "
+    return f"- [{mark}] #{task['id']} {task['title']}"
+
+
+def _reply_added(parameters: Dict[str, Any], result: Any) -> str:
+    if isinstance(result, dict) and result.get("error"):
+        return f"Sorry, I couldn't add that task: {result['error']}"
+    return f"Added task #{result['id']}: \"{result['title']}\"."
+
+
+def _reply_listed(parameters: Dict[str, Any], result: Any) -> str:
+    status = parameters.get("status", "all")
+    label = "" if status == "all" else f"{status} "
+    if not result:
+        return f"You have no {label}tasks."
+    lines = [
+        f"...and {task['omitted']} more" if "omitted" in task else _format_task_line(task)
+        for task in result
+    ]
+    return f"Here are your {label}tasks:\n" + "\n".join(lines)
+
+
+def _reply_completed(parameters: Dict[str, Any], result: Any) -> str:
+    if result.get("error"):
+        return f"I couldn't find task #{parameters['task_id']}."
+    return f"Marked task #{result['id']} \"{result['title']}\" as completed."
+
+
+def _reply_deleted(parameters: Dict[str, Any], result: Any) -> str:
+    if not result.get("success"):
+        return f"I couldn't find task #{parameters['task_id']}."
+    return f"Deleted task #{parameters['task_id']}."
+
+
+def _extract_title(match: re.Match) -> Optional[Dict[str, Any]]:
+    title = match.group("title").strip().strip("\"'").strip()
+    if not title or len(title) > 200:
+        return None
+    return {"title": title}
+
+
+def _extract_status(match: re.Match) -> Optional[Dict[str, Any]]:
+    status = (match.group("status") or "all").lower()
+    return {"status": _STATUS_ALIASES[status]}
+
+
+def _extract_task_id(match: re.Match) -> Optional[Dict[str, Any]]:
+    return {"task_id": match.group("task_id")}
+
+
+_POLITE = r"(?:(?:please|pls|can you|could you)\s+)?"
+_STATUS = r"(?P<status>" + "|".join(_STATUS_ALIASES) + r")"
+_TASK_REF = r"task\s+(?:(?:number|no\.?|id)\s+)?#?(?P<task_id>\d+)"
+_END = r"\s*(?:please)?\s*[.!?]*"
+
+DEFAULT_RULES = [
+    _Rule(
+        "add_task", "add_task",
+        re.compile(
+            _POLITE + r"(?:add|create)\s+(?:a\s+)?(?:new\s+)?(?:task|todo)\s*(?::|-|to|called|named)?\s+(?P<title>.+?)[.!]*",
+            re.IGNORECASE
+        ),
+        _extract_title, _reply_added
+    ),
+    _Rule(
+        "list_tasks", "list_tasks",
+        re.compile(
+            _POLITE + r"(?:list|show|display|get)(?:\s+me)?\s+(?:all\s+)?(?:of\s+)?(?:my\s+)?(?:" + _STATUS
+            + r"\s+)?(?:tasks|todos)" + _END,
+            re.IGNORECASE
+        ),
+        _extract_status, _reply_listed
+    ),
+    _Rule(
+        "list_tasks", "list_tasks",
+        re.compile(r"what\s+are\s+my\s+(?:" + _STATUS + r"\s+)?(?:tasks|todos)" + _END, re.IGNORECASE),
+        _extract_status, _reply_listed
+    ),
+    _Rule(
+        "complete_task", "complete_task",
+        re.compile(
+            _POLITE + r"(?:(?:complete|finish)\s+" + _TASK_REF
+            + r"|mark\s+" + _TASK_REF.replace("task_id", "mark_id")
+            + r"\s+as\s+(?:done|complete|completed|finished))" + _END,
+            re.IGNORECASE
+        ),
+        lambda match: {"task_id": match.group("task_id") or match.group("mark_id")},
+        _reply_completed
+    ),
+    _Rule(
+        "delete_task", "delete_task",
+        re.compile(_POLITE + r"(?:delete|remove)\s+" + _TASK_REF + _END, re.IGNORECASE),
+        _extract_task_id, _reply_deleted
+    ),
+]
+
+
+class IntentRouter:
+    """
+    Recognizes simple task commands so they can skip the LLM.
+
+    Every rule must match the whole message; anything else, including
+    messages that chain several commands, is a miss and goes to Cohere.
+    Hit and miss counts are kept so the share of turns served without an
+    LLM round-trip can be monitored.
+    """
+
+    def __init__(self, rules: Optional[List[_Rule]] = None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses = 0
+
+    def route(self, message: str) -> Optional[Intent]:
+        """
+        Match a message against the rules.
+
+        Returns:
+            The recognized intent, or None if the message needs the LLM
+        """
+        intent = self._match((message or "").strip())
+        with self._lock:
+            if intent is None:
+                self._misses += 1
+            else:
+                self._hits[intent.name] = self._hits.get(intent.name, 0) + 1
+        return intent
+
+    def _match(self, message: str) -> Optional[Intent]:
+        if not message or "\n" in message or _SECOND_COMMAND.search(message):
+            return None
+        for rule in self.rules:
+            match = rule.pattern.fullmatch(message)
+            if match is None:
+                continue
+            parameters = rule.extract(match)
+            if parameters is None:
+                return None
+            return Intent(rule.name, rule.tool, parameters, rule.format_reply)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit-rate counters since startup.
+        """
+        with self._lock:
+            hits = sum(self._hits.values())
+            total = hits + self._misses
+            return {
+                "enabled": CHAT_INTENT_ROUTER_ENABLED,
+                "hits": hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "hits_by_intent": dict(self._hits),
+            }
+
+
+intent_router = IntentRouter()
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+from core.cache import TTLCache
+from core.task_events import get_task_version, task_cache_ttl
+from agents.tool_executor import READ_ONLY_TOOLS
+
+CHAT_RESPONSE_CACHE_SIZE = int(os.getenv("CHAT_RESPONSE_CACHE_SIZE", "2048"))
+CHAT_RESPONSE_CACHE_TTL = float(os.getenv("CHAT_RESPONSE_CACHE_TTL", "300"))
+
+
+def normalize_message(message: str) -> str:
+    """
+    Lowercase a message and collapse whitespace and trailing punctuation.
+    """
+    return re.sub(r"\s+", " ", message.strip().lower()).rstrip(" .!?")
+
+
+class ChatResponseCache:
+    """
+    LRU cache of assistant replies for turns that only read tasks.
+
+    Keys combine the user, the model, the normalized message, a hash of the
+    (trimmed) history and preamble sent to Cohere, and the user's task-list
+    version. Any add/update/complete/delete bumps that version, so entries
+    describing the old task list are never served again and simply age out.
+    Versions only follow other workers' writes through the Postgres change
+    feed bridge; without it entries live at most task_cache_ttl() seconds.
+    Turns that changed tasks, or were cut short, are not cached.
+    """
+
+    def __init__(self, maxsize: int = CHAT_RESPONSE_CACHE_SIZE, ttl: float = CHAT_RESPONSE_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def key(
+        self, user_id: str, model: str, message: str, chat_history: List[Dict[str, str]], preamble: str
+    ) -> str:
+        """
+        Build the cache key for a turn; call it before running the turn.
+        """
+        context = json.dumps([chat_history, preamble], sort_keys=True, default=str)
+        context_hash = hashlib.sha256(context.encode()).hexdigest()
+        raw = json.dumps([user_id, get_task_version(user_id), model, normalize_message(message), context_hash])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached {"response", "tool_calls"} for a key, if any.
+        """
+        return self._cache.get(key)
+
+    def store(self, key: str, response: str, tool_calls: List[Dict[str, Any]]) -> bool:
+        """
+        Cache a turn's reply if every tool it called was read-only.
+
+        Returns:
+            True if the reply was cached
+        """
+        if not response or not tool_calls:
+            return False
+        if any(tool_call["name"] not in READ_ONLY_TOOLS for tool_call in tool_calls):
+            return False
+        self._cache.set(key, {"response": response, "tool_calls": tool_calls}, ttl=task_cache_ttl())
+        return True
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        stats["ttl_cap"] = task_cache_ttl()
+        return stats
+
+
+response_cache = ChatResponseCache()
@@ -0,0 +1,143 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, List, Optional, Set
+from sqlmodel import select
+from models.database import Conversation, Message
+
+# Summarize once at least this many messages have fallen out of the history
+# window sent to the model
+CHAT_SUMMARY_BATCH_SIZE = int(os.getenv("CHAT_SUMMARY_BATCH_SIZE", "10"))
+CHAT_SUMMARY_ENABLED = os.getenv("CHAT_SUMMARY_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+SUMMARY_PREAMBLE = (
+    "You maintain a running summary of a conversation between a user and a todo-list assistant. "
+    "Merge the previous summary with the new messages into one short paragraph. Keep task names, "
+    "task IDs and decisions the user made; drop greetings and small talk."
+)
+
+
+async def llm_summarize(prompt: str) -> str:
+    """
+    Summarize a prompt with the chat agent's LLM provider.
+    """
+    from agents.chatbot_agent import get_chatbot_agent
+
+    response = await get_chatbot_agent().llm.chat(message=prompt, preamble=SUMMARY_PREAMBLE)
+    return response.text
+
+
+def build_summary_prompt(previous_summary: Optional[str], messages: List[Message]) -> str:
+    """
+    Build the prompt asking the LLM to fold new messages into the summary.
+    """
+    transcript = "\n".join(
+        f"{'User' if msg.role == 'user' else 'Assistant'}: {msg.content}" for msg in messages
+    )
+    return (
+        f"Previous summary:\n{previous_summary or '(none)'}\n\n"
+        f"New messages:\n{transcript}\n\n"
+        "Updated summary:"
+    )
+
+
+class ConversationSummarizer:
+    """
+    Condenses older messages of a conversation into Conversation.summary.
+
+    Runs off the request path: schedule() starts a background task after a
+    chat turn, and at most one summarization per conversation runs at a time.
+    The LLM is any async callable taking a prompt and returning text, so tests
+    can pass a stub.
+
+    Args:
+        keep_recent: Number of newest messages left out of the summary because
+            they are still sent to the model verbatim
+        llm: Async callable returning the summary text for a prompt
+        batch_size: Minimum number of messages to fold in per summarization
+    """
+
+    def __init__(
+        self,
+        keep_recent: int,
+        llm: Callable[[str], Awaitable[str]] = llm_summarize,
+        batch_size: int = CHAT_SUMMARY_BATCH_SIZE,
+    ):
+        self.llm = llm
+        self.keep_recent = keep_recent
+        self.batch_size = batch_size
+        self._in_flight: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, conversation_id: int):
+        """
+        Start summarizing a conversation in the background, if not already running.
+        """
+        if conversation_id in self._in_flight:
+            return
+        self._in_flight.add(conversation_id)
+        task = asyncio.get_running_loop().create_task(self._run(conversation_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, conversation_id: int):
+        try:
+            await self.summarize(conversation_id)
+        except Exception as e:
+            print(f"Error summarizing conversation {conversation_id}: {str(e)}")
+        finally:
+            self._in_flight.discard(conversation_id)
+
+    async def summarize(self, conversation_id: int) -> bool:
+        """
+        Fold messages older than the recent window into the stored summary.
+
+        Returns:
+            True if the summary was updated, False if there was not enough
+            new history to summarize
+        """
+        pending = await asyncio.to_thread(self._load_pending, conversation_id)
+        if pending is None:
+            return False
+        previous_summary, messages = pending
+
+        summary = await self.llm(build_summary_prompt(previous_summary, messages))
+        if not summary:
+            return False
+
+        await asyncio.to_thread(self._store_summary, conversation_id, summary.strip(), messages[-1].id)
+        return True
+
+    def _load_pending(self, conversation_id: int):
+        """
+        Load the current summary and the unsummarized messages outside the recent window.
+        """
+        from core.database import get_session
+        with next(get_session()) as db:
+            conversation = db.get(Conversation, conversation_id)
+            if conversation is None:
+                return None
+
+            statement = select(Message).where(Message.conversation_id == conversation_id)
+            if conversation.summarized_until_id is not None:
+                statement = statement.where(Message.id > conversation.summarized_until_id)
+            messages = db.exec(statement.order_by(Message.id)).all()
+
+            older = messages[:-self.keep_recent] if self.keep_recent else messages
+            if len(older) < self.batch_size:
+                return None
+            for msg in older:
+                db.expunge(msg)
+            return conversation.summary, older
+
+    def _store_summary(self, conversation_id: int, summary: str, summarized_until_id: int):
+        from core.database import get_session
+        with next(get_session()) as db:
+            conversation = db.get(Conversation, conversation_id)
+            # Another worker may have summarized further in the meantime
+            if conversation is None or (conversation.summarized_until_id or 0) >= summarized_until_id:
+                return
+            conversation.summary = summary
+            conversation.summarized_until_id = summarized_until_id
+            db.add(conversation)
+            db.commit()
+
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlmodel import Session
+
+# Tools that only read; they may run concurrently, each in its own session
+READ_ONLY_TOOLS = frozenset({"list_tasks", "search_tasks", "get_user_info"})
+
+# Upper bound on read-only tools running at once (each holds a pool connection)
+CHAT_TOOL_MAX_CONCURRENCY = int(os.getenv("CHAT_TOOL_MAX_CONCURRENCY", "4"))
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of one model response.
+
+    Consecutive read-only calls run concurrently in worker threads, each in a
+    dedicated session since a Session must not be shared between threads.
+    Mutating calls act as barriers: they run one at a time, in the order the
+    model issued them, inside the turn's session so the caller can commit
+    them together. Results come back in the original call order with the
+    time each tool took.
+
+    Args:
+        execute_tool: Callable (tool_name, parameters, user_id, db) -> result,
+            normally ChatbotAgent.execute_tool
+        max_concurrency: Maximum number of read-only tools running at once
+    """
+
+    def __init__(
+        self,
+        execute_tool: Callable[[str, Dict[str, Any], str, Optional[Session]], Any],
+        max_concurrency: int = CHAT_TOOL_MAX_CONCURRENCY,
+    ):
+        self.execute_tool = execute_tool
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def run(
+        self, tool_calls: Sequence[Tuple[str, Dict[str, Any]]], user_id: str, db: Session
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls, parallelizing independent reads.
+
+        Args:
+            tool_calls: (tool name, parameters) pairs in the order the model issued them
+            user_id: ID of the user the tools act for
+            db: Session of the chat turn; mutations are flushed into it
+
+        Returns:
+            One {"name", "arguments", "result", "duration_ms"} entry per call,
+            in call order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        wrote = False
+
+        index = 0
+        while index < len(tool_calls):
+            name, parameters = tool_calls[index]
+            if name not in READ_ONLY_TOOLS:
+                results[index] = await asyncio.to_thread(self._timed_call, name, parameters, user_id, db)
+                wrote = True
+                index += 1
+                continue
+
+            batch_end = index
+            while batch_end < len(tool_calls) and tool_calls[batch_end][0] in READ_ONLY_TOOLS:
+                batch_end += 1
+
+            if batch_end - index == 1:
+                # Nothing to overlap with; reuse the turn's session
+                results[index] = await asyncio.to_thread(self._timed_call, name, parameters, user_id, db)
+            else:
+                if wrote:
+                    # Make earlier writes of this round visible to the readers' sessions
+                    await asyncio.to_thread(db.commit)
+                    wrote = False
+
+                async def run_read(position: int):
+                    read_name, read_parameters = tool_calls[position]
+                    async with semaphore:
+                        results[position] = await asyncio.to_thread(
+                            self._timed_call, read_name, read_parameters, user_id, None
+                        )
+
+                await asyncio.gather(*(run_read(position) for position in range(index, batch_end)))
+            index = batch_end
+
+        return results
+
+    def _timed_call(
+        self, name: str, parameters: Dict[str, Any], user_id: str, db: Optional[Session]
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = self.execute_tool(name, parameters, user_id, db)
+        return {
+            "name": name,
+            "arguments": parameters,
+            "result": result,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
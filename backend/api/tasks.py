@@ -1,24 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from sqlmodel import Session, select
 from models.database import Task, User
-from schemas.task import TaskRead, TaskCreate, TaskUpdate
-from dependencies import get_current_active_user, get_db
-from core.security import verify_token
+from schemas.task import (
+    TaskRead, TaskCreate, TaskUpdate, TaskSummary,
+    TaskBulkRequest, TaskBulkItemResult, TaskBulkResponse, TaskChanges, TaskFeedToken
+)
+from dependencies import get_current_active_user, get_db, get_task_feed_user
+from core.security import verify_token, create_task_feed_token, TASK_FEED_TOKEN_TTL
+from core.pagination import encode_cursor, decode_cursor, paginate
+from core.cache import TTLCache
+from core.task_events import record_task_change, register_task_listener, task_cache_ttl
+from core.task_feed import task_hub
+from utils.task_helpers import update_owned_task, toggle_owned_task, delete_owned_task, record_task_deletions
+from utils.task_search import search_owned_tasks
+from utils.task_sync import fetch_task_changes
+from sqlalchemy import func
 from datetime import datetime
+import asyncio
+import json
+import os
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_BULK_OPERATIONS = 500
+MAX_SEARCH_RESULTS = 100
+# Comment frames keep idle change feeds open through proxies
+TASK_FEED_HEARTBEAT_SECONDS = float(os.getenv("TASK_FEED_HEARTBEAT_SECONDS", "15"))
+
+# Keyset sort orders: sort key -> ((column, descending), ...), ending with
+# the primary key so the order is total
+TASK_SORT_ORDERS = {
+    "created": ((Task.created_at, True), (Task.id, True)),  # Most recent first
+    "title": ((Task.title, False), (Task.id, False)),
+    "due_date": ((Task.updated_at, True), (Task.id, True)),  # Assuming due_date is part of updated_at for now
+    "id": ((Task.id, False),),
+}
+TASK_SORT_TYPES = {
+    "created": (datetime, int),
+    "title": (str, int),
+    "due_date": (datetime, int),
+    "id": (int,),
+}
+
+# Per-user task summaries, dropped whenever that user's tasks change (kept
+# only briefly when other workers' changes can't reach this one)
+TASK_SUMMARY_CACHE_TTL = float(os.getenv("TASK_SUMMARY_CACHE_TTL", "30"))
+summary_cache = TTLCache(maxsize=10000, ttl=TASK_SUMMARY_CACHE_TTL)
+register_task_listener(summary_cache.delete)
+
 
 @router.get("/tasks", response_model=List[TaskRead])
 def get_tasks(
+    response: Response,
     status: Optional[str] = None,
     sort: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all tasks for the authenticated user
+    Get a page of tasks for the authenticated user
+
+    Results are paginated with an opaque keyset cursor: when more tasks are
+    available, the X-Next-Cursor response header holds the cursor to pass
+    back as ?cursor= for the next page.
     """
     # Build query with user isolation
     query = select(Task).where(Task.user_id == current_user.id)
@@ -30,18 +80,144 @@ def get_tasks(
         elif status == "pending":
             query = query.where(Task.completed == False)
 
-    # Apply sorting if provided
-    if sort == "title":
-        query = query.order_by(Task.title)
-    elif sort == "created":
-        query = query.order_by(Task.created_at.desc())  # Most recent first
-    elif sort == "due_date":  # Assuming due_date is part of updated_at for now
-        query = query.order_by(Task.updated_at.desc())
+    # Apply sorting and the page window
+    sort_key = sort if sort in TASK_SORT_ORDERS else "id"
+    columns = TASK_SORT_ORDERS[sort_key]
+    after = decode_cursor(cursor, sort_key, TASK_SORT_TYPES[sort_key]) if cursor else None
+    query = paginate(query, columns, limit, after)
 
     tasks = db.exec(query).all()
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            sort_key, [getattr(last, column.key) for column, _ in columns]
+        )
     return tasks
 
 
+@router.get("/tasks/summary", response_model=TaskSummary)
+def get_task_summary(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get task counts for the authenticated user in a single aggregate query
+    """
+    summary = summary_cache.get(current_user.id)
+    if summary is not None:
+        return summary
+
+    total, completed = db.exec(
+        select(
+            func.count(Task.id),
+            func.count(Task.id).filter(Task.completed == True)
+        ).where(Task.user_id == current_user.id)
+    ).one()
+    pending = total - completed
+
+    if total == 0:
+        message = "You have no tasks yet."
+    elif pending == 0:
+        message = "All tasks completed!"
+    else:
+        message = f"You have {pending} pending task{'s' if pending != 1 else ''}."
+
+    # Tasks have no due date yet, so nothing can be overdue
+    summary = TaskSummary(total=total, pending=pending, completed=completed, overdue=0, message=message)
+    summary_cache.set(current_user.id, summary, ttl=task_cache_ttl())
+    return summary
+
+
+@router.get("/tasks/search", response_model=List[TaskRead])
+def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search the authenticated user's tasks by title and description
+
+    Results are ranked best match first; partial words and small typos
+    still match. The X-Total-Count response header holds the number of
+    matching tasks.
+    """
+    tasks, total = search_owned_tasks(db, current_user.id, q, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return tasks
+
+
+@router.get("/tasks/changes", response_model=TaskChanges)
+def get_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the tasks created, updated or deleted since a sync cursor
+
+    Call without ?since= for a full sync, then pass the returned cursor back
+    to receive only what changed. Deleted tasks are reported by ID. While
+    has_more is true, call again immediately with the new cursor. A cursor
+    older than the tombstone retention period gets 410 Gone and the client
+    must sync from scratch.
+    """
+    return fetch_task_changes(db, current_user.id, since, limit)
+
+
+@router.post("/tasks/events/token", response_model=TaskFeedToken)
+def create_task_events_token(current_user: User = Depends(get_current_active_user)):
+    """
+    Issue a short-lived token for opening the task change feed
+
+    Browsers' EventSource can't send the Authorization header, so web
+    clients open GET /api/tasks/events?token=... with this token instead. It
+    is only accepted by that endpoint and only to connect; fetch a new one
+    to reconnect.
+    """
+    return TaskFeedToken(token=create_task_feed_token(current_user.id), expires_in=TASK_FEED_TOKEN_TTL)
+
+
+@router.get("/tasks/events")
+async def task_events(
+    request: Request,
+    current_user: User = Depends(get_task_feed_user)
+):
+    """
+    Stream the authenticated user's task changes as Server-Sent Events
+
+    A "ready" event is sent on connect, then a "tasks_changed" event
+    whenever the user's tasks change, whether through this API, the chatbot
+    or another worker. Events carry no task data: on each one (and on
+    reconnect) the client fetches GET /api/tasks/changes with its cursor
+    instead of polling. Authenticate with the Authorization header or a
+    ?token= from POST /api/tasks/events/token.
+    """
+    subscription = task_hub.subscribe(current_user.id)
+
+    async def event_stream():
+        try:
+            yield f"event: ready\ndata: {json.dumps({'event': 'ready'})}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), TASK_FEED_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            task_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
 def create_task(
     task: TaskCreate,
@@ -73,12 +249,127 @@ def create_task(
     )
     
     db.add(db_task)
+    record_task_change(db, current_user.id)
     db.commit()
     db.refresh(db_task)
     
     return db_task
 
 
+def _validate_task_fields(title: Optional[str], description: Optional[str]) -> Optional[str]:
+    """
+    Return the validation error for a task's title/description, if any
+    """
+    if title is not None and (len(title) < 1 or len(title) > 200):
+        return "Task title must be between 1 and 200 characters"
+    if description is not None and len(description) > 1000:
+        return "Task description must be less than 1000 characters"
+    return None
+
+
+@router.post("/tasks/bulk", response_model=TaskBulkResponse)
+def bulk_tasks(
+    bulk: TaskBulkRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create, update, complete and delete many tasks in a single transaction
+
+    Ownership of every referenced task is checked with one query. Operations
+    are applied in the order create, update, complete, delete, and each item
+    gets its own result; items that fail validation or reference a missing
+    task are reported without aborting the rest. A request that both
+    modifies and deletes the same task is rejected.
+    """
+    operation_count = len(bulk.create) + len(bulk.update) + len(bulk.complete) + len(bulk.delete)
+    if operation_count > MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bulk request can contain at most {MAX_BULK_OPERATIONS} operations"
+        )
+
+    conflicting_ids = ({item.id for item in bulk.update} | set(bulk.complete)) & set(bulk.delete)
+    if conflicting_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tasks cannot be both modified and deleted in one request: {sorted(conflicting_ids)}"
+        )
+
+    # Load every referenced task owned by the user in one round-trip
+    referenced_ids = {item.id for item in bulk.update} | set(bulk.complete) | set(bulk.delete)
+    owned_tasks = {}
+    if referenced_ids:
+        owned_tasks = {
+            task.id: task
+            for task in db.exec(
+                select(Task).where(Task.id.in_(referenced_ids), Task.user_id == current_user.id)
+            ).all()
+        }
+
+    now = datetime.utcnow()
+    results = []
+    touched = []  # (result index, task) pairs to serialize after the flush
+
+    for item in bulk.create:
+        error = _validate_task_fields(item.title, item.description)
+        if error:
+            results.append(TaskBulkItemResult(op="create", success=False, error=error))
+            continue
+        db_task = Task(title=item.title, description=item.description, user_id=current_user.id)
+        db.add(db_task)
+        touched.append((len(results), db_task))
+        results.append(TaskBulkItemResult(op="create", success=True))
+
+    for item in bulk.update:
+        db_task = owned_tasks.get(item.id)
+        error = "Task not found" if db_task is None else _validate_task_fields(item.title, item.description)
+        if error:
+            results.append(TaskBulkItemResult(op="update", id=item.id, success=False, error=error))
+            continue
+        if item.title is not None:
+            db_task.title = item.title
+        if item.description is not None:
+            db_task.description = item.description
+        if item.completed is not None:
+            db_task.completed = item.completed
+        db_task.updated_at = now
+        touched.append((len(results), db_task))
+        results.append(TaskBulkItemResult(op="update", id=item.id, success=True))
+
+    for task_id in bulk.complete:
+        db_task = owned_tasks.get(task_id)
+        if db_task is None:
+            results.append(TaskBulkItemResult(op="complete", id=task_id, success=False, error="Task not found"))
+            continue
+        db_task.completed = True
+        db_task.updated_at = now
+        touched.append((len(results), db_task))
+        results.append(TaskBulkItemResult(op="complete", id=task_id, success=True))
+
+    deleted_ids = set()
+    for task_id in bulk.delete:
+        db_task = owned_tasks.get(task_id)
+        if db_task is None or task_id in deleted_ids:
+            results.append(TaskBulkItemResult(op="delete", id=task_id, success=False, error="Task not found"))
+            continue
+        db.delete(db_task)
+        deleted_ids.add(task_id)
+        results.append(TaskBulkItemResult(op="delete", id=task_id, success=True))
+
+    if touched or deleted_ids:
+        # Flush to assign IDs, serialize, then commit everything at once
+        db.flush()
+        for index, db_task in touched:
+            results[index].id = db_task.id
+            results[index].task = TaskRead(**db_task.model_dump())
+        record_task_deletions(db, current_user.id, deleted_ids)
+        record_task_change(db, current_user.id)
+        db.commit()
+
+    return TaskBulkResponse(results=results)
+
+
 @router.get("/tasks/{task_id}", response_model=TaskRead)
 def get_task(
     task_id: int,
@@ -116,21 +407,8 @@ def update_task(
     """
     Update a specific task for the authenticated user
     """
-    db_task = db.get(Task, task_id)
-    
-    if not db_task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
-    # Verify user owns the task
-    if db_task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
+    values = {}
+
     # Update fields if provided
     if task_update.title is not None:
         # Validate title length
@@ -139,7 +417,7 @@ def update_task(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Task title must be between 1 and 200 characters"
             )
-        db_task.title = task_update.title
+        values["title"] = task_update.title
     
     if task_update.description is not None:
         # Validate description length
@@ -148,16 +426,21 @@ def update_task(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Task description must be less than 1000 characters"
             )
-        db_task.description = task_update.description
+        values["description"] = task_update.description
     
     if task_update.completed is not None:
-        db_task.completed = task_update.completed
+        values["completed"] = task_update.completed
     
-    db_task.updated_at = datetime.utcnow()
+    # Single UPDATE ... WHERE id AND user_id ... RETURNING round-trip
+    db_task = update_owned_task(db, task_id, current_user.id, values)
+    
+    if not db_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
     
-    db.add(db_task)
     db.commit()
-    db.refresh(db_task)
     
     return db_task
 
@@ -171,22 +454,13 @@ def delete_task(
     """
     Delete a specific task for the authenticated user
     """
-    db_task = db.get(Task, task_id)
-    
-    if not db_task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
-    # Verify user owns the task
-    if db_task.user_id != current_user.id:
+    # Single DELETE ... WHERE id AND user_id ... RETURNING round-trip
+    if not delete_owned_task(db, task_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-    db.delete(db_task)
     db.commit()
     
     return
@@ -201,7 +475,8 @@ def toggle_task_completion(
     """
     Toggle the completion status of a task
     """
-    db_task = db.get(Task, task_id)
+    # Toggle completion status in the database, checking ownership in the same statement
+    db_task = toggle_owned_task(db, task_id, current_user.id)
     
     if not db_task:
         raise HTTPException(
@@ -209,19 +484,6 @@ def toggle_task_completion(
             detail="Task not found"
         )
     
-    # Verify user owns the task
-    if db_task.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
-    
-    # Toggle completion status
-    db_task.completed = not db_task.completed
-    db_task.updated_at = datetime.utcnow()
-    
-    db.add(db_task)
     db.commit()
-    db.refresh(db_task)
     
-    return db_task
\ No newline at end of file
+    return db_task
@@ -0,0 +1,75 @@
+"""
+Offline load test of the chat path with the fake LLM provider.
+
+Runs concurrent simulated users through ChatbotAgent (intent router, step
+loop, tool execution, database writes) against the configured DATABASE_URL,
+without calling Cohere, and prints latency percentiles and throughput.
+
+    LLM_PROVIDER=fake FAKE_LLM_LATENCY_MS=400 python benchmark_chat.py --users 20 --turns 10
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("LLM_PROVIDER", "fake")
+import argparse
+import asyncio
+import time
+from core.database import get_session
+from models.database import User
+from agents.chatbot_agent import ChatbotAgent
+
+MESSAGES = [
+    "add task buy milk",
+    "what do I still have to do?",
+    "list my pending tasks",
+    "search for milk",
+    "how many tasks did I finish?",
+    "add a reminder to call the bank",
+]
+
+
+def ensure_users(count: int):
+    with next(get_session()) as db:
+        for index in range(count):
+            user_id = f"bench_user_{index}"
+            if db.get(User, user_id) is None:
+                db.add(User(id=user_id, email=f"{user_id}@example.com", name=f"Bench {index}"))
+        db.commit()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_user(agent: ChatbotAgent, index: int, turns: int, latencies: list):
+    conversation_id = None
+    for turn in range(turns):
+        message = MESSAGES[(index + turn) % len(MESSAGES)]
+        started = time.perf_counter()
+        result = await agent.process_message_async(f"bench_user_{index}", message, conversation_id)
+        latencies.append(time.perf_counter() - started)
+        conversation_id = result["conversation_id"]
+
+
+async def main(users: int, turns: int):
+    ensure_users(users)
+    agent = ChatbotAgent()
+    latencies = []
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_user(agent, index, turns, latencies) for index in range(users)))
+    elapsed = time.perf_counter() - started
+
+    print(f"Provider: {agent.llm.stats()}")
+    print(f"Turns: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} turns/s)")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {label}: {percentile(latencies, fraction) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="Messages sent by each user")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.turns))
@@ -0,0 +1,72 @@
+"""
+Shared helpers for the test scripts that run against an in-memory SQLite
+database instead of the configured one.
+
+pytest loads this file on its own; scripts run directly import the helpers
+with `from conftest import make_session`.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from typing import Any, Dict, Iterable
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from models.database import Task, User
+
+OTHER_USER_ID = "other_user"
+
+
+def make_engine(create_tables: bool = True) -> Engine:
+    """
+    Fresh in-memory SQLite database, shared by every session and thread.
+
+    Args:
+        create_tables: Create the models' tables (off to test migrations)
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    if create_tables:
+        SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def make_session(*user_ids: str) -> Session:
+    """
+    Session on a fresh database holding the given users.
+    """
+    db = Session(make_engine())
+    for user_id in user_ids:
+        db.add(User(id=user_id, email=f"{user_id}@example.com"))
+    db.commit()
+    return db
+
+
+def make_task_session(user_id: str, tasks: Iterable[Dict[str, Any]] = (), foreign_title: str = "Not mine") -> Session:
+    """
+    Session on a fresh database with a user's tasks and one task of another
+    user (OTHER_USER_ID), which the user must never see or change.
+
+    Args:
+        user_id: Owner of the tasks
+        tasks: Task fields, one dict per task, added in order (IDs from 1)
+        foreign_title: Title of the other user's task, added last
+    """
+    db = make_session(user_id, OTHER_USER_ID)
+    for fields in tasks:
+        db.add(Task(user_id=user_id, **fields))
+    db.add(Task(user_id=OTHER_USER_ID, title=foreign_title))
+    db.commit()
+    return db
+
+
+def make_agent(db: Session, llm, **kwargs):
+    """
+    ChatbotAgent running its turns on db's database with the given LLM
+    provider and a response cache of its own.
+    """
+    from agents.chatbot_agent import ChatbotAgent
+    from agents.response_cache import ChatResponseCache
+
+    engine = db.get_bind()
+    kwargs.setdefault("cache", ChatResponseCache())
+    return ChatbotAgent(llm=llm, session_factory=lambda: Session(engine), **kwargs)
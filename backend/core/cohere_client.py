@@ -1,9 +1,22 @@
 import cohere
 import os
 from dotenv import load_dotenv
+from core.resilience import create_resilient_client
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Cohere client
-cohere_client = cohere.Client(api_key=os.getenv("COHERE_API_KEY"))
\ No newline at end of file
+# COHERE_BASE_URL can point the clients at a local fake server for testing
+COHERE_BASE_URL = os.getenv("COHERE_BASE_URL") or None
+COHERE_TIMEOUT = float(os.getenv("COHERE_TIMEOUT", "20"))
+
+# Initialize Cohere clients
+# The sync client is kept for scripts; request handlers use the async client
+# so a slow LLM round-trip never blocks the event loop. The async client is
+# wrapped with timeouts, retries, optional hedging and a circuit breaker.
+cohere_client = cohere.Client(
+    api_key=os.getenv("COHERE_API_KEY"), base_url=COHERE_BASE_URL, timeout=COHERE_TIMEOUT
+)
+async_cohere_client = create_resilient_client(
+    cohere.AsyncClient(api_key=os.getenv("COHERE_API_KEY"), base_url=COHERE_BASE_URL, timeout=COHERE_TIMEOUT)
+)
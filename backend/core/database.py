@@ -1,7 +1,13 @@
 from sqlmodel import create_engine
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, QueuePool
 from typing import Generator
 from contextlib import contextmanager
+from urllib.parse import urlparse
+import bisect
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,15 +16,159 @@ load_dotenv()
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _is_pgbouncer_url(url: str) -> bool:
+    # Neon exposes its PgBouncer endpoint as "<endpoint>-pooler.<region>..."
+    hostname = urlparse(url).hostname or ""
+    return "-pooler" in hostname.split(".")[0]
+
+
+# Connection pool configuration
+# DB_PGBOUNCER: the URL points at PgBouncer in transaction mode (auto-detected
+#   for Neon "-pooler" hosts). PgBouncer already pools server connections, so
+#   the app defaults to NullPool and skips pre-ping.
+# DB_POOL_CLASS: "queue" (default) or "null" (one connection per checkout,
+#   used by the Vercel entry point in index.py).
+DB_PGBOUNCER = _env_bool("DB_PGBOUNCER", bool(DATABASE_URL) and _is_pgbouncer_url(DATABASE_URL))
+DB_POOL_CLASS = os.getenv("DB_POOL_CLASS", "null" if DB_PGBOUNCER else "queue").strip().lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Neon suspends idle computes and drops their connections; recycle well before that
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", not DB_PGBOUNCER)
+
+# Upper bounds (in milliseconds) of the checkout wait time histogram buckets
+WAIT_TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolStats:
+    """
+    Thread-safe counters for connection checkouts and their wait times.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.wait_histogram = [0] * (len(WAIT_TIME_BUCKETS_MS) + 1)
+
+    def record_checkout(self, wait_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.wait_histogram[bisect.bisect_left(WAIT_TIME_BUCKETS_MS, wait_ms)] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in WAIT_TIME_BUCKETS_MS] + [f">{WAIT_TIME_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each connection checkout waited.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_checkout((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class TimedNullPool(NullPool):
+    """
+    NullPool that records how long opening each connection took.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        connection = super().connect()
+        pool_stats.record_checkout((time.perf_counter() - start) * 1000)
+        return connection
+
+
+def _engine_options() -> dict:
+    options = {"echo": False, "pool_pre_ping": DB_POOL_PRE_PING}
+    if DB_POOL_CLASS == "null":
+        options["poolclass"] = TimedNullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
 # Create the database engine if URL is available
 if DATABASE_URL:
-    engine = create_engine(DATABASE_URL, echo=False)
+    engine = create_engine(DATABASE_URL, **_engine_options())
 else:
     print("⚠️ WARNING: DATABASE_URL is not set!")
     engine = None
 
 
+def get_pool_stats() -> dict:
+    """
+    Return the pool configuration, current occupancy and checkout telemetry.
+    """
+    stats = {
+        "pool_class": DB_POOL_CLASS,
+        "pgbouncer": DB_PGBOUNCER,
+        "pre_ping": DB_POOL_PRE_PING,
+    }
+    if engine is not None and isinstance(engine.pool, QueuePool):
+        pool = engine.pool
+        stats.update(
+            size=pool.size(),
+            max_overflow=DB_MAX_OVERFLOW,
+            timeout=DB_POOL_TIMEOUT,
+            recycle=DB_POOL_RECYCLE,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # overflow() counts up from -pool_size until the base pool is full
+            overflow=max(pool.overflow(), 0),
+        )
+    stats.update(pool_stats.snapshot())
+    return stats
+
+
 def get_session() -> Generator:
     from sqlmodel import Session
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -30,4 +30,11 @@ class ValidationErrorException(HTTPException):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=message
-        )
\ No newline at end of file
+        )
+
+class SyncCursorExpiredException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync cursor has expired; sync again without a cursor"
+        )
@@ -0,0 +1,72 @@
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+import base64
+import json
+from sqlalchemy import and_, or_
+from core.exceptions import ValidationErrorException
+
+
+def encode_cursor(key: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key name and the last row's sort values as an opaque cursor.
+    """
+    payload = {
+        "k": key,
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for the given sort key.
+
+    Raises:
+        ValidationErrorException: If the cursor is malformed or was issued
+            for a different sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload.get("k") != key or len(payload.get("v", [])) != len(types):
+            raise ValueError("cursor does not match the requested sort order")
+        return [
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(payload["v"], types)
+        ]
+    except (ValueError, TypeError, AttributeError, json.JSONDecodeError):
+        raise ValidationErrorException("Invalid pagination cursor")
+
+
+def keyset_condition(columns: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """
+    Build the WHERE clause selecting rows strictly after the given sort values.
+
+    Args:
+        columns: (column, descending) pairs in sort order; the last one must
+            be unique (e.g. the primary key) to make the order total
+        values: Sort values of the last row of the previous page
+
+    Returns:
+        SQL expression equivalent to a row-value comparison, expanded so it
+        works on both PostgreSQL and SQLite
+    """
+    clauses = []
+    for index, (column, descending) in enumerate(columns):
+        equal_prefix = [prior == value for (prior, _), value in zip(columns[:index], values[:index])]
+        after = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+def paginate(query, columns: Sequence[Tuple[Any, bool]], limit: int, after: Optional[Sequence[Any]] = None):
+    """
+    Apply keyset ordering, the "after" position and a limit to a select.
+
+    One extra row is fetched so callers can tell whether another page exists.
+    """
+    if after is not None:
+        query = query.where(keyset_condition(columns, after))
+    order_by = [column.desc() if descending else column.asc() for column, descending in columns]
+    return query.order_by(*order_by).limit(limit + 1)
@@ -0,0 +1,203 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import os
+import sqlite3
+import threading
+import time
+
+
+def _roll_window(
+    stored_window: int, current: int, previous: int, window_id: int
+) -> Tuple[int, int]:
+    """
+    Shift stored counters so they describe window_id and the window before it.
+    """
+    if window_id == stored_window:
+        return current, previous
+    if window_id == stored_window + 1:
+        return 0, current
+    return 0, 0
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for per-key request counters of fixed windows.
+
+    Implementations keep, per key, the count of the current window and of the
+    window before it, so every operation touches a single record.
+    """
+
+    @abstractmethod
+    def increment(self, key: str, window_id: int, amount: int = 1) -> Tuple[int, int]:
+        """
+        Atomically add amount to the key's count for window_id.
+
+        Returns:
+            Tuple of (count in window_id, count in the previous window)
+        """
+
+    @abstractmethod
+    def evict_idle(self, window_id: int) -> int:
+        """
+        Drop keys with no hits in window_id or the window before it.
+
+        Returns:
+            Number of evicted keys
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Process-local counters; each uvicorn worker enforces its own limit.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, List[int]] = {}  # key -> [window_id, current, previous]
+        self._lock = threading.Lock()
+
+    def increment(self, key: str, window_id: int, amount: int = 1) -> Tuple[int, int]:
+        with self._lock:
+            stored_window, current, previous = self._counters.get(key, (window_id, 0, 0))
+            current, previous = _roll_window(stored_window, current, previous, window_id)
+            current += amount
+            self._counters[key] = [window_id, current, previous]
+            return current, previous
+
+    def evict_idle(self, window_id: int) -> int:
+        with self._lock:
+            idle = [key for key, (stored_window, _, _) in self._counters.items() if stored_window < window_id - 1]
+            for key in idle:
+                del self._counters[key]
+            return len(idle)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._counters)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Counters in a local SQLite file shared by all workers on the host.
+
+    Stands in for a networked store such as Redis: every worker opening the
+    same file sees the same counters, and increments are serialized by
+    SQLite's write lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, window_id INTEGER NOT NULL, "
+                "current INTEGER NOT NULL, previous INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def increment(self, key: str, window_id: int, amount: int = 1) -> Tuple[int, int]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_id, current, previous FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            stored_window, current, previous = row if row else (window_id, 0, 0)
+            current, previous = _roll_window(stored_window, current, previous, window_id)
+            current += amount
+            conn.execute(
+                "INSERT INTO rate_limits (key, window_id, current, previous) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET window_id = excluded.window_id, "
+                "current = excluded.current, previous = excluded.previous",
+                (key, window_id, current, previous),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return current, previous
+
+    def evict_idle(self, window_id: int) -> int:
+        cursor = self._connect().execute("DELETE FROM rate_limits WHERE window_id < ?", (window_id - 1,))
+        return cursor.rowcount
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding-window counter rate limiter with O(1) work per check.
+
+    The request rate is estimated as the current fixed window's count plus
+    the previous window's count weighted by how much of it still overlaps
+    the sliding window. Idle keys are evicted by a background thread.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        backend: Optional[RateLimitBackend] = None,
+        eviction_interval: Optional[float] = None,
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+        self.eviction_interval = eviction_interval if eviction_interval is not None else window_seconds
+        self._eviction_thread: Optional[threading.Thread] = None
+        self._eviction_lock = threading.Lock()
+
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Record a request for key and return whether it is within the limit.
+
+        Rejected requests are not counted.
+        """
+        self._ensure_eviction()
+        now = time.time() if now is None else now
+        window_id = int(now // self.window_seconds)
+        elapsed_fraction = (now % self.window_seconds) / self.window_seconds
+
+        current, previous = self.backend.increment(key, window_id)
+        estimated = previous * (1 - elapsed_fraction) + current
+        if estimated > self.limit:
+            self.backend.increment(key, window_id, -1)
+            return False
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return self.backend.evict_idle(int(now // self.window_seconds))
+
+    def _ensure_eviction(self):
+        if self._eviction_thread is not None or self.eviction_interval <= 0:
+            return
+        with self._eviction_lock:
+            if self._eviction_thread is None:
+                self._eviction_thread = threading.Thread(
+                    target=self._eviction_loop, name="rate-limit-eviction", daemon=True
+                )
+                self._eviction_thread.start()
+
+    def _eviction_loop(self):
+        while True:
+            time.sleep(self.eviction_interval)
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"Rate limit eviction failed: {e}")
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """
+    Build the backend selected by RATE_LIMIT_BACKEND ("memory" or "sqlite").
+    """
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower()
+    if backend == "sqlite":
+        return SQLiteRateLimitBackend(os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.db"))
+    return InMemoryRateLimitBackend()
@@ -0,0 +1,338 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+import asyncio
+import os
+import random
+import threading
+import time
+
+try:
+    import httpx
+    _TRANSPORT_ERRORS: Tuple[type, ...] = (httpx.TransportError,)
+except ImportError:
+    _TRANSPORT_ERRORS = ()
+
+# HTTP statuses worth retrying: rate limiting and upstream/server failures
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling the upstream while the circuit breaker is open.
+    """
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed LLM call may succeed if sent again.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError) + _TRANSPORT_ERRORS):
+        return True
+    # cohere's ApiError carries the HTTP status of the failed response
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over a sliding time window.
+
+    The circuit opens when at least min_calls calls finished in the last
+    window_seconds and the share of failures reached error_rate. While open,
+    calls fail fast; after cooldown_seconds one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        min_calls: int = 10,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+    ):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, failed)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Return whether a call may go to the upstream right now.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        self._record(False)
+
+    def record_failure(self):
+        self._record(True)
+
+    def record_cancelled(self):
+        """
+        The call was cancelled before it had an outcome (turn deadline, client gone).
+
+        Says nothing about the upstream, so nothing is recorded, but a
+        half-open trial is released so the next call can be the trial.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def _record(self, failed: bool):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open(now)
+                else:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+                self._outcomes.popleft()
+
+            failures = sum(1 for _, outcome_failed in self._outcomes if outcome_failed)
+            if (
+                self.state == self.CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.error_rate
+            ):
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            return {"state": self.state, "recent_calls": len(self._outcomes), "recent_failures": failures}
+
+
+class LatencyTracker:
+    """
+    Keeps the latest call durations to estimate latency percentiles.
+    """
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class ResilientAsyncClient:
+    """
+    Wraps an async LLM client (cohere.AsyncClient) with fault handling.
+
+    Every chat call gets a timeout and up to max_retries retries with full
+    jitter exponential backoff on retryable errors. When hedge_percentile is
+    set, a second identical request is started if the first hasn't answered
+    within that latency percentile, and whichever finishes first wins. A
+    circuit breaker fails calls fast with CircuitOpenError while the
+    upstream error rate is high.
+
+    Streams are retried only until their first event; after that an error
+    is passed to the caller, which has already shown part of the answer.
+    Other attributes are forwarded to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        timeout: float = 20.0,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 4.0,
+        hedge_percentile: float = 0.0,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.client = client
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.hedged_calls = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+    async def chat(self, **kwargs):
+        return await self._call(lambda: self.client.chat(**kwargs))
+
+    async def chat_stream(self, **kwargs):
+        attempt = 0
+        while True:
+            self._check_breaker()
+            started = time.monotonic()
+            events = self.client.chat_stream(**kwargs).__aiter__()
+            try:
+                first = await asyncio.wait_for(events.__anext__(), self.timeout)
+            except StopAsyncIteration:
+                self.breaker.record_success()
+                return
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                # Cancelled (CancelledError) before the upstream answered
+                self.breaker.record_cancelled()
+                raise
+
+            self.latency.record(time.monotonic() - started)
+            self.breaker.record_success()
+            yield first
+            async for event in events:
+                yield event
+            return
+
+    async def _call(self, make_call: Callable[[], Awaitable[Any]]):
+        attempt = 0
+        while True:
+            self._check_breaker()
+            started = time.monotonic()
+            try:
+                result = await self._attempt(make_call)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The upstream answered (e.g. a bad request); it is healthy
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                # Cancelled (CancelledError) before the upstream answered
+                self.breaker.record_cancelled()
+                raise
+
+            self.latency.record(time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _attempt(self, make_call: Callable[[], Awaitable[Any]]):
+        hedge_after = self._hedge_delay()
+        if hedge_after is None:
+            return await asyncio.wait_for(make_call(), self.timeout)
+
+        deadline = time.monotonic() + self.timeout
+        pending = {asyncio.ensure_future(make_call())}
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                wait_for = deadline - time.monotonic()
+                if not hedged:
+                    wait_for = min(wait_for, hedge_after)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, wait_for), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+                if time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError()
+                if not hedged and (pending or last_error is None):
+                    hedged = True
+                    self.hedged_calls += 1
+                    pending.add(asyncio.ensure_future(make_call()))
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile <= 0 or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: a random delay up to the exponential cap
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM upstream is unavailable (circuit open)")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Breaker state, latency percentiles and hedging count for monitoring.
+        """
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            "breaker": self.breaker.stats(),
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedged_calls": self.hedged_calls,
+        }
+
+
+def create_resilient_client(client: Any) -> ResilientAsyncClient:
+    """
+    Wrap a client with the policy configured by the COHERE_* environment variables.
+    """
+    return ResilientAsyncClient(
+        client,
+        timeout=float(os.getenv("COHERE_TIMEOUT", "20")),
+        max_retries=int(os.getenv("COHERE_MAX_RETRIES", "2")),
+        retry_base_delay=float(os.getenv("COHERE_RETRY_BASE_DELAY", "0.5")),
+        hedge_percentile=float(os.getenv("COHERE_HEDGE_PERCENTILE", "0")),
+        breaker=CircuitBreaker(
+            error_rate=float(os.getenv("COHERE_BREAKER_ERROR_RATE", "0.5")),
+            min_calls=int(os.getenv("COHERE_BREAKER_MIN_CALLS", "10")),
+            window_seconds=float(os.getenv("COHERE_BREAKER_WINDOW", "60")),
+            cooldown_seconds=float(os.getenv("COHERE_BREAKER_COOLDOWN", "30")),
+        ),
+    )
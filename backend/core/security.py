@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import hmac
 import jwt
 import os
+import time
 from dotenv import load_dotenv
 from fastapi import HTTPException, status
 from sqlmodel import Session, select
 from models.database import User
 from core.database import get_session
+from core.cache import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -15,11 +19,56 @@ load_dotenv()
 SECRET_KEY = os.getenv("BETTER_AUTH_SECRET")
 ALGORITHM = "HS256"
 
+# Verified token payloads (bounded by each token's own exp) and user rows,
+# so hot users authenticate without a database round-trip
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "300"))
+
+token_cache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE, ttl=AUTH_TOKEN_CACHE_TTL)
+user_cache = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL)
+
+# Browsers' EventSource can't send an Authorization header, so the task change
+# feed also takes a short-lived token in its URL. Its audience claim makes the
+# regular token check (verify_token) reject it for every other endpoint.
+TASK_FEED_TOKEN_AUDIENCE = "task_events"
+TASK_FEED_TOKEN_TTL = int(os.getenv("TASK_FEED_TOKEN_TTL", "60"))
+
+# Ops token for the /health/* telemetry endpoints (pool occupancy, breaker
+# state, queue and feed internals); they stay closed while it is unset
+HEALTH_TOKEN = os.getenv("HEALTH_TOKEN") or None
+
+
+def _token_cache_key(token: str) -> str:
+    # Don't keep raw bearer tokens around in memory
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_user(user_id: str):
+    """
+    Drop a cached user row, e.g. after a profile update.
+    """
+    user_cache.delete(user_id)
+
+
+def clear_auth_cache():
+    """
+    Drop all cached token payloads and user rows.
+    """
+    token_cache.clear()
+    user_cache.clear()
+
 
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify the JWT token and return the payload if valid
     """
+    cache_key = _token_cache_key(token)
+    cached_payload = token_cache.get(cache_key)
+    if cached_payload is not None:
+        return cached_payload
+
     try:
         if not SECRET_KEY:
             print("❌ Error: BETTER_AUTH_SECRET is not set in environment!")
@@ -29,6 +78,9 @@ def verify_token(token: str) -> Optional[dict]:
         if user_id is None:
             print(f"❌ Error: token has no user_id. Payload: {payload}")
             return None
+        exp = payload.get("exp")
+        ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+        token_cache.set(cache_key, payload, ttl=ttl)
         return payload
     except jwt.exceptions.ExpiredSignatureError:
         print("❌ Error: Token has expired")
@@ -41,6 +93,42 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def create_task_feed_token(user_id: str) -> str:
+    """
+    Issue a token that only opens the user's task change feed, for
+    TASK_FEED_TOKEN_TTL seconds.
+    """
+    expire = datetime.utcnow() + timedelta(seconds=TASK_FEED_TOKEN_TTL)
+    return jwt.encode(
+        {"user_id": user_id, "aud": TASK_FEED_TOKEN_AUDIENCE, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM
+    )
+
+
+def verify_health_token(token: Optional[str]) -> bool:
+    """
+    Check a token against HEALTH_TOKEN (always False while it is unset).
+    """
+    if not HEALTH_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), HEALTH_TOKEN.encode())
+
+
+def get_task_feed_user(token: str) -> User:
+    """
+    Get the user of a token issued by create_task_feed_token
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=TASK_FEED_TOKEN_AUDIENCE)
+    except jwt.exceptions.InvalidTokenError:
+        payload = None
+    if payload is None or payload.get("user_id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired task feed token",
+        )
+    return _user_from_payload(payload)
+
+
 def get_current_user(token: str) -> Optional[User]:
     """
     Get the current user from the token
@@ -57,7 +145,13 @@ def get_current_user(token: str) -> Optional[User]:
             detail="Could not validate credentials - verification failed",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+    return _user_from_payload(payload)
+
+
+def _user_from_payload(payload: dict) -> User:
+    """
+    Load (or create on first use) the user a verified token payload names
+    """
     user_id = payload.get("user_id")
     if user_id is None:
         raise HTTPException(
@@ -66,6 +160,10 @@ def get_current_user(token: str) -> Optional[User]:
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
     # Query the user from the database
     from sqlmodel import Session as SQLSession
     from core.database import engine
@@ -90,5 +188,6 @@ def get_current_user(token: str) -> Optional[User]:
         else:
             # Detach from session to avoid issues when session closes
             session.expunge(user)
-    
+
+    user_cache.set(user_id, user)
     return user
\ No newline at end of file
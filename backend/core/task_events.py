@@ -0,0 +1,105 @@
+from typing import Callable, Dict, List, Optional, Set
+import os
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Session.info key holding user IDs whose tasks changed in the open transaction
+_PENDING_KEY = "pending_task_changes"
+
+_listeners: List[Callable[[str], None]] = []
+
+# Per-user task-list version, bumped on every committed change (process-local)
+_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+# Longest a cache entry derived from a user's tasks is kept while changes made
+# by other processes don't reach this one (no cross-process feed bridge)
+TASK_CACHE_LOCAL_TTL = float(os.getenv("TASK_CACHE_LOCAL_TTL", "5"))
+
+# Whether commits of other processes are replayed through notify_task_change
+# (set by the change feed bridge while it is listening)
+_changes_shared = False
+
+
+def register_task_listener(listener: Callable[[str], None]):
+    """
+    Register a callback invoked with a user ID whenever that user's tasks change.
+    """
+    _listeners.append(listener)
+
+
+def get_task_version(user_id: str) -> int:
+    """
+    Current version of a user's task list; changes whenever the tasks change.
+
+    Lets caches key entries on the task-list state instead of tracking and
+    deleting every entry that depends on it.
+    """
+    with _versions_lock:
+        return _versions.get(user_id, 0)
+
+
+def set_changes_shared(shared: bool):
+    """
+    Record whether other processes' task changes currently reach this one.
+    """
+    global _changes_shared
+    _changes_shared = shared
+
+
+def task_cache_ttl() -> Optional[float]:
+    """
+    Upper bound on the TTL of cache entries derived from a user's tasks.
+
+    Versions and invalidation listeners only see this process's writes unless
+    a cross-process bridge is active, so a write on another worker or
+    instance can't drop an entry here; such entries are then kept for at
+    most TASK_CACHE_LOCAL_TTL seconds.
+
+    Returns:
+        None (no bound) while changes are shared, else TASK_CACHE_LOCAL_TTL
+    """
+    return None if _changes_shared else TASK_CACHE_LOCAL_TTL
+
+
+def notify_task_change(user_id: str):
+    """
+    Bump the user's task-list version and notify listeners that the tasks changed.
+    """
+    with _versions_lock:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+    for listener in _listeners:
+        try:
+            listener(user_id)
+        except Exception as e:
+            print(f"Error in task change listener: {e}")
+
+
+def record_task_change(db: Session, user_id: str):
+    """
+    Queue a task change notification that fires once the session commits.
+
+    Deferring to the commit means listeners (e.g. cache invalidation) never
+    run before the change is visible to other sessions, and a rolled back
+    change notifies nobody.
+    """
+    db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def pending_task_changes(db: Session) -> Set[str]:
+    """
+    User IDs whose task changes the session will announce when it commits.
+    """
+    return set(db.info.get(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        notify_task_change(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,263 @@
+from typing import Any, Dict, Optional, Set
+from datetime import datetime
+import asyncio
+import json
+import os
+import select
+import threading
+import uuid
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from core.task_events import notify_task_change, pending_task_changes, register_task_listener, set_changes_shared
+
+# "auto" (postgres when DATABASE_URL is PostgreSQL, else local), "postgres" or "local"
+TASK_FEED_BRIDGE = os.getenv("TASK_FEED_BRIDGE", "auto").strip().lower()
+# LISTEN needs a session-level connection; behind PgBouncer in transaction mode
+# point this at the direct (non-pooler) endpoint
+TASK_FEED_DATABASE_URL = os.getenv("TASK_FEED_DATABASE_URL")
+TASK_FEED_CHANNEL = "task_changes"
+TASK_FEED_QUEUE_SIZE = int(os.getenv("TASK_FEED_QUEUE_SIZE", "16"))
+
+# Identifies this process in NOTIFY payloads so it skips its own notifications
+INSTANCE_ID = uuid.uuid4().hex
+
+
+class TaskFeedSubscription:
+    """
+    One connected client's queue of task change events.
+
+    Events are only signals that the user's tasks changed (the client then
+    calls GET /api/tasks/changes), so when a slow client's queue is full the
+    oldest event is dropped instead of blocking publishers.
+    """
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.dropped = 0
+
+    def _put(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class TaskChangeHub:
+    """
+    Fans task change events out to the clients connected to this process.
+
+    publish() may be called from any thread (task writes commit in worker
+    threads); events are handed to each subscriber's event loop.
+    """
+
+    def __init__(self, queue_size: int = TASK_FEED_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[TaskFeedSubscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, user_id: str) -> TaskFeedSubscription:
+        """
+        Start receiving a user's task change events (call from the event loop).
+        """
+        subscription = TaskFeedSubscription(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TaskFeedSubscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str):
+        """
+        Tell the user's connected clients that their tasks changed.
+        """
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+            self.published += 1
+        if not subscriptions:
+            return
+        event = {"event": "tasks_changed", "changed_at": datetime.utcnow().isoformat()}
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream is gone
+                self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "users": len(self._subscribers),
+                "subscribers": sum(len(subscriptions) for subscriptions in self._subscribers.values()),
+                "published": self.published,
+            }
+
+
+def encode_notification(user_id: str, instance_id: str = INSTANCE_ID) -> str:
+    return json.dumps({"i": instance_id, "u": user_id}, separators=(",", ":"))
+
+
+def decode_notification(payload: str) -> Optional[Dict[str, str]]:
+    try:
+        data = json.loads(payload)
+        return {"instance_id": str(data["i"]), "user_id": str(data["u"])}
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class LocalFeedBridge:
+    """
+    Stand-in bridge for a single process (SQLite, tests, serverless).
+
+    Committed changes already reach the hub through the task change
+    listeners, so there is nothing to relay.
+    """
+
+    name = "local"
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"bridge": self.name}
+
+
+class PostgresFeedBridge:
+    """
+    Relays task changes between workers with PostgreSQL LISTEN/NOTIFY.
+
+    Every commit that changed tasks also sends NOTIFY task_changes with the
+    user ID; Postgres delivers it only if the transaction commits. A
+    background thread LISTENs on a dedicated connection and replays other
+    instances' notifications through notify_task_change, which also keeps
+    this worker's caches in sync (task caches keep their full TTL only while
+    it is listening). The thread reconnects after errors.
+    """
+
+    name = "postgres"
+
+    def __init__(self, database_url: str, channel: str = TASK_FEED_CHANNEL, poll_interval: float = 5.0):
+        self.database_url = database_url
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.received = 0
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="task-feed-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _connect(self):
+        import psycopg2
+
+        url = make_url(self.database_url).set(drivername="postgresql")
+        connection = psycopg2.connect(url.render_as_string(hide_password=False))
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return connection
+
+    def _run(self):
+        delay = 1.0
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self.connected = True
+                set_changes_shared(True)
+                delay = 1.0
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._dispatch(connection.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Task feed listener error: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                self.connected = False
+                set_changes_shared(False)
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, payload: str):
+        notification = decode_notification(payload)
+        if notification is None or notification["instance_id"] == INSTANCE_ID:
+            return
+        self.received += 1
+        notify_task_change(notification["user_id"])
+
+    def stats(self) -> Dict[str, Any]:
+        return {"bridge": self.name, "connected": self.connected, "received": self.received}
+
+
+def _direct_database_url(url: str) -> str:
+    # Neon: the direct endpoint is the pooler hostname without "-pooler"
+    from core.database import DB_PGBOUNCER, _is_pgbouncer_url
+    if DB_PGBOUNCER and _is_pgbouncer_url(url):
+        parsed = make_url(url)
+        return parsed.set(host=parsed.host.replace("-pooler", "", 1)).render_as_string(hide_password=False)
+    return url
+
+
+def create_feed_bridge(database_url: Optional[str] = None, bridge: str = TASK_FEED_BRIDGE):
+    """
+    Build the bridge selected by TASK_FEED_BRIDGE.
+    """
+    database_url = database_url or os.getenv("DATABASE_URL") or ""
+    if bridge == "auto":
+        bridge = "postgres" if database_url.startswith("postgres") else "local"
+    if bridge == "postgres":
+        return PostgresFeedBridge(TASK_FEED_DATABASE_URL or _direct_database_url(database_url))
+    if bridge == "local":
+        return LocalFeedBridge()
+    raise ValueError(f"Unknown TASK_FEED_BRIDGE {bridge!r}; expected 'auto', 'postgres' or 'local'")
+
+
+task_hub = TaskChangeHub()
+register_task_listener(task_hub.publish)
+
+feed_bridge = create_feed_bridge()
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_other_workers(session: Session):
+    if feed_bridge.name != "postgres":
+        return
+    user_ids = pending_task_changes(session)
+    if not user_ids or session.get_bind().dialect.name != "postgresql":
+        return
+    for user_id in user_ids:
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": TASK_FEED_CHANNEL, "payload": encode_notification(user_id)}
+        )
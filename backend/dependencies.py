@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from sqlmodel import Session
@@ -12,8 +12,11 @@ security_scheme = HTTPBearer(auto_error=False)
 def get_db():
     """
     Get database session dependency
+
+    Delegates to get_session so the session is closed (and its connection
+    returned to the pool) as soon as the request finishes.
     """
-    yield next(get_session())
+    yield from get_session()
 
 
 def get_current_user(auth: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme)):
@@ -44,6 +47,32 @@ def get_current_active_user(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+def get_task_feed_user(
+    token: Optional[str] = None,
+    auth: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme)
+):
+    """
+    Get the user of the task change feed dependency (Mandatory)
+
+    Accepts the Authorization header or, for browsers' EventSource (which
+    can't set headers), a ?token= issued by POST /api/tasks/events/token.
+    """
+    if auth or not token:
+        return get_current_user(auth)
+    return security.get_task_feed_user(token)
+
+
+def require_health_token(x_health_token: Optional[str] = Header(None)):
+    """
+    Require the ops token (HEALTH_TOKEN) in the X-Health-Token header dependency (Mandatory)
+    """
+    if not security.verify_health_token(x_health_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or missing health token",
+        )
+
+
 def get_optional_user(auth: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme)) -> Optional[User]:
     """
     Get current user from token dependency (Optional)
@@ -1,3 +1,13 @@
+import os
+
+# Serverless invocations don't outlive the request, so don't keep a pool
+os.environ.setdefault("DB_POOL_CLASS", "null")
+# Nor keep a background LISTEN connection for the change feed
+os.environ.setdefault("TASK_FEED_BRIDGE", "local")
+# There is no release step to run migrate_db.py in, so each cold start
+# applies pending migrations (a single lookup once they are applied)
+os.environ.setdefault("DB_MIGRATE_ON_STARTUP", "true")
+
 from main import app
 
 # Vercel serverless function entry point
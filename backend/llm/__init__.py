@@ -0,0 +1,30 @@
+import os
+from llm.base import ChatResponse, LLMProvider, StreamEvent, ToolCall
+
+# "cohere" (default) or "fake" for offline tests and load tests
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "cohere").strip().lower()
+LLM_MODEL = os.getenv("LLM_MODEL") or os.getenv("COHERE_CHAT_MODEL", "command-r-08-2024")
+
+
+def create_llm_provider(model: str = LLM_MODEL, provider: str = LLM_PROVIDER) -> LLMProvider:
+    """
+    Build the LLM provider selected by LLM_PROVIDER.
+
+    The fake provider is configured with FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_JITTER_MS, FAKE_LLM_TOKEN_LATENCY_MS, FAKE_LLM_TOOL_PATTERN and
+    FAKE_LLM_SEED.
+    """
+    if provider == "fake":
+        from llm.fake_provider import FakeLLMProvider
+        return FakeLLMProvider(
+            model=model,
+            latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "300")),
+            jitter_ms=float(os.getenv("FAKE_LLM_JITTER_MS", "100")),
+            token_latency_ms=float(os.getenv("FAKE_LLM_TOKEN_LATENCY_MS", "10")),
+            tool_pattern=os.getenv("FAKE_LLM_TOOL_PATTERN", "auto"),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        )
+    if provider == "cohere":
+        from llm.cohere_provider import CohereProvider
+        return CohereProvider(model=model)
+    raise ValueError(f"Unknown LLM_PROVIDER {provider!r}; expected 'cohere' or 'fake'")
@@ -0,0 +1,86 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+@dataclass
+class ToolCall:
+    """
+    A tool invocation requested by the model.
+    """
+    name: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ChatResponse:
+    """
+    One model reply.
+
+    Attributes:
+        text: Generated text (may be empty when the model only calls tools)
+        tool_calls: Tools the model wants executed before it answers
+        chat_history: Provider-specific conversation state to send back with
+            the next step's tool results, or None if the provider has none
+    """
+    text: str = ""
+    tool_calls: List[ToolCall] = field(default_factory=list)
+    chat_history: Optional[List[Any]] = None
+
+
+@dataclass
+class StreamEvent:
+    """
+    A streamed chunk: "text" events carry generated tokens, the final "end"
+    event carries the complete response.
+    """
+    type: str
+    text: str = ""
+    response: Optional[ChatResponse] = None
+
+
+class LLMProvider(ABC):
+    """
+    Chat model backend used by ChatbotAgent and the conversation summarizer.
+
+    tool_results are {"call": ToolCall, "outputs": [result]} entries for the
+    tools executed since the previous call. Tools are described in Cohere's
+    format ({"name", "description", "parameter_definitions"}); providers for
+    other APIs translate them.
+    """
+
+    model: str
+
+    @abstractmethod
+    async def chat(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> ChatResponse:
+        """
+        Generate a complete reply.
+        """
+
+    @abstractmethod
+    def chat_stream(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Generate a reply as a stream of "text" events ending with an "end" event.
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Provider health and latency figures for monitoring.
+        """
+        return {"provider": type(self).__name__, "model": self.model}
@@ -0,0 +1,95 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from llm.base import ChatResponse, LLMProvider, StreamEvent, ToolCall
+
+
+class CohereProvider(LLMProvider):
+    """
+    Cohere chat API (v1 tool use) through the resilient async client.
+
+    Args:
+        model: Cohere model name
+        client: Async Cohere client; defaults to core.cohere_client.async_cohere_client
+    """
+
+    def __init__(self, model: str, client: Any = None):
+        self.model = model
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from core.cohere_client import async_cohere_client
+            return async_cohere_client
+        return self._client
+
+    def _chat_kwargs(
+        self, message, chat_history, preamble, tools, tool_results, force_single_step
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"model": self.model, "message": message}
+        if chat_history:
+            kwargs["chat_history"] = chat_history
+        if preamble:
+            kwargs["preamble"] = preamble
+        if tools:
+            kwargs["tools"] = tools
+        if tool_results:
+            kwargs["tool_results"] = [
+                {
+                    "call": {"name": result["call"].name, "parameters": result["call"].parameters},
+                    "outputs": result["outputs"]
+                }
+                for result in tool_results
+            ]
+        if force_single_step:
+            kwargs["force_single_step"] = True
+        return kwargs
+
+    @staticmethod
+    def _to_response(response: Any) -> ChatResponse:
+        tool_calls = [
+            ToolCall(name=tool_call.name, parameters=tool_call.parameters or {})
+            for tool_call in (response.tool_calls or [])
+        ]
+        return ChatResponse(
+            text=response.text or "",
+            tool_calls=tool_calls,
+            chat_history=getattr(response, "chat_history", None) or None
+        )
+
+    async def chat(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> ChatResponse:
+        response = await self.client.chat(
+            **self._chat_kwargs(message, chat_history, preamble, tools, tool_results, force_single_step)
+        )
+        return self._to_response(response)
+
+    async def chat_stream(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> AsyncIterator[StreamEvent]:
+        events = self.client.chat_stream(
+            **self._chat_kwargs(message, chat_history, preamble, tools, tool_results, force_single_step)
+        )
+        async for event in events:
+            if event.event_type == "text-generation":
+                yield StreamEvent(type="text", text=event.text)
+            elif event.event_type == "stream-end":
+                yield StreamEvent(type="end", response=self._to_response(event.response))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        if hasattr(self.client, "stats"):
+            stats.update(self.client.stats())
+        return stats
@@ -0,0 +1,153 @@
+import asyncio
+import random
+import re
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional
+from llm.base import ChatResponse, LLMProvider, StreamEvent, ToolCall
+
+TOOL_PATTERNS = ("auto", "none", "read", "parallel", "write", "multi_step")
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Deterministic local stand-in for the chat model, for tests and load tests.
+
+    Replies after a simulated latency (mean plus seeded jitter, so runs are
+    repeatable) and requests tools according to tool_pattern:
+
+    - "auto": picks a tool from keywords in the message (add, complete,
+      delete, search, list), otherwise answers directly
+    - "none": never calls tools
+    - "read": one list_tasks call
+    - "parallel": list_tasks, search_tasks and get_user_info at once
+    - "write": one add_task call
+    - "multi_step": list_tasks, then get_user_info, then answers
+
+    Once tool results come back (and the pattern needs no further step) it
+    answers with a short text naming the tools that ran.
+    """
+
+    def __init__(
+        self,
+        model: str = "fake",
+        latency_ms: float = 300.0,
+        jitter_ms: float = 100.0,
+        token_latency_ms: float = 10.0,
+        tool_pattern: str = "auto",
+        seed: int = 0,
+    ):
+        if tool_pattern not in TOOL_PATTERNS:
+            raise ValueError(f"Unknown tool pattern {tool_pattern!r}; expected one of {', '.join(TOOL_PATTERNS)}")
+        self.model = model
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.token_latency_ms = token_latency_ms
+        self.tool_pattern = tool_pattern
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    async def chat(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> ChatResponse:
+        await asyncio.sleep(self._latency())
+        return self._respond(message, chat_history, tools, tool_results, force_single_step)
+
+    async def chat_stream(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]] = None,
+        preamble: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        force_single_step: bool = False,
+    ) -> AsyncIterator[StreamEvent]:
+        await asyncio.sleep(self._latency())
+        response = self._respond(message, chat_history, tools, tool_results, force_single_step)
+        for index, word in enumerate(response.text.split(" ") if response.text else []):
+            if index:
+                await asyncio.sleep(self.token_latency_ms / 1000)
+            yield StreamEvent(type="text", text=word if index == 0 else f" {word}")
+        yield StreamEvent(type="end", response=response)
+
+    def _latency(self) -> float:
+        with self._lock:
+            self.calls += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _respond(
+        self,
+        message: str,
+        chat_history: Optional[List[Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        tool_results: Optional[List[Dict[str, Any]]],
+        force_single_step: bool,
+    ) -> ChatResponse:
+        history = list(chat_history or [])
+        tool_rounds = sum(1 for entry in history if isinstance(entry, dict) and entry.get("tool_calls"))
+
+        tool_calls: List[ToolCall] = []
+        if tools and not force_single_step:
+            if not tool_results:
+                tool_calls = self._first_tool_calls(message)
+            elif self.tool_pattern == "multi_step" and tool_rounds < 2:
+                tool_calls = [ToolCall("get_user_info", {})]
+
+        if tool_calls:
+            text = ""
+        elif tool_results:
+            names = ", ".join(result["call"].name for result in tool_results)
+            text = f"Done. I ran {len(tool_results)} tool(s): {names}."
+        else:
+            text = f"You said: {message}" if message else "Done."
+
+        if message:
+            history.append({"role": "USER", "message": message})
+        history.append({
+            "role": "CHATBOT",
+            "message": text,
+            "tool_calls": [tool_call.name for tool_call in tool_calls]
+        })
+        return ChatResponse(text=text, tool_calls=tool_calls, chat_history=history)
+
+    def _first_tool_calls(self, message: str) -> List[ToolCall]:
+        if self.tool_pattern == "none":
+            return []
+        if self.tool_pattern in ("read", "multi_step"):
+            return [ToolCall("list_tasks", {"status": "all"})]
+        if self.tool_pattern == "parallel":
+            return [
+                ToolCall("list_tasks", {"status": "all"}),
+                ToolCall("search_tasks", {"query": "task"}),
+                ToolCall("get_user_info", {}),
+            ]
+        if self.tool_pattern == "write":
+            return [ToolCall("add_task", {"title": "Load test task"})]
+
+        lowered = message.lower()
+        number = re.search(r"\d+", lowered)
+        if lowered.startswith("add"):
+            title = re.sub(r"^add\s+(?:a\s+)?(?:task\s+)?", "", message, flags=re.IGNORECASE).strip()
+            return [ToolCall("add_task", {"title": title or "Untitled"})]
+        if ("complete" in lowered or "finish" in lowered) and number:
+            return [ToolCall("complete_task", {"task_id": number.group()})]
+        if ("delete" in lowered or "remove" in lowered) and number:
+            return [ToolCall("delete_task", {"task_id": number.group()})]
+        if "search" in lowered or "find" in lowered:
+            query = re.sub(r"^.*?(?:search|find)\s+(?:for\s+)?", "", message, flags=re.IGNORECASE).strip()
+            return [ToolCall("search_tasks", {"query": query or message})]
+        if "list" in lowered or "task" in lowered or "todo" in lowered:
+            return [ToolCall("list_tasks", {"status": "all"})]
+        return []
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({"calls": self.calls, "tool_pattern": self.tool_pattern})
+        return stats
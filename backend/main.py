@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
@@ -37,12 +37,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With"],
-    expose_headers=["*"],
+    # "*" is not honoured for credentialed requests, so list custom headers too
+    expose_headers=["*", "X-Next-Cursor", "X-Total-Count"],
 )
 
 from api.tasks import router as tasks_router
 from api.auth import router as auth_router
 from routers.chat import router as chat_router
+from dependencies import require_health_token
 
 app.include_router(tasks_router, prefix="/api", tags=["tasks"])
 app.include_router(auth_router, prefix="/api", tags=["auth"])
@@ -50,19 +52,100 @@ app.include_router(chat_router, prefix="/api", tags=["chat"])
 
 @app.on_event("startup")
 async def startup_event():
-    # Create database tables
-    from sqlmodel import SQLModel
-    from core.database import engine
-    
-    if engine:
+    # The schema is managed by versioned migrations (`python migrate_db.py`);
+    # nothing is created or reflected here unless DB_MIGRATE_ON_STARTUP is set
+    from migrations import DB_MIGRATE_ON_STARTUP
+
+    if DB_MIGRATE_ON_STARTUP:
+        from core.database import engine
+        from migrations import run_migrations
         try:
-            SQLModel.metadata.create_all(engine)
-            print("✅ Database tables verified/created")
+            run_migrations(engine)
+            print("✅ Database migrations applied")
         except Exception as e:
-            print(f"❌ Error creating tables: {e}")
-    else:
-        print("❌ Skip table creation: engine is None")
+            print(f"❌ Error applying migrations: {e}")
+
+    # Build the shared chat agent before the first request
+    from agents.chatbot_agent import get_chatbot_agent
+    get_chatbot_agent()
+
+    # Relay task changes between workers for the live change feed
+    from core.task_feed import feed_bridge
+    feed_bridge.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Write out chat messages still waiting in the write-behind queue
+    from utils.message_writer import message_queue
+    await message_queue.close()
+
+    from core.task_feed import feed_bridge
+    feed_bridge.stop()
 
 @app.get("/")
 def read_root():
-    return {"message": "Todo Backend API"}
\ No newline at end of file
+    return {"message": "Todo Backend API"}
+
+
+@app.get("/health")
+def health():
+    """
+    Plain up/down status for load balancers and uptime checks.
+    """
+    return {"status": "ok"}
+
+
+# Telemetry below describes the deployment's internals, so it needs the ops token
+@app.get("/health/db-pool", dependencies=[Depends(require_health_token)])
+def db_pool_stats():
+    """
+    Connection pool occupancy and checkout wait-time telemetry.
+    """
+    from core.database import get_pool_stats
+    return get_pool_stats()
+
+
+@app.get("/health/intent-router", dependencies=[Depends(require_health_token)])
+def intent_router_stats():
+    """
+    Share of chat messages answered by the intent fast-path without an LLM call.
+    """
+    from agents.intent_router import intent_router
+    return intent_router.stats()
+
+
+@app.get("/health/chat-cache", dependencies=[Depends(require_health_token)])
+def chat_cache_stats():
+    """
+    Size and hit counts of the cached replies to read-only chat turns.
+    """
+    from agents.response_cache import response_cache
+    return response_cache.stats()
+
+
+@app.get("/health/llm", dependencies=[Depends(require_health_token)])
+def llm_stats():
+    """
+    LLM provider and model, plus (for Cohere) circuit breaker state, call
+    latency percentiles and hedged call count.
+    """
+    from agents.chatbot_agent import get_chatbot_agent
+    return get_chatbot_agent().llm.stats()
+
+
+@app.get("/health/message-queue", dependencies=[Depends(require_health_token)])
+def message_queue_stats():
+    """
+    Pending and flushed counts of the chat message write-behind queue.
+    """
+    from utils.message_writer import message_queue
+    return message_queue.stats()
+
+
+@app.get("/health/task-feed", dependencies=[Depends(require_health_token)])
+def task_feed_stats():
+    """
+    Connected change feed clients and the cross-worker bridge status.
+    """
+    from core.task_feed import task_hub, feed_bridge
+    return {**task_hub.stats(), **feed_bridge.stats()}
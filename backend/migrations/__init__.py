@@ -0,0 +1,102 @@
+import importlib.util
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Set
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+# Apply pending migrations when the app boots (local SQLite, and Vercel, see
+# index.py); the Docker image runs `python migrate_db.py` before the server
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "false").strip().lower() in ("1", "true", "yes", "on")
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+_VERSION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Arbitrary key of the Postgres advisory lock serializing concurrent migrators
+_LOCK_KEY = 7_301_202_301
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(32), primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass
+class Migration:
+    """
+    One file of migrations/versions/, named NNNN_description.py.
+
+    Attributes:
+        version: Zero-padded number; migrations run in version order
+        name: Description taken from the file name
+        upgrade: The module's upgrade(connection) function
+    """
+    version: str
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def load_migrations() -> List[Migration]:
+    """
+    Import every migration file, ordered by version.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(VERSIONS_DIR)):
+        match = _VERSION_FILE.match(filename)
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(
+            f"migrations.versions.m{match.group(1)}", os.path.join(VERSIONS_DIR, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrations.append(Migration(match.group(1), match.group(2), module.upgrade))
+    return migrations
+
+
+def applied_versions(connection: Connection) -> Set[str]:
+    schema_migrations.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    """
+    Migrations not yet recorded in schema_migrations.
+    """
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in load_migrations() if migration.version not in applied]
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    On PostgreSQL every transaction first takes an advisory lock, so several
+    instances starting at once apply each migration exactly once. The lock
+    is transaction-scoped, which also works behind PgBouncer in transaction
+    mode.
+
+    Returns:
+        Versions applied by this call
+    """
+    applied_now = []
+    for migration in load_migrations():
+        with engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+            # Checked under the lock: another instance may have just applied it
+            if migration.version in applied_versions(connection):
+                continue
+            print(f"Applying migration {migration.version}_{migration.name}...")
+            migration.upgrade(connection)
+            connection.execute(insert(schema_migrations).values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+            ))
+        applied_now.append(migration.version)
+    return applied_now
@@ -0,0 +1,56 @@
+"""
+Baseline: the users, tasks, conversations and messages tables.
+
+Frozen copy of the schema the app used to create on startup, so later
+migrations are what changes it. Databases created by that old
+create_all-on-startup already have these tables, which are left alone.
+"""
+from sqlalchemy import (
+    Boolean, CheckConstraint, Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+)
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", String, primary_key=True),
+    Column("email", String, nullable=False, unique=True),
+    Column("name", String),
+    Column("hashed_password", String),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "tasks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False, index=True),
+    Column("title", String, nullable=False),
+    Column("description", String),
+    Column("completed", Boolean, nullable=False, index=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "conversations", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False, index=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "messages", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("conversation_id", Integer, ForeignKey("conversations.id"), nullable=False, index=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("role", String, nullable=False),
+    Column("content", String, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    CheckConstraint("role IN ('user', 'assistant')", name="check_role_valid"),
+)
+
+
+def upgrade(connection: Connection):
+    metadata.create_all(connection, checkfirst=True)
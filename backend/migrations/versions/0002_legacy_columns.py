@@ -0,0 +1,19 @@
+"""
+Columns added after the first deployments, formerly added by hand in migrate_db.py.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+COLUMNS = (
+    ("users", "hashed_password", "VARCHAR"),
+    ("conversations", "summary", "TEXT"),
+    ("conversations", "summarized_until_id", "INTEGER"),
+)
+
+
+def upgrade(connection: Connection):
+    inspector = inspect(connection)
+    for table, column, column_type in COLUMNS:
+        existing = {info["name"] for info in inspector.get_columns(table)}
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"))
@@ -0,0 +1,34 @@
+"""
+Composite indexes for the hot access paths.
+
+- Task lists filter on user_id (and often completed) and sort by
+  created_at, title or updated_at with id as keyset tie-breaker; the chat
+  tools list pending tasks first, most recently updated first.
+- Chat history loads a conversation's messages by created_at.
+
+The single-column user_id, completed and conversation_id indexes are
+prefixes of these (or, for completed, too unselective to be used) and
+only slow down writes, so they are dropped.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+CREATE = (
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_completed_updated ON tasks (user_id, completed, updated_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_created ON tasks (user_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_updated ON tasks (user_id, updated_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_title ON tasks (user_id, title, id)",
+    "CREATE INDEX IF NOT EXISTS ix_messages_conversation_created ON messages (conversation_id, created_at, id)",
+)
+
+DROP = (
+    "DROP INDEX IF EXISTS ix_tasks_user_id",
+    "DROP INDEX IF EXISTS ix_tasks_completed",
+    "DROP INDEX IF EXISTS ix_messages_conversation_id",
+)
+
+
+def upgrade(connection: Connection):
+    # Create before dropping so the user_id lookups always have an index
+    for statement in CREATE + DROP:
+        connection.execute(text(statement))
@@ -0,0 +1,29 @@
+"""
+Full-text and trigram indexes used by utils/task_search.py (PostgreSQL only).
+
+The expressions must stay identical to SEARCH_DOCUMENT and SEARCH_TITLE
+there. If the pg_trgm extension can't be installed, the trigram index is
+skipped and search runs without typo matching.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(connection: Connection):
+    if connection.dialect.name != "postgresql":
+        return
+
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_search_document ON tasks USING GIN "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))"
+    ))
+
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        print(f"pg_trgm is unavailable, skipping the trigram index: {e}")
+        return
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm ON tasks USING GIN (lower(title) gin_trgm_ops)"
+    ))
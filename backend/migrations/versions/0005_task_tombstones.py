@@ -0,0 +1,23 @@
+"""
+task_tombstones: a row per deleted task, read by GET /api/tasks/changes.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+# Referenced by the foreign key; already created by 0001
+Table("users", metadata, Column("id", String, primary_key=True))
+
+task_tombstones = Table(
+    "task_tombstones", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_id", Integer, nullable=False),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("deleted_at", DateTime, nullable=False),
+    Index("ix_task_tombstones_user_deleted", "user_id", "deleted_at", "id"),
+)
+
+
+def upgrade(connection: Connection):
+    task_tombstones.create(connection, checkfirst=True)
@@ -1,7 +1,7 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, Index
 
 
 class User(SQLModel, table=True):
@@ -19,12 +19,19 @@ class User(SQLModel, table=True):
 
 class Task(SQLModel, table=True):
     __tablename__ = "tasks"
+    # Composite indexes for per-user filtering and sorting (migration 0003)
+    __table_args__ = (
+        Index("ix_tasks_user_completed_updated", "user_id", "completed", "updated_at", "id"),
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_tasks_user_title", "user_id", "title", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
-    user_id: str = Field(foreign_key="users.id", index=True)  # Index for efficient filtering by user
+    user_id: str = Field(foreign_key="users.id")
     title: str
     description: Optional[str] = None
-    completed: bool = Field(default=False, index=True)  # Index for efficient filtering by completion status
+    completed: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -32,11 +39,26 @@ class Task(SQLModel, table=True):
     user: User = Relationship(back_populates="tasks")
 
 
+class TaskTombstone(SQLModel, table=True):
+    __tablename__ = "task_tombstones"
+    # Delta sync reads a user's deletions after a point in time (migration 0005)
+    __table_args__ = (
+        Index("ix_task_tombstones_user_deleted", "user_id", "deleted_at", "id"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+    task_id: int  # ID of the deleted task; the task row itself is gone
+    user_id: str = Field(foreign_key="users.id")
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class Conversation(SQLModel, table=True):
     __tablename__ = "conversations"
 
     id: int = Field(default=None, primary_key=True)
     user_id: str = Field(foreign_key="users.id", index=True)  # Index for efficient filtering by user
+    summary: Optional[str] = None  # Rolling summary of messages that fell out of the history window
+    summarized_until_id: Optional[int] = None  # ID of the last message included in the summary
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -48,10 +70,11 @@ class Message(SQLModel, table=True):
     __tablename__ = "messages"
     __table_args__ = (
         CheckConstraint("role IN ('user', 'assistant')", name="check_role_valid"),
+        Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),  # History loads
     )
 
     id: int = Field(default=None, primary_key=True)
-    conversation_id: int = Field(foreign_key="conversations.id", index=True)
+    conversation_id: int = Field(foreign_key="conversations.id")
     user_id: str = Field(foreign_key="users.id")  # Foreign key linking to the user who sent this message
     role: str = Field()  # The role of the sender
     content: str = Field(max_length=5000)  # The actual message content
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi.responses import StreamingResponse
 from models.database import User
-from dependencies import get_current_active_user, get_db
-from agents.chatbot_agent import ChatbotAgent
+from dependencies import get_current_active_user
+from agents.chatbot_agent import get_chatbot_agent
+from core.rate_limit import SlidingWindowRateLimiter, create_rate_limit_backend
 from typing import Optional
 from pydantic import BaseModel
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 router = APIRouter()
 
@@ -14,11 +16,15 @@ router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory rate limiting storage (in production, use Redis or similar)
-# Key: user_id, Value: list of request timestamps
-rate_limit_storage = {}
+# Sliding-window rate limiting; set RATE_LIMIT_BACKEND=sqlite to share the
+# counters between uvicorn workers on the same host
 RATE_LIMIT = 100  # 100 requests per hour
 RATE_LIMIT_WINDOW = timedelta(hours=1)
+rate_limiter = SlidingWindowRateLimiter(
+    limit=RATE_LIMIT,
+    window_seconds=RATE_LIMIT_WINDOW.total_seconds(),
+    backend=create_rate_limit_backend()
+)
 
 
 class ChatRequest(BaseModel):
@@ -36,31 +42,13 @@ def check_rate_limit(user_id: str) -> bool:
     Returns:
         True if within rate limit, False if exceeded
     """
-    now = datetime.utcnow()
-    window_start = now - RATE_LIMIT_WINDOW
-
-    # Get user's request history
-    user_requests = rate_limit_storage.get(user_id, [])
-
-    # Remove requests outside the current window
-    user_requests = [req_time for req_time in user_requests if req_time > window_start]
-
-    # Check if rate limit exceeded
-    if len(user_requests) >= RATE_LIMIT:
-        return False
-
-    # Add current request to history
-    user_requests.append(now)
-    rate_limit_storage[user_id] = user_requests
-
-    return True
+    return rate_limiter.allow(user_id)
 
 
 @router.post("/chat")
 async def chat(
     chat_request: ChatRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """
     Process a chat message and return the AI response.
@@ -80,11 +68,11 @@ async def chat(
         )
 
     try:
-        # Create chatbot agent instance
-        agent = ChatbotAgent()
+        # Shared agent; tool schema and preamble are built once
+        agent = get_chatbot_agent()
 
         # Process the message
-        result = agent.process_message(
+        result = await agent.process_message_async(
             user_id=current_user.id,
             message=chat_request.message,
             conversation_id=chat_request.conversation_id
@@ -99,13 +87,58 @@ async def chat(
         )
 
 
+def format_sse(event: dict) -> str:
+    """
+    Format an agent event as a Server-Sent Events frame.
+    """
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    chat_request: ChatRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Process a chat message and stream the AI response as Server-Sent Events.
+    """
+    # Check rate limit
+    if not check_rate_limit(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Please try again later."
+        )
+
+    # Validate input
+    if not chat_request.message or len(chat_request.message.strip()) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Message cannot be empty"
+        )
+
+    agent = get_chatbot_agent()
+
+    async def event_stream():
+        async for event in agent.stream_message(
+            user_id=current_user.id,
+            message=chat_request.message,
+            conversation_id=chat_request.conversation_id
+        ):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Include the path parameter version for user-specific routes
 @router.post("/{user_id}/chat")
 async def chat_with_user_id(
     user_id: str,
     chat_request: ChatRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """
     Process a chat message for a specific user and return the AI response.
@@ -132,11 +165,11 @@ async def chat_with_user_id(
         )
 
     try:
-        # Create chatbot agent instance
-        agent = ChatbotAgent()
+        # Shared agent; tool schema and preamble are built once
+        agent = get_chatbot_agent()
 
         # Process the message
-        result = agent.process_message(
+        result = await agent.process_message_async(
             user_id=user_id,
             message=chat_request.message,
             conversation_id=chat_request.conversation_id
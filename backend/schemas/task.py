@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -27,5 +27,54 @@ class TaskUpdate(BaseModel):
     completed: Optional[bool] = None
 
 
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
+class TaskBulkRequest(BaseModel):
+    create: List[TaskCreate] = []
+    update: List[TaskBulkUpdate] = []
+    complete: List[int] = []
+    delete: List[int] = []
+
+
+class TaskBulkItemResult(BaseModel):
+    op: str
+    id: Optional[int] = None
+    success: bool
+    task: Optional[TaskRead] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    results: List[TaskBulkItemResult]
+
+
+class TaskSummary(BaseModel):
+    total: int
+    pending: int
+    completed: int
+    overdue: int
+    message: str
+
+
+
+class TaskFeedToken(BaseModel):
+    token: str  # Pass as ?token= to GET /api/tasks/events
+    expires_in: int  # Seconds left to open the stream with it
+
+
+class TaskTombstoneRead(BaseModel):
+    id: int  # ID of the deleted task
+    deleted_at: datetime
+
+
+class TaskChanges(BaseModel):
+    tasks: List[TaskRead]  # Created or updated since the cursor
+    deleted: List[TaskTombstoneRead]
+    cursor: str  # Pass back as ?since= on the next sync
+    has_more: bool
+
+
 # Note: Query parameters are handled directly in the endpoint function,
 # so we don't need a specific schema for them in this case
\ No newline at end of file
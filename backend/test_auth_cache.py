@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from datetime import datetime, timedelta
+from sqlalchemy import event
+import jwt
+import uuid
+import core.security as security
+from core.cache import TTLCache
+from core.database import engine
+
+
+def test_cached_user_lookup():
+    user_id = f"test_cache_user_{uuid.uuid4().hex[:8]}"
+    token = jwt.encode(
+        {"user_id": user_id, "email": f"{user_id}@example.com", "exp": datetime.utcnow() + timedelta(minutes=5)},
+        security.SECRET_KEY,
+        algorithm=security.ALGORITHM
+    )
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        print("1. First request (cold cache)...")
+        user = security.get_current_user(token)
+        cold_statements = len(statements)
+        print(f"   User: {user.id}, statements: {cold_statements}")
+        assert user.id == user_id
+        assert cold_statements > 0
+
+        print("2. Second request (warm cache)...")
+        user = security.get_current_user(token)
+        print(f"   User: {user.id}, statements: {len(statements) - cold_statements}")
+        assert user.id == user_id
+        assert len(statements) == cold_statements
+
+        print("3. After invalidation...")
+        security.invalidate_user(user_id)
+        security.get_current_user(token)
+        print(f"   Statements: {len(statements) - cold_statements}")
+        assert len(statements) > cold_statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+
+def test_token_cache_respects_exp():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("expired", {"user_id": "x"}, ttl=-1)
+    assert cache.get("expired") is None
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # Evicts least recently used "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    print("TTL/LRU cache behaves as expected")
+
+
+if __name__ == "__main__":
+    test_cached_user_lookup()
+    test_token_cache_respects_exp()
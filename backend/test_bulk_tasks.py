@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fastapi import HTTPException
+from sqlmodel import select
+from models.database import Task, TaskTombstone, User
+from schemas.task import TaskBulkRequest
+from api.tasks import bulk_tasks, MAX_BULK_OPERATIONS
+import conftest
+
+USER_ID = "bulk_user"
+
+
+def make_session():
+    return conftest.make_task_session(USER_ID, [{"title": f"Task {i}"} for i in range(4)])
+
+
+def run(db, **operations):
+    user = db.get(User, USER_ID)
+    return bulk_tasks(TaskBulkRequest(**operations), current_user=user, db=db).results
+
+
+def tombstones(db):
+    return sorted(tombstone.task_id for tombstone in db.exec(select(TaskTombstone)).all())
+
+
+def test_mixed_batch():
+    db = make_session()
+    results = run(
+        db,
+        create=[{"title": "New"}, {"title": ""}],
+        update=[{"id": 1, "title": "Renamed"}],
+        complete=[2],
+        delete=[3],
+    )
+    print(f"   {[(r.op, r.id, r.success) for r in results]}")
+    assert [(r.op, r.success) for r in results] == [
+        ("create", True), ("create", False), ("update", True), ("complete", True), ("delete", True)
+    ]
+    assert results[0].task.title == "New" and results[0].id == results[0].task.id
+    assert results[1].error == "Task title must be between 1 and 200 characters"
+    assert results[2].task.title == "Renamed"
+    assert results[3].task.completed is True
+    assert results[4].task is None
+
+    db.expire_all()
+    assert db.get(Task, 1).title == "Renamed"
+    assert db.get(Task, 2).completed is True
+    assert db.get(Task, 3) is None
+    assert tombstones(db) == [3]
+
+
+def test_foreign_and_missing_ids():
+    db = make_session()
+    # Task 5 belongs to conftest.OTHER_USER_ID, 999 doesn't exist
+    results = run(db, update=[{"id": 5, "title": "Hijacked"}], complete=[999, 5])
+    results += run(db, delete=[5, 999])
+    assert len(results) == 5
+    assert all(not r.success and r.error == "Task not found" for r in results)
+
+    db.expire_all()
+    foreign = db.get(Task, 5)
+    assert foreign.title == "Not mine" and foreign.completed is False
+    assert tombstones(db) == []
+
+
+def test_duplicate_delete():
+    db = make_session()
+    results = run(db, delete=[4, 4])
+    assert [r.success for r in results] == [True, False]
+    assert results[1].error == "Task not found"
+    db.expire_all()
+    assert db.get(Task, 4) is None
+    assert tombstones(db) == [4]
+
+
+def test_modify_and_delete_same_task_is_rejected():
+    db = make_session()
+    for operations in (
+        {"update": [{"id": 1, "title": "Renamed"}], "delete": [1]},
+        {"complete": [2], "delete": [2]},
+    ):
+        try:
+            run(db, create=[{"title": "Not created"}], **operations)
+        except HTTPException as e:
+            assert e.status_code == 400
+            print(f"   {e.detail}")
+        else:
+            raise AssertionError(f"{operations} was accepted")
+
+    # Nothing in the rejected requests was applied
+    db.expire_all()
+    assert db.get(Task, 1).title == "Task 0"
+    assert db.get(Task, 2).completed is False
+    assert db.exec(select(Task).where(Task.title == "Not created")).first() is None
+
+
+def test_operation_limit():
+    db = make_session()
+    try:
+        run(db, delete=list(range(MAX_BULK_OPERATIONS + 1)))
+    except HTTPException as e:
+        assert e.status_code == 400
+    else:
+        raise AssertionError("oversized bulk request was accepted")
+
+
+if __name__ == "__main__":
+    print("1. Mixed batch...")
+    test_mixed_batch()
+    print("2. Foreign and missing IDs...")
+    test_foreign_and_missing_ids()
+    print("3. Duplicate delete...")
+    test_duplicate_delete()
+    print("4. Modify and delete the same task...")
+    test_modify_and_delete_same_task_is_rejected()
+    print("5. Operation limit...")
+    test_operation_limit()
+    print("All bulk task tests passed!")
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from datetime import datetime, timedelta
+from models.database import Conversation, Message
+from utils.conversation_helpers import get_recent_messages, estimate_tokens, fit_history_to_budget
+import conftest
+
+USER_ID = "history_user"
+
+
+def make_session(message_count):
+    db = conftest.make_session(USER_ID)
+    db.add(Conversation(id=1, user_id=USER_ID))
+    db.add(Conversation(id=2, user_id=USER_ID))
+    started = datetime.utcnow()
+    for i in range(message_count):
+        # Pairs share a timestamp, so ties are broken by ID
+        db.add(Message(
+            conversation_id=1, user_id=USER_ID, role="user" if i % 2 == 0 else "assistant",
+            content=f"message {i}", created_at=started + timedelta(seconds=i // 2)
+        ))
+    db.add(Message(conversation_id=2, user_id=USER_ID, role="user", content="elsewhere", created_at=started))
+    db.commit()
+    return db
+
+
+def history(*messages):
+    return [{"role": "USER", "message": message} for message in messages]
+
+
+def test_recent_messages_window():
+    db = make_session(9)
+    recent = get_recent_messages(db, 1, 4)
+    print(f"   Last 4: {[m.content for m in recent]}")
+    assert [m.content for m in recent] == ["message 5", "message 6", "message 7", "message 8"]
+
+    assert [m.content for m in get_recent_messages(db, 1, 100)] == [f"message {i}" for i in range(9)]
+    # Messages already covered by the summary are skipped
+    summarized_until = recent[1].id
+    assert [m.content for m in get_recent_messages(db, 1, 4, after_id=summarized_until)] == [
+        "message 7", "message 8"
+    ]
+    assert get_recent_messages(db, 1, 4, after_id=recent[-1].id) == []
+    assert [m.content for m in get_recent_messages(db, 2, 4)] == ["elsewhere"]
+
+
+def test_budget_smaller_than_one_message():
+    entries = history("x" * 100)
+    assert estimate_tokens("x" * 100) == 29
+    assert fit_history_to_budget(entries, 28) == []
+    assert fit_history_to_budget(entries, 0) == []
+    assert fit_history_to_budget(entries, 29) == entries
+    assert fit_history_to_budget([], 100) == []
+
+
+def test_oldest_messages_dropped_in_order():
+    # 6, 6, 29, 6 and 6 estimated tokens
+    entries = history("old 1", "old 2", "x" * 100, "new 1", "new 2")
+    fitted = fit_history_to_budget(entries, 6 + 6 + 29)
+    print(f"   Kept: {[entry['message'][:5] for entry in fitted]}")
+    assert fitted == entries[2:]
+
+    # A small older message past a message that didn't fit is not kept,
+    # so the history never has gaps
+    assert fit_history_to_budget(entries, 6 + 6 + 28) == entries[3:]
+    assert fit_history_to_budget(entries, 1000) == entries
+
+
+if __name__ == "__main__":
+    print("1. Recent messages window...")
+    test_recent_messages_window()
+    print("2. Budget smaller than one message...")
+    test_budget_smaller_than_one_message()
+    print("3. Oldest messages dropped...")
+    test_oldest_messages_dropped_in_order()
+    print("All chat history tests passed!")
@@ -0,0 +1,133 @@
+import sys
+import os
+import asyncio
+import time
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlmodel import select
+from models.database import Message
+from llm.fake_provider import FakeLLMProvider
+from agents import chatbot_agent
+import conftest
+
+USER_ID = "steps_user"
+PARTIAL_NOTE = "Sorry, I ran out of time before finishing."
+
+
+class RecordingProvider(FakeLLMProvider):
+    """
+    Fake model that remembers whether each call was forced to answer.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(jitter_ms=0, **kwargs)
+        self.forced = []
+
+    async def chat(self, *args, force_single_step: bool = False, **kwargs):
+        self.forced.append(force_single_step)
+        return await super().chat(*args, force_single_step=force_single_step, **kwargs)
+
+    def chat_stream(self, *args, force_single_step: bool = False, **kwargs):
+        self.forced.append(force_single_step)
+        return super().chat_stream(*args, force_single_step=force_single_step, **kwargs)
+
+
+def setup(monkeypatch, max_steps=4, timeout=30.0, **provider_options):
+    monkeypatch.setattr(chatbot_agent, "CHAT_SUMMARY_ENABLED", False)
+    monkeypatch.setattr(chatbot_agent, "CHAT_MAX_STEPS", max_steps)
+    monkeypatch.setattr(chatbot_agent, "CHAT_TURN_TIMEOUT", timeout)
+    db = conftest.make_session(USER_ID)
+    provider = RecordingProvider(**provider_options)
+    return db, provider, conftest.make_agent(db, provider)
+
+
+def run_turn(agent, message, stream):
+    """
+    Run one turn; returns (done payload, streamed text or None, seconds taken).
+    """
+    async def turn():
+        if not stream:
+            return await agent.process_message_async(USER_ID, message), None
+        texts, done = [], None
+        async for event in agent.stream_message(USER_ID, message):
+            if event["event"] == "text":
+                texts.append(event["text"])
+            elif event["event"] == "done":
+                done = event
+        return done, "".join(texts)
+
+    started = time.perf_counter()
+    done, streamed = asyncio.run(turn())
+    return done, streamed, time.perf_counter() - started
+
+
+def stored_reply(db, conversation_id):
+    db.expire_all()
+    return db.exec(
+        select(Message.content).where(Message.conversation_id == conversation_id, Message.role == "assistant")
+    ).one()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_last_step_is_forced_to_answer(monkeypatch, stream):
+    # multi_step wants three model calls (two tool rounds); allow only two
+    db, provider, agent = setup(monkeypatch, max_steps=2, latency_ms=1, token_latency_ms=0, tool_pattern="multi_step")
+    done, streamed, _ = run_turn(agent, "what should I do today?", stream)
+    print(f"   stream={stream}: forced={provider.forced} -> {done['response']!r}")
+
+    assert provider.forced == [False, True]
+    assert [call["name"] for call in done["tool_calls"]] == ["list_tasks"]
+    assert done["response"] == "Done. I ran 1 tool(s): list_tasks."
+    assert stored_reply(db, done["conversation_id"]) == done["response"]
+    if stream:
+        assert streamed == done["response"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_deadline_ends_turn_with_partial_answer(monkeypatch, stream):
+    # The first step (0.2s) runs list_tasks; the turn's 0.3s run out during the second
+    timeout = 0.3
+    db, provider, agent = setup(monkeypatch, timeout=timeout, latency_ms=200, token_latency_ms=0, tool_pattern="multi_step")
+    done, streamed, elapsed = run_turn(agent, "what should I do today?", stream)
+    print(f"   stream={stream}: {elapsed:.2f}s -> {done['response']!r}")
+
+    assert timeout <= elapsed < timeout + 0.15
+    assert done["response"] == f"{PARTIAL_NOTE} Steps already completed: list_tasks."
+    assert [call["name"] for call in done["tool_calls"]] == ["list_tasks"]
+    assert stored_reply(db, done["conversation_id"]) == done["response"]
+    if stream:
+        assert streamed == done["response"]
+    # A cut-short turn is not replayed from the response cache
+    assert agent.response_cache.get(agent.response_cache.key(
+        USER_ID, agent.model, "what should I do today?", [], chatbot_agent.SYSTEM_PREAMBLE
+    )) is None
+
+
+def test_deadline_cuts_a_streamed_answer(monkeypatch):
+    # The answer streams a word every 0.1s and the deadline falls mid-sentence
+    timeout = 0.35
+    db, provider, agent = setup(monkeypatch, timeout=timeout, latency_ms=50, token_latency_ms=100, tool_pattern="none")
+    done, streamed, elapsed = run_turn(agent, "one two three four five six seven eight", stream=True)
+    print(f"   {elapsed:.2f}s -> {done['response']!r}")
+
+    assert timeout <= elapsed < timeout + 0.15
+    text, note = done["response"].split("\n\n")
+    assert text.startswith("You said:") and text != "You said: one two three four five six seven eight"
+    assert note == PARTIAL_NOTE
+    assert streamed == done["response"]
+    assert stored_reply(db, done["conversation_id"]) == done["response"]
+
+
+if __name__ == "__main__":
+    for number, (name, test) in enumerate([
+        ("Forced final answer", test_last_step_is_forced_to_answer),
+        ("Turn deadline", test_deadline_ends_turn_with_partial_answer),
+    ], start=1):
+        for stream in (False, True):
+            with pytest.MonkeyPatch.context() as monkeypatch:
+                print(f"{number}. {name} (stream={stream})...")
+                test(monkeypatch, stream)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("3. Deadline during a streamed answer...")
+        test_deadline_cuts_a_streamed_answer(monkeypatch)
+    print("All chat step tests passed!")
@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from models.database import Message, User
+from llm.fake_provider import FakeLLMProvider
+from agents import chatbot_agent
+from agents.chatbot_agent import STEP_TEXT_SEPARATOR
+from dependencies import get_current_active_user
+import conftest
+
+USER_ID = "stream_user"
+
+
+class PlanningProvider(FakeLLMProvider):
+    """
+    Fake model that also writes a short plan along with its tool calls, like
+    Cohere does, so a multi-step turn has text in more than one step.
+    """
+
+    def _respond(self, *args):
+        response = super()._respond(*args)
+        if response.tool_calls:
+            response.text = f"Checking with {response.tool_calls[0].name}."
+        return response
+
+
+def parse_sse(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        data = [line[len("data: "):] for line in frame.split("\n") if line.startswith("data: ")]
+        if data:
+            events.append(json.loads(data[0]))
+    return events
+
+
+def stored_reply(db, conversation_id):
+    db.expire_all()
+    return db.exec(
+        select(Message.content)
+        .where(Message.conversation_id == conversation_id, Message.role == "assistant")
+        .order_by(Message.id.desc())
+    ).first()
+
+
+def test_stream_and_plain_replies_match(monkeypatch):
+    import main
+
+    monkeypatch.setattr(chatbot_agent, "CHAT_SUMMARY_ENABLED", False)
+    db = conftest.make_session(USER_ID)
+    provider = PlanningProvider(latency_ms=1, jitter_ms=0, token_latency_ms=0, tool_pattern="multi_step")
+    agent = conftest.make_agent(db, provider)
+    monkeypatch.setattr("routers.chat.get_chatbot_agent", lambda: agent)
+    user = db.get(User, USER_ID)
+    main.app.dependency_overrides[get_current_active_user] = lambda: user
+    try:
+        client = TestClient(main.app)
+        plain = client.post("/api/chat", json={"message": "what is on my plate?"}).json()
+        # Same turn again, not replayed from the response cache
+        agent.response_cache.clear()
+        streamed = client.post("/api/chat/stream", json={"message": "what is on my plate?"})
+    finally:
+        main.app.dependency_overrides.pop(get_current_active_user, None)
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(streamed.text)
+    done = events[-1]
+    streamed_text = "".join(event["text"] for event in events if event["event"] == "text")
+    print(f"   Reply: {plain['response']!r}")
+
+    expected = STEP_TEXT_SEPARATOR.join([
+        "Checking with list_tasks.", "Checking with get_user_info.", "Done. I ran 1 tool(s): get_user_info."
+    ])
+    assert plain["response"] == expected
+    assert done["event"] == "done" and done["response"] == expected
+    # What the client saw is what was stored, for both transports
+    assert streamed_text == expected
+    assert stored_reply(db, plain["conversation_id"]) == expected
+    assert stored_reply(db, done["conversation_id"]) == expected
+    assert [call["name"] for call in done["tool_calls"]] == ["list_tasks", "get_user_info"]
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("1. Streamed and plain replies...")
+        test_stream_and_plain_replies_match(monkeypatch)
+    print("All chat stream tests passed!")
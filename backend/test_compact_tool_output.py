@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from datetime import datetime, timedelta
+from models.database import Task
+import conftest
+from tools.mcp_tools import list_tasks, search_tasks, CHAT_TOOL_RESULT_LIMIT, CHAT_TOOL_DESCRIPTION_CHARS
+
+USER_ID = "compact_user"
+
+
+def make_session(task_count):
+    db = conftest.make_session(USER_ID)
+    started = datetime.utcnow()
+    for i in range(task_count):
+        db.add(Task(
+            user_id=USER_ID,
+            title=f"Task {i}",
+            description="x" * 500,
+            completed=i % 2 == 1,
+            updated_at=started + timedelta(seconds=i)
+        ))
+    db.commit()
+    return db
+
+
+def test_large_lists_are_capped():
+    db = make_session(300)
+    result = list_tasks(USER_ID, db=db)
+    size = len(json.dumps(result))
+    print(f"   {len(result)} items, {size} bytes for 300 tasks")
+    assert len(result) == CHAT_TOOL_RESULT_LIMIT + 1
+    assert result[-1]["omitted"] == 300 - CHAT_TOOL_RESULT_LIMIT
+
+    tasks = result[:-1]
+    # Pending tasks first, newest first; no timestamps, short descriptions
+    assert all(not task["completed"] for task in tasks)
+    assert tasks[0]["title"] == "Task 298"
+    assert set(tasks[0]) == {"id", "title", "completed", "description"}
+    assert len(tasks[0]["description"]) <= CHAT_TOOL_DESCRIPTION_CHARS + 3
+
+    assert len(list_tasks(USER_ID, status="completed", limit=5, db=db)) == 6
+
+
+def test_small_lists_have_no_marker():
+    db = make_session(3)
+    result = list_tasks(USER_ID, db=db)
+    assert len(result) == 3
+    assert all("omitted" not in task for task in result)
+
+
+def test_search_ranks_exact_matches_first():
+    db = make_session(0)
+    for title in ["Buy milk and eggs", "milk", "Milkshake recipe", "Ask about milk"]:
+        db.add(Task(user_id=USER_ID, title=title))
+    db.commit()
+
+    titles = [task["title"] for task in search_tasks(USER_ID, "Milk", db=db)]
+    print(f"   Ranking: {titles}")
+    assert titles[:2] == ["milk", "Milkshake recipe"]
+    assert len(titles) == 4
+    assert search_tasks(USER_ID, "100%", db=db) == []
+
+
+if __name__ == "__main__":
+    print("1. Capped lists...")
+    test_large_lists_are_capped()
+    print("2. Small lists...")
+    test_small_lists_have_no_marker()
+    print("3. Search ranking...")
+    test_search_ranks_exact_matches_first()
+    print("All compact tool output tests passed!")
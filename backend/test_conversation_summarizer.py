@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import asyncio
+import uuid
+from sqlmodel import select
+from core.database import get_session
+from models.database import User, Conversation, Message
+from agents.summarizer import ConversationSummarizer
+from utils.conversation_helpers import create_new_conversation, save_message_to_conversation, get_recent_messages
+
+
+def test_summarizes_older_messages():
+    user_id = f"test_summary_user_{uuid.uuid4().hex[:8]}"
+    prompts = []
+
+    async def fake_llm(prompt):
+        prompts.append(prompt)
+        return f"summary #{len(prompts)}"
+
+    with next(get_session()) as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com"))
+        db.commit()
+        conversation_id = create_new_conversation(db, user_id).id
+        for i in range(12):
+            save_message_to_conversation(db, conversation_id, user_id, "user" if i % 2 == 0 else "assistant", f"message {i}")
+
+    summarizer = ConversationSummarizer(keep_recent=4, llm=fake_llm, batch_size=5)
+
+    try:
+        print("1. Summarizing the first 8 messages...")
+        assert asyncio.run(summarizer.summarize(conversation_id))
+        with next(get_session()) as db:
+            conversation = db.get(Conversation, conversation_id)
+            print(f"   Summary: {conversation.summary}")
+            assert conversation.summary == "summary #1"
+            assert "message 7" in prompts[0] and "message 8" not in prompts[0]
+
+            recent = get_recent_messages(db, conversation_id, 20, after_id=conversation.summarized_until_id)
+            print(f"   Unsummarized messages: {[msg.content for msg in recent]}")
+            assert [msg.content for msg in recent] == [f"message {i}" for i in range(8, 12)]
+
+        print("2. Not enough new messages for another batch...")
+        assert not asyncio.run(summarizer.summarize(conversation_id))
+        assert len(prompts) == 1
+
+        print("3. Folding new messages into the previous summary...")
+        with next(get_session()) as db:
+            for i in range(12, 17):
+                save_message_to_conversation(db, conversation_id, user_id, "user", f"message {i}")
+        assert asyncio.run(summarizer.summarize(conversation_id))
+        assert "summary #1" in prompts[1] and "message 7" not in prompts[1]
+        print("   Summarizer works as expected.")
+    finally:
+        with next(get_session()) as db:
+            for msg in db.exec(select(Message).where(Message.conversation_id == conversation_id)).all():
+                db.delete(msg)
+            db.delete(db.get(Conversation, conversation_id))
+            db.delete(db.get(User, user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    test_summarizes_older_messages()
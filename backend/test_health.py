@@ -0,0 +1,45 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fastapi.testclient import TestClient
+from core import security
+
+TELEMETRY = ["/health/intent-router", "/health/chat-cache", "/health/message-queue"]
+
+
+def test_plain_status_is_open():
+    import main
+    client = TestClient(main.app)
+    response = client.get("/health")
+    assert response.status_code == 200 and response.json() == {"status": "ok"}
+
+
+def test_telemetry_needs_health_token(monkeypatch):
+    import main
+    client = TestClient(main.app)
+
+    # Closed while HEALTH_TOKEN is unset, whatever the client sends
+    monkeypatch.setattr(security, "HEALTH_TOKEN", None)
+    for path in TELEMETRY:
+        assert client.get(path).status_code == 403, path
+        assert client.get(path, headers={"X-Health-Token": ""}).status_code == 403, path
+
+    monkeypatch.setattr(security, "HEALTH_TOKEN", "ops-secret")
+    for path in TELEMETRY:
+        assert client.get(path).status_code == 403, path
+        assert client.get(path, headers={"X-Health-Token": "wrong"}).status_code == 403, path
+        # A user's bearer token is not the ops token
+        assert client.get(path, headers={"Authorization": "Bearer ops-secret"}).status_code == 403, path
+        response = client.get(path, headers={"X-Health-Token": "ops-secret"})
+        assert response.status_code == 200, path
+        print(f"   {path}: {sorted(response.json())}")
+
+
+if __name__ == "__main__":
+    print("1. Plain status...")
+    test_plain_status_is_open()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("2. Telemetry behind the health token...")
+        test_telemetry_needs_health_token(monkeypatch)
+    print("All health endpoint tests passed!")
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from agents.intent_router import IntentRouter
+
+
+def test_recognized_commands():
+    router = IntentRouter()
+    cases = {
+        "add task buy milk": ("add_task", {"title": "buy milk"}),
+        "Please add a new task: Call mom.": ("add_task", {"title": "Call mom"}),
+        "list my pending tasks": ("list_tasks", {"status": "pending"}),
+        "show tasks": ("list_tasks", {"status": "all"}),
+        "What are my completed tasks?": ("list_tasks", {"status": "completed"}),
+        "complete task 42": ("complete_task", {"task_id": "42"}),
+        "mark task #4 as done": ("complete_task", {"task_id": "4"}),
+        "delete task 7": ("delete_task", {"task_id": "7"}),
+    }
+    for message, (tool, parameters) in cases.items():
+        intent = router.route(message)
+        print(f"   {message!r} -> {intent and (intent.tool, intent.parameters)}")
+        assert intent is not None
+        assert (intent.tool, intent.parameters) == (tool, parameters)
+
+
+def test_ambiguous_messages_fall_back():
+    router = IntentRouter()
+    for message in [
+        "delete the milk task",
+        "delete task 7 and add task buy bread",
+        "what should I do today?",
+        "complete task 3\nlist my tasks",
+        "",
+    ]:
+        intent = router.route(message)
+        print(f"   {message!r} -> {intent}")
+        assert intent is None
+
+
+def test_hit_rate():
+    router = IntentRouter()
+    router.route("list my tasks")
+    router.route("complete task 1")
+    router.route("how busy am I this week?")
+    stats = router.stats()
+    print(f"   Stats: {stats}")
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == round(2 / 3, 4)
+    assert stats["hits_by_intent"] == {"list_tasks": 1, "complete_task": 1}
+
+
+if __name__ == "__main__":
+    print("1. Recognized commands...")
+    test_recognized_commands()
+    print("2. Ambiguous messages...")
+    test_ambiguous_messages_fall_back()
+    print("3. Hit rate...")
+    test_hit_rate()
+    print("All intent router tests passed!")
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import asyncio
+from agents.chatbot_agent import COHERE_TOOLS
+from llm.fake_provider import FakeLLMProvider
+
+
+def run_turn(provider, message):
+    """Drive the provider like the agent's step loop, answering tool calls with empty results."""
+    async def turn():
+        names = []
+        response = await provider.chat(message=message, tools=COHERE_TOOLS)
+        while response.tool_calls:
+            names.append([tool_call.name for tool_call in response.tool_calls])
+            results = [{"call": tool_call, "outputs": [{}]} for tool_call in response.tool_calls]
+            response = await provider.chat(
+                message="", chat_history=response.chat_history, tools=COHERE_TOOLS, tool_results=results
+            )
+        return names, response.text
+    return asyncio.run(turn())
+
+
+def test_tool_patterns():
+    provider = FakeLLMProvider(latency_ms=1, jitter_ms=0)
+    assert run_turn(provider, "add buy milk")[0] == [["add_task"]]
+    assert run_turn(provider, "complete task 4")[0] == [["complete_task"]]
+    assert run_turn(provider, "hello there") == ([], "You said: hello there")
+
+    steps, text = run_turn(FakeLLMProvider(latency_ms=1, jitter_ms=0, tool_pattern="multi_step"), "anything")
+    print(f"   multi_step: {steps} -> {text!r}")
+    assert steps == [["list_tasks"], ["get_user_info"]]
+
+    steps, _ = run_turn(FakeLLMProvider(latency_ms=1, jitter_ms=0, tool_pattern="parallel"), "anything")
+    assert steps == [["list_tasks", "search_tasks", "get_user_info"]]
+
+
+def test_deterministic_latency():
+    first = FakeLLMProvider(latency_ms=100, jitter_ms=50, seed=7)
+    second = FakeLLMProvider(latency_ms=100, jitter_ms=50, seed=7)
+    delays = [first._latency() for _ in range(5)]
+    print(f"   Delays: {[round(delay, 3) for delay in delays]}")
+    assert delays == [second._latency() for _ in range(5)]
+    assert all(0.05 <= delay <= 0.15 for delay in delays)
+
+
+def test_streaming():
+    provider = FakeLLMProvider(latency_ms=1, jitter_ms=0, token_latency_ms=1)
+
+    async def collect():
+        return [event async for event in provider.chat_stream(message="hello there")]
+
+    events = asyncio.run(collect())
+    text = "".join(event.text for event in events if event.type == "text")
+    print(f"   Streamed: {text!r}")
+    assert text == "You said: hello there"
+    assert events[-1].type == "end" and events[-1].response.text == text
+
+
+if __name__ == "__main__":
+    print("1. Tool-call patterns...")
+    test_tool_patterns()
+    print("2. Seeded latency...")
+    test_deterministic_latency()
+    print("3. Streaming...")
+    test_streaming()
+    print("All LLM provider tests passed!")
@@ -0,0 +1,97 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlmodel import Session, select
+from models.database import Conversation, Message
+from conftest import make_session
+from utils.message_writer import MessageWriteBehindQueue
+
+
+def make_queue(**kwargs):
+    with make_session("writer_user") as db:
+        db.add(Conversation(id=1, user_id="writer_user"))
+        db.commit()
+        engine = db.get_bind()
+    return engine, MessageWriteBehindQueue(session_factory=lambda: Session(engine), **kwargs)
+
+
+def stored(engine):
+    with Session(engine) as db:
+        return db.exec(select(Message).order_by(Message.created_at, Message.id)).all()
+
+
+def test_messages_are_batched_in_order():
+    engine, queue = make_queue(batch_size=100, flush_interval=0.05)
+
+    async def run():
+        futures = [queue.enqueue(1, "writer_user", role, f"message {i}")
+                   for i, role in enumerate(["user", "assistant"] * 5)]
+        await asyncio.gather(*futures)
+
+    asyncio.run(run())
+    messages = stored(engine)
+    print(f"   {len(messages)} messages in {queue.flushed_batches} batch(es)")
+    assert [m.content for m in messages] == [f"message {i}" for i in range(10)]
+    assert queue.flushed_batches == 1
+
+
+def test_bad_row_does_not_lose_batch():
+    engine, queue = make_queue(batch_size=3, flush_interval=10)
+
+    async def run():
+        good = queue.enqueue(1, "writer_user", "user", "kept")
+        bad = queue.enqueue(1, "writer_user", "robot", "violates the role check")
+        last = queue.enqueue(1, "writer_user", "assistant", "also kept")
+        return await asyncio.gather(good, bad, last, return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    print(f"   Outcomes: {[type(o).__name__ for o in outcomes]}")
+    assert outcomes[0] is None and outcomes[2] is None
+    assert isinstance(outcomes[1], Exception)
+    assert [m.content for m in stored(engine)] == ["kept", "also kept"]
+
+
+def test_wait_for_conversation_flushes():
+    engine, queue = make_queue(batch_size=100, flush_interval=10)
+
+    async def run():
+        queue.enqueue(1, "writer_user", "user", "hello")
+        await queue.wait_for_conversation(1)
+        return len(stored(engine))
+
+    count = asyncio.run(run())
+    print(f"   Written before the next turn: {count}")
+    assert count == 1
+    assert queue.stats()["pending"] == 0
+
+
+def test_rows_left_by_a_closed_loop_are_written():
+    engine, queue = make_queue(batch_size=100, flush_interval=10)
+
+    async def first_turn():
+        # The loop ends before the flush timer fires
+        queue.enqueue(1, "writer_user", "user", "left behind")
+
+    async def second_turn():
+        queue.enqueue(1, "writer_user", "assistant", "next")
+        await queue.wait_for_conversation(1)
+        return [m.content for m in stored(engine)]
+
+    asyncio.run(first_turn())
+    contents = asyncio.run(second_turn())
+    print(f"   Stored: {contents}")
+    assert contents == ["left behind", "next"]
+    assert queue.stats()["pending"] == 0
+
+
+if __name__ == "__main__":
+    print("1. Batching and order...")
+    test_messages_are_batched_in_order()
+    print("2. Failed row isolation...")
+    test_bad_row_does_not_lose_batch()
+    print("3. Waiting for a conversation...")
+    test_wait_for_conversation_flushes()
+    print("4. Rows left by a closed loop...")
+    test_rows_left_by_a_closed_loop_are_written()
+    print("All message writer tests passed!")
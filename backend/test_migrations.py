@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+from migrations import load_migrations, pending_migrations, run_migrations
+from conftest import make_engine
+
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_fresh_database():
+    engine = make_engine(create_tables=False)
+    applied = run_migrations(engine)
+    print(f"   Applied: {applied}")
+    assert applied == [migration.version for migration in load_migrations()]
+    assert pending_migrations(engine) == []
+    assert run_migrations(engine) == []
+
+    assert "ix_tasks_user_completed_updated" in index_names(engine, "tasks")
+    assert "ix_messages_conversation_created" in index_names(engine, "messages")
+
+
+def test_database_created_by_create_all():
+    # Shape of a database from before the migrations: no summary columns,
+    # single-column indexes
+    engine = make_engine(create_tables=False)
+    with engine.begin() as connection:
+        for statement in (
+            "CREATE TABLE users (id VARCHAR PRIMARY KEY, email VARCHAR UNIQUE NOT NULL, name VARCHAR, created_at DATETIME)",
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, user_id VARCHAR, title VARCHAR, description VARCHAR, "
+            "completed BOOLEAN, created_at DATETIME, updated_at DATETIME)",
+            "CREATE INDEX ix_tasks_user_id ON tasks (user_id)",
+            "CREATE INDEX ix_tasks_completed ON tasks (completed)",
+            "CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_id VARCHAR, created_at DATETIME, updated_at DATETIME)",
+            "CREATE TABLE messages (id INTEGER PRIMARY KEY, conversation_id INTEGER, user_id VARCHAR, role VARCHAR, "
+            "content VARCHAR, created_at DATETIME)",
+            "CREATE INDEX ix_messages_conversation_id ON messages (conversation_id)",
+            "INSERT INTO tasks (id, user_id, title, completed) VALUES (1, 'u1', 'kept', 0)",
+        ):
+            connection.execute(text(statement))
+
+    run_migrations(engine)
+    columns = {column["name"] for column in inspect(engine).get_columns("conversations")}
+    tasks_indexes = index_names(engine, "tasks")
+    print(f"   Task indexes: {sorted(tasks_indexes)}")
+    assert {"summary", "summarized_until_id"} <= columns
+    assert "ix_tasks_user_id" not in tasks_indexes and "ix_tasks_user_created" in tasks_indexes
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT title FROM tasks")).scalar() == "kept"
+
+
+def test_migrations_match_models():
+    # The frozen baseline plus every later migration must end at the models'
+    # schema, or a model change is missing its migration
+    import models.database  # noqa: F401 (registers the tables)
+
+    engine = make_engine(create_tables=False)
+    run_migrations(engine)
+    inspector = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys()), table.name
+        indexes = {index.name for index in table.indexes}
+        assert index_names(engine, table.name) == indexes, table.name
+
+
+if __name__ == "__main__":
+    print("1. Fresh database...")
+    test_fresh_database()
+    print("2. Existing database...")
+    test_database_created_by_create_all()
+    print("3. Migrated schema matches the models...")
+    test_migrations_match_models()
+    print("All migration tests passed!")
@@ -0,0 +1,56 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from core.rate_limit import SlidingWindowRateLimiter, InMemoryRateLimitBackend, SQLiteRateLimitBackend
+
+
+def test_sliding_window_limit():
+    limiter = SlidingWindowRateLimiter(limit=3, window_seconds=60, eviction_interval=0)
+
+    print("1. Requests within the limit...")
+    assert all(limiter.allow("user", now=1000) for _ in range(3))
+
+    print("2. Request over the limit is rejected...")
+    assert not limiter.allow("user", now=1001)
+    assert limiter.allow("other_user", now=1001)
+
+    print("3. Previous window still counts while it overlaps...")
+    # 1000 falls in window 16 (960-1020); at 1030 the previous window still weighs 5/6
+    assert not limiter.allow("user", now=1030)
+
+    print("4. Limit frees up once the old window slides out...")
+    assert limiter.allow("user", now=1075)
+
+
+def test_idle_keys_are_evicted():
+    backend = InMemoryRateLimitBackend()
+    limiter = SlidingWindowRateLimiter(limit=10, window_seconds=60, backend=backend, eviction_interval=0)
+    for i in range(100):
+        limiter.allow(f"user_{i}", now=0)
+    limiter.allow("active_user", now=130)
+
+    evicted = limiter.evict_idle(now=130)
+    print(f"Evicted {evicted} idle keys, {len(backend)} left")
+    assert evicted == 100
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_is_shared():
+    path = os.path.join(tempfile.mkdtemp(), "rate_limits.db")
+    # Two limiters on the same file behave like two workers sharing a store
+    worker_a = SlidingWindowRateLimiter(limit=2, window_seconds=60, backend=SQLiteRateLimitBackend(path), eviction_interval=0)
+    worker_b = SlidingWindowRateLimiter(limit=2, window_seconds=60, backend=SQLiteRateLimitBackend(path), eviction_interval=0)
+
+    assert worker_a.allow("user", now=0)
+    assert worker_b.allow("user", now=1)
+    assert not worker_a.allow("user", now=2)
+    assert not worker_b.allow("user", now=3)
+    assert worker_a.evict_idle(now=200) == 1
+    print("SQLite backend shares counters across limiters")
+
+
+if __name__ == "__main__":
+    test_sliding_window_limit()
+    test_idle_keys_are_evicted()
+    test_sqlite_backend_is_shared()
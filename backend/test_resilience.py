@@ -0,0 +1,136 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import asyncio
+import time
+from core.resilience import CircuitBreaker, CircuitOpenError, ResilientAsyncClient
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeLLM:
+    """Local fake of the Cohere async client replaying scripted outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def chat(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, (int, float)) and not isinstance(outcome, bool):
+            await asyncio.sleep(outcome)
+            return f"slept {outcome}"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_client(llm, **kwargs):
+    options = {"timeout": 0.2, "max_retries": 2, "retry_base_delay": 0.01}
+    options.update(kwargs)
+    return ResilientAsyncClient(llm, **options)
+
+
+def test_retries():
+    llm = FakeLLM([UpstreamError(503), UpstreamError(429), "ok"])
+    result = asyncio.run(make_client(llm).chat(message="hi"))
+    print(f"   Transient errors: result={result!r}, calls={llm.calls}")
+    assert result == "ok" and llm.calls == 3
+
+    llm = FakeLLM([UpstreamError(400)])
+    try:
+        asyncio.run(make_client(llm).chat(message="hi"))
+        assert False, "expected the 400 to be raised"
+    except UpstreamError:
+        pass
+    print(f"   Bad request: calls={llm.calls}")
+    assert llm.calls == 1
+
+    llm = FakeLLM([5, "ok"])
+    started = time.monotonic()
+    result = asyncio.run(make_client(llm).chat(message="hi"))
+    print(f"   Timeout then retry: result={result!r} in {time.monotonic() - started:.2f}s")
+    assert result == "ok" and time.monotonic() - started < 1
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=4, window_seconds=60, cooldown_seconds=0.2)
+    llm = FakeLLM([UpstreamError(500)] * 4)
+    client = make_client(llm, max_retries=0, breaker=breaker)
+
+    for _ in range(4):
+        try:
+            asyncio.run(client.chat(message="hi"))
+        except UpstreamError:
+            pass
+    print(f"   After 4 failures: {breaker.stats()}")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    try:
+        asyncio.run(client.chat(message="hi"))
+        assert False, "expected the open circuit to fail fast"
+    except CircuitOpenError:
+        pass
+    assert llm.calls == 4
+
+    time.sleep(0.25)
+    assert asyncio.run(client.chat(message="hi")) == "ok"
+    print(f"   After cooldown: {breaker.stats()}")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_half_open_trial():
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=2, window_seconds=60, cooldown_seconds=0.1)
+    llm = FakeLLM([UpstreamError(500), UpstreamError(500), 5])
+    client = make_client(llm, timeout=10, max_retries=0, breaker=breaker)
+    for _ in range(2):
+        try:
+            asyncio.run(client.chat(message="hi"))
+        except UpstreamError:
+            pass
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.15)
+
+    async def cancel_trial():
+        # The trial call hangs and the turn deadline cancels it
+        try:
+            await asyncio.wait_for(client.chat(message="hi"), 0.05)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(cancel_trial())
+    print(f"   After cancelled trial: {breaker.stats()}")
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert asyncio.run(client.chat(message="hi")) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedging():
+    llm = FakeLLM([0.01] * 5 + [1, 0.01])
+    client = make_client(llm, timeout=2, hedge_percentile=0.9, hedge_min_samples=5)
+    for _ in range(5):
+        asyncio.run(client.chat(message="hi"))
+
+    started = time.monotonic()
+    result = asyncio.run(client.chat(message="hi"))
+    elapsed = time.monotonic() - started
+    print(f"   Slow call hedged: result={result!r} in {elapsed:.2f}s, hedged={client.hedged_calls}")
+    assert result == "slept 0.01" and elapsed < 0.5 and client.hedged_calls == 1
+
+
+if __name__ == "__main__":
+    print("1. Timeouts and retries...")
+    test_retries()
+    print("2. Circuit breaker...")
+    test_circuit_breaker()
+    print("3. Cancelled half-open trial...")
+    test_cancelled_half_open_trial()
+    print("4. Hedged requests...")
+    test_hedging()
+    print("All resilience tests passed!")
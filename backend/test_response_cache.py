@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from agents.response_cache import ChatResponseCache
+from core import task_events
+from core.task_events import notify_task_change
+from models.database import User
+from schemas.task import TaskCreate
+from llm.fake_provider import FakeLLMProvider
+from agents import chatbot_agent
+from api.tasks import create_task
+import conftest
+
+LIST_CALL = {"name": "list_tasks", "arguments": {}, "result": [], "duration_ms": 1.0}
+ADD_CALL = {"name": "add_task", "arguments": {"title": "milk"}, "result": {}, "duration_ms": 1.0}
+
+
+def test_read_only_turns_are_cached():
+    cache = ChatResponseCache(maxsize=10, ttl=60)
+    key = cache.key("cache_user_1", "model", "What are my tasks?", [], "preamble")
+    assert cache.store(key, "You have no tasks.", [LIST_CALL])
+
+    same_key = cache.key("cache_user_1", "model", "  what are my TASKS ", [], "preamble")
+    print(f"   Normalized message hits: {same_key == key}")
+    assert cache.get(same_key)["response"] == "You have no tasks."
+
+    # Other users, histories and mutating turns never share an entry
+    assert cache.key("cache_user_2", "model", "What are my tasks?", [], "preamble") != key
+    assert cache.key("cache_user_1", "model", "What are my tasks?", [{"role": "USER", "message": "hi"}], "preamble") != key
+    assert not cache.store(key, "Added milk.", [LIST_CALL, ADD_CALL])
+    assert not cache.store(key, "Hello!", [])
+
+
+def test_task_change_invalidates():
+    cache = ChatResponseCache(maxsize=10, ttl=60)
+    key = cache.key("cache_user_3", "model", "list my tasks", [], "preamble")
+    cache.store(key, "You have no tasks.", [LIST_CALL])
+
+    notify_task_change("cache_user_3")
+    new_key = cache.key("cache_user_3", "model", "list my tasks", [], "preamble")
+    print(f"   Key changed after task change: {new_key != key}")
+    assert new_key != key
+    assert cache.get(new_key) is None
+
+
+def test_task_write_invalidates_agent_reply(monkeypatch):
+    monkeypatch.setattr(chatbot_agent, "CHAT_SUMMARY_ENABLED", False)
+    db = conftest.make_session("cache_agent_user")
+    provider = FakeLLMProvider(latency_ms=1, jitter_ms=0, tool_pattern="read")
+    agent = conftest.make_agent(db, provider)
+
+    def ask():
+        # A new conversation each time, so the history (and key) is the same
+        return agent.process_message("cache_agent_user", "how am I doing?")["response"]
+
+    first = ask()
+    calls = provider.calls
+    assert ask() == first and provider.calls == calls
+
+    create_task(TaskCreate(title="New task"), current_user=db.get(User, "cache_agent_user"), db=db)
+    ask()
+    print(f"   Model calls: {calls} for the first turn, {provider.calls - calls} after the task write")
+    assert provider.calls > calls
+
+
+def test_ttl_capped_without_shared_changes(monkeypatch):
+    # With a local bridge another worker's write can't bump the version here
+    monkeypatch.setattr(task_events, "TASK_CACHE_LOCAL_TTL", 0.1)
+    monkeypatch.setattr(task_events, "_changes_shared", False)
+    cache = ChatResponseCache(maxsize=10, ttl=60)
+    key = cache.key("cache_user_4", "model", "list my tasks", [], "preamble")
+    cache.store(key, "You have no tasks.", [LIST_CALL])
+    assert cache.get(key) is not None
+    time.sleep(0.15)
+    assert cache.get(key) is None
+    assert cache.stats()["ttl_cap"] == 0.1
+
+    # While the Postgres bridge listens, entries keep the configured TTL
+    task_events.set_changes_shared(True)
+    cache.store(key, "You have no tasks.", [LIST_CALL])
+    time.sleep(0.15)
+    assert cache.get(key) is not None
+
+
+if __name__ == "__main__":
+    print("1. Read-only turns...")
+    test_read_only_turns_are_cached()
+    print("2. Invalidation...")
+    test_task_change_invalidates()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("3. Task write through the agent...")
+        test_task_write_invalidates_agent_reply(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("4. TTL without shared changes...")
+        test_ttl_capped_without_shared_changes(monkeypatch)
+    print("All response cache tests passed!")
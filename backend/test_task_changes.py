@@ -0,0 +1,109 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from datetime import datetime, timedelta
+from sqlmodel import select
+from fastapi import HTTPException
+from models.database import Task
+import conftest
+from core.pagination import encode_cursor
+from utils.task_helpers import delete_owned_task, update_owned_task
+from utils import task_sync
+from utils.task_sync import fetch_task_changes
+
+USER_ID = "sync_user"
+
+
+def make_session(task_count):
+    return conftest.make_task_session(USER_ID, [{"title": f"Task {i}"} for i in range(task_count)])
+
+
+def test_full_then_delta_sync(monkeypatch):
+    monkeypatch.setattr(task_sync, "TASK_SYNC_OVERLAP_SECONDS", 0)
+    db = make_session(5)
+    full = fetch_task_changes(db, USER_ID, None, 100)
+    print(f"   Full sync: {len(full.tasks)} tasks")
+    assert len(full.tasks) == 5 and not full.deleted and not full.has_more
+
+    assert fetch_task_changes(db, USER_ID, full.cursor, 100).tasks == []
+
+    update_owned_task(db, full.tasks[0].id, USER_ID, {"title": "Renamed"})
+    delete_owned_task(db, full.tasks[1].id, USER_ID)
+    db.commit()
+
+    delta = fetch_task_changes(db, USER_ID, full.cursor, 100)
+    print(f"   Delta: {[task.title for task in delta.tasks]}, deleted {[t.id for t in delta.deleted]}")
+    assert [task.title for task in delta.tasks] == ["Renamed"]
+    assert [tombstone.id for tombstone in delta.deleted] == [full.tasks[1].id]
+
+
+def test_pages_with_equal_timestamps(monkeypatch):
+    monkeypatch.setattr(task_sync, "TASK_SYNC_OVERLAP_SECONDS", 0)
+    db = make_session(0)
+    stamp = datetime.utcnow()
+    for i in range(7):
+        db.add(Task(user_id=USER_ID, title=f"Bulk {i}", created_at=stamp, updated_at=stamp))
+    db.commit()
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = fetch_task_changes(db, USER_ID, cursor, 3)
+        seen += [task.title for task in page.tasks]
+        cursor, pages = page.cursor, pages + 1
+        if not page.has_more:
+            break
+    print(f"   {len(seen)} tasks in {pages} pages")
+    assert sorted(seen) == [f"Bulk {i}" for i in range(7)]
+
+
+def test_idle_cursor_stays_valid(monkeypatch):
+    # A client syncing daily for two months without deleting anything
+    real_now = datetime.utcnow()
+    clock = {"now": real_now - timedelta(days=60)}
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return clock["now"]
+
+    monkeypatch.setattr(task_sync, "datetime", Clock)
+    db = make_session(2)
+    cursor = fetch_task_changes(db, USER_ID, None, 100).cursor
+    for day in range(1, 60):
+        clock["now"] = real_now - timedelta(days=60 - day)
+        cursor = fetch_task_changes(db, USER_ID, cursor, 100).cursor
+
+    doomed_id = db.exec(select(Task.id).where(Task.user_id == USER_ID)).first()
+    delete_owned_task(db, doomed_id, USER_ID)
+    db.commit()
+    clock["now"] = datetime.utcnow() + timedelta(seconds=1)
+    delta = fetch_task_changes(db, USER_ID, cursor, 100)
+    print(f"   After 60 daily syncs: deleted {[t.id for t in delta.deleted]}")
+    assert [tombstone.id for tombstone in delta.deleted] == [doomed_id]
+
+
+def test_expired_cursor():
+    db = make_session(0)
+    old = datetime.utcnow() - timedelta(days=365)
+    cursor = encode_cursor("changes", [old, 0, old, 0])
+    try:
+        fetch_task_changes(db, USER_ID, cursor, 100)
+        assert False, "expected 410"
+    except HTTPException as e:
+        assert e.status_code == 410
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("1. Full and delta sync...")
+        test_full_then_delta_sync(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("2. Paging...")
+        test_pages_with_equal_timestamps(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("3. Idle cursor...")
+        test_idle_cursor_stays_valid(monkeypatch)
+    print("4. Expired cursor...")
+    test_expired_cursor()
+    print("All task changes tests passed!")
@@ -0,0 +1,131 @@
+import sys
+import os
+import asyncio
+import threading
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlmodel import Session
+from models.database import User, Task
+from core.task_events import record_task_change
+from core.task_feed import (
+    TaskChangeHub, PostgresFeedBridge, LocalFeedBridge, create_feed_bridge,
+    encode_notification, task_hub, INSTANCE_ID
+)
+from conftest import make_engine
+from fastapi import HTTPException
+import core.security as security
+import dependencies
+from api.tasks import create_task_events_token
+
+
+def test_hub_delivers_from_other_threads():
+    hub = TaskChangeHub(queue_size=2)
+
+    async def run():
+        mine = hub.subscribe("feed_user")
+        other = hub.subscribe("other_user")
+        thread = threading.Thread(target=lambda: [hub.publish("feed_user") for _ in range(5)])
+        thread.start()
+        thread.join()
+        event = await asyncio.wait_for(mine.get(), 1)
+        # A slow client keeps only the latest events
+        return event, mine.queue.qsize(), mine.dropped, other.queue.qsize()
+
+    event, queued, dropped, other_queued = asyncio.run(run())
+    print(f"   Event {event['event']}, {queued} queued, {dropped} dropped")
+    assert event["event"] == "tasks_changed"
+    assert queued == 1 and dropped == 3
+    assert other_queued == 0
+
+
+def test_committed_changes_reach_subscribers():
+    engine = make_engine()
+
+    async def run():
+        subscription = task_hub.subscribe("feed_commit_user")
+        try:
+            def write(commit: bool):
+                with Session(engine) as db:
+                    db.add(User(id="feed_commit_user", email="feed@example.com"))
+                    db.add(Task(user_id="feed_commit_user", title="pushed"))
+                    record_task_change(db, "feed_commit_user")
+                    db.commit() if commit else db.rollback()
+
+            await asyncio.to_thread(write, False)
+            await asyncio.sleep(0.05)
+            rolled_back = subscription.queue.qsize()
+            await asyncio.to_thread(write, True)
+            return rolled_back, await asyncio.wait_for(subscription.get(), 1)
+        finally:
+            task_hub.unsubscribe(subscription)
+
+    rolled_back, event = asyncio.run(run())
+    print(f"   After rollback: {rolled_back} events; after commit: {event['event']}")
+    assert rolled_back == 0
+    assert event["event"] == "tasks_changed"
+
+
+def test_postgres_bridge_relays_other_instances():
+    bridge = PostgresFeedBridge("postgresql://localhost/unused")
+
+    async def run():
+        subscription = task_hub.subscribe("feed_remote_user")
+        try:
+            bridge._dispatch(encode_notification("feed_remote_user", instance_id=INSTANCE_ID))
+            bridge._dispatch("not json")
+            await asyncio.sleep(0.05)
+            own = subscription.queue.qsize()
+            bridge._dispatch(encode_notification("feed_remote_user", instance_id="another-worker"))
+            return own, await asyncio.wait_for(subscription.get(), 1)
+        finally:
+            task_hub.unsubscribe(subscription)
+
+    own, event = asyncio.run(run())
+    assert own == 0
+    assert event["event"] == "tasks_changed" and bridge.received == 1
+
+    assert isinstance(create_feed_bridge("sqlite:///local.db", "auto"), LocalFeedBridge)
+    assert isinstance(create_feed_bridge("postgresql://db/app", "auto"), PostgresFeedBridge)
+
+
+def test_browser_feed_token(monkeypatch):
+    monkeypatch.setattr(security, "SECRET_KEY", "feed-test-secret")
+    user = User(id="feed_token_user", email="feed_token@example.com")
+    security.user_cache.set(user.id, user)
+
+    issued = create_task_events_token(current_user=user)
+    assert issued.expires_in == security.TASK_FEED_TOKEN_TTL
+    # What EventSource sends: GET /api/tasks/events?token=...
+    assert dependencies.get_task_feed_user(token=issued.token, auth=None).id == user.id
+
+    def rejected(call):
+        try:
+            call()
+        except HTTPException as e:
+            return e.status_code == 401
+        return False
+
+    # The feed token opens nothing else, and a stream needs some credential
+    assert security.verify_token(issued.token) is None
+    assert rejected(lambda: security.get_current_user(issued.token))
+    assert rejected(lambda: dependencies.get_task_feed_user(token=None, auth=None))
+    assert rejected(lambda: dependencies.get_task_feed_user(token=issued.token[:-2], auth=None))
+
+    monkeypatch.setattr(security, "TASK_FEED_TOKEN_TTL", -1)
+    expired = create_task_events_token(current_user=user).token
+    assert rejected(lambda: dependencies.get_task_feed_user(token=expired, auth=None))
+    security.invalidate_user(user.id)
+    print("   Feed token opens the stream only, and expires")
+
+
+if __name__ == "__main__":
+    print("1. Hub fan-out...")
+    test_hub_delivers_from_other_threads()
+    print("2. Commit notifications...")
+    test_committed_changes_reach_subscribers()
+    print("3. Postgres bridge...")
+    test_postgres_bridge_relays_other_instances()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        print("4. Browser feed token...")
+        test_browser_feed_token(monkeypatch)
+    print("All task feed tests passed!")
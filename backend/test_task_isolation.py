@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fastapi import HTTPException
+from sqlmodel import select
+from models.database import Task, TaskTombstone, User
+from schemas.task import TaskUpdate
+from api import tasks as tasks_api
+from tools import mcp_tools
+import conftest
+
+OWNER_ID = "owner_user"
+INTRUDER_ID = "intruder_user"
+
+
+def make_session():
+    db = conftest.make_session(OWNER_ID, INTRUDER_ID)
+    db.add(Task(user_id=OWNER_ID, title="Owner's task", description="private"))
+    db.commit()
+    return db
+
+
+def assert_untouched(db):
+    db.expire_all()
+    task = db.get(Task, 1)
+    assert task is not None and task.user_id == OWNER_ID
+    assert task.title == "Owner's task" and task.description == "private"
+    assert task.completed is False
+    assert db.exec(select(TaskTombstone)).all() == []
+
+
+def test_api_rejects_other_users_task():
+    db = make_session()
+    intruder = db.get(User, INTRUDER_ID)
+    attempts = {
+        "update": lambda: tasks_api.update_task(1, TaskUpdate(title="Hijacked"), current_user=intruder, db=db),
+        "toggle": lambda: tasks_api.toggle_task_completion(1, current_user=intruder, db=db),
+        "delete": lambda: tasks_api.delete_task(1, current_user=intruder, db=db),
+        "get": lambda: tasks_api.get_task(1, current_user=intruder, db=db),
+    }
+    for name, attempt in attempts.items():
+        try:
+            attempt()
+        except HTTPException as e:
+            # Same answer as for a task that doesn't exist
+            assert e.status_code == 404 and e.detail == "Task not found", name
+        else:
+            raise AssertionError(f"{name} of another user's task succeeded")
+        db.rollback()
+    print("   update/toggle/delete/get of another user's task -> 404")
+    assert_untouched(db)
+
+
+def test_chat_tools_reject_other_users_task():
+    db = make_session()
+    results = [
+        mcp_tools.update_task(INTRUDER_ID, 1, title="Hijacked", db=db),
+        mcp_tools.complete_task(INTRUDER_ID, 1, db=db),
+        mcp_tools.delete_task(INTRUDER_ID, "1", db=db),
+    ]
+    db.commit()
+    print(f"   Tool results: {results}")
+    # Reported like a missing task (no "Access denied"), so task IDs of
+    # other users can't be probed through the chat
+    assert [result["error"] for result in results] == ["Task not found"] * 3
+    assert results[2]["success"] is False
+    assert mcp_tools.update_task(INTRUDER_ID, 999, title="x", db=db) == results[0]
+    assert_untouched(db)
+
+
+def test_owner_still_can():
+    db = make_session()
+    owner = db.get(User, OWNER_ID)
+    assert tasks_api.toggle_task_completion(1, current_user=owner, db=db).completed is True
+    tasks_api.delete_task(1, current_user=owner, db=db)
+    db.expire_all()
+    assert db.get(Task, 1) is None
+
+
+if __name__ == "__main__":
+    print("1. API endpoints...")
+    test_api_rejects_other_users_task()
+    print("2. Chat tools...")
+    test_chat_tools_reject_other_users_task()
+    print("3. Owner access...")
+    test_owner_still_can()
+    print("All isolation tests passed!")
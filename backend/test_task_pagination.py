@@ -0,0 +1,113 @@
+import sys
+import os
+import base64
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response
+from sqlmodel import select
+from models.database import Task, User
+from api.tasks import get_tasks
+import conftest
+
+USER_ID = "page_user"
+# Repeated titles and timestamps, so pages split inside runs of ties
+TITLES = ["milk", "bread", "milk", "eggs", "milk", "bread", "apples", "milk", "eggs", "zucchini", "bread"]
+
+
+def make_session():
+    started = datetime.utcnow()
+    return conftest.make_task_session(USER_ID, [
+        {"title": title, "completed": i % 2 == 0,
+         "created_at": started + timedelta(seconds=i // 3), "updated_at": started + timedelta(seconds=i // 3)}
+        for i, title in enumerate(TITLES)
+    ], foreign_title="milk")
+
+
+def walk(db, user, sort, status=None, limit=2):
+    """
+    Follow X-Next-Cursor from the first page to the last.
+    """
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = Response()
+        page = get_tasks(response, status=status, sort=sort, limit=limit, cursor=cursor, current_user=user, db=db)
+        ids.extend(task.id for task in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+
+
+def expected(db, key, status=None):
+    tasks = db.exec(select(Task).where(Task.user_id == USER_ID)).all()
+    if status == "pending":
+        tasks = [task for task in tasks if not task.completed]
+    return [task.id for task in sorted(tasks, key=key)]
+
+
+def test_cursor_walks_every_sort():
+    db = make_session()
+    user = db.get(User, USER_ID)
+    orders = {
+        "created": lambda task: (-task.created_at.timestamp(), -task.id),
+        "title": lambda task: (task.title, task.id),
+        "due_date": lambda task: (-task.updated_at.timestamp(), -task.id),
+        None: lambda task: task.id,
+    }
+    for sort, key in orders.items():
+        for limit in (1, 2, 3, len(TITLES), 100):
+            ids, pages = walk(db, user, sort, limit=limit)
+            assert ids == expected(db, key), (sort, limit)
+            assert pages == max(1, -(-len(TITLES) // limit)), (sort, limit)
+        print(f"   sort={sort}: {len(ids)} tasks in order, no repeats")
+
+    ids, _ = walk(db, user, "title", status="pending")
+    assert ids == expected(db, orders["title"], status="pending")
+
+
+def test_title_ties_split_across_pages():
+    db = make_session()
+    user = db.get(User, USER_ID)
+    response = Response()
+    first = get_tasks(response, status=None, sort="title", limit=5, cursor=None, current_user=user, db=db)
+    # The first page ends inside the run of "eggs" tasks
+    titles = [task.title for task in first]
+    assert titles == ["apples", "bread", "bread", "bread", "eggs"]
+    second = get_tasks(
+        Response(), status=None, sort="title", limit=5,
+        cursor=response.headers["X-Next-Cursor"], current_user=user, db=db
+    )
+    assert [task.title for task in second] == ["eggs", "milk", "milk", "milk", "milk"]
+    assert first[-1].id < second[0].id
+
+
+def test_bad_cursors_are_rejected():
+    db = make_session()
+    user = db.get(User, USER_ID)
+    response = Response()
+    get_tasks(response, status=None, sort="title", limit=2, cursor=None, current_user=user, db=db)
+    cursor = response.headers["X-Next-Cursor"]
+
+    payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    payload["v"] = ["bread", "not an id"]
+    tampered = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    for sort, bad in (("title", tampered), ("title", "%%%"), ("title", cursor[:-4]), ("created", cursor)):
+        try:
+            get_tasks(Response(), status=None, sort=sort, limit=2, cursor=bad, current_user=user, db=db)
+        except HTTPException as e:
+            assert e.status_code == 400, (sort, bad)
+        else:
+            raise AssertionError(f"cursor {bad!r} for sort={sort} was accepted")
+    print("   Tampered, malformed and mismatched cursors -> 400")
+
+
+if __name__ == "__main__":
+    print("1. Walking every sort order...")
+    test_cursor_walks_every_sort()
+    print("2. Title ties across pages...")
+    test_title_ties_split_across_pages()
+    print("3. Bad cursors...")
+    test_bad_cursors_are_rejected()
+    print("All pagination tests passed!")
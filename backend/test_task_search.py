@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from models.database import Task
+import conftest
+from utils.task_search import search_owned_tasks
+
+USER_ID = "search_user"
+TITLES = [
+    ("Buy groceries", "milk, eggs and bread"),
+    ("groceries", None),
+    ("Call the dentist", "ask about the appointment"),
+    ("Lunch", None),
+    ("Plan team lunch", "book a table"),
+    ("Pay electricity bill", None),
+]
+
+
+def make_session():
+    return conftest.make_task_session(
+        USER_ID, [{"title": title, "description": description} for title, description in TITLES],
+        foreign_title="groceries for someone else"
+    )
+
+
+def titles(db, query, limit=10):
+    tasks, total = search_owned_tasks(db, USER_ID, query, limit)
+    return [task.title for task in tasks], total
+
+
+def test_ranking():
+    db = make_session()
+    found, total = titles(db, "Groceries")
+    print(f"   'Groceries' -> {found}")
+    assert found == ["groceries", "Buy groceries"]
+    assert total == 2
+
+    found, _ = titles(db, "lunch")
+    assert found == ["Lunch", "Plan team lunch"]
+
+
+def test_descriptions_prefixes_and_typos():
+    db = make_session()
+    assert titles(db, "eggs")[0] == ["Buy groceries"]
+    assert titles(db, "dent appoint")[0] == ["Call the dentist"]
+
+    found, _ = titles(db, "electricty bil")
+    print(f"   'electricty bil' -> {found}")
+    assert found == ["Pay electricity bill"]
+    assert titles(db, "xyz")[0] == []
+
+
+def test_limit_and_total():
+    db = make_session()
+    found, total = titles(db, "groceries", limit=1)
+    assert found == ["groceries"]
+    assert total == 2
+
+
+if __name__ == "__main__":
+    print("1. Ranking...")
+    test_ranking()
+    print("2. Descriptions, prefixes and typos...")
+    test_descriptions_prefixes_and_typos()
+    print("3. Limit and total...")
+    test_limit_and_total()
+    print("All task search tests passed!")
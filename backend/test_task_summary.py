@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from models.database import Task, User
+from schemas.task import TaskCreate
+from api.tasks import create_task, delete_task, get_task_summary, summary_cache, toggle_task_completion
+import conftest
+
+USER_ID = "summary_user"
+
+
+def make_session():
+    summary_cache.clear()
+    return conftest.make_task_session(USER_ID, [
+        {"title": "Done", "completed": True},
+        {"title": "Pending 1"},
+        {"title": "Pending 2"},
+    ])
+
+
+def counts(db, user):
+    summary = get_task_summary(current_user=user, db=db)
+    return summary.total, summary.pending, summary.completed, summary.message
+
+
+def test_counts():
+    db = make_session()
+    user = db.get(User, USER_ID)
+    # The other user's task isn't counted
+    assert counts(db, user) == (3, 2, 1, "You have 2 pending tasks.")
+
+    db.add(Task(user_id="empty_user", title="x", completed=True))
+    db.add(User(id="empty_user", email="empty@example.com"))
+    db.add(User(id="new_user", email="new@example.com"))
+    db.commit()
+    assert counts(db, db.get(User, "empty_user")) == (1, 0, 1, "All tasks completed!")
+    assert counts(db, db.get(User, "new_user")) == (0, 0, 0, "You have no tasks yet.")
+
+
+def test_writes_invalidate_cached_summary():
+    db = make_session()
+    user = db.get(User, USER_ID)
+    assert counts(db, user)[:3] == (3, 2, 1)
+    assert summary_cache.get(USER_ID) is not None
+
+    create_task(TaskCreate(title="Pending 3"), current_user=user, db=db)
+    assert summary_cache.get(USER_ID) is None
+    assert counts(db, user) == (4, 3, 1, "You have 3 pending tasks.")
+
+    toggle_task_completion(2, current_user=user, db=db)
+    assert counts(db, user)[:3] == (4, 2, 2)
+
+    delete_task(1, current_user=user, db=db)
+    assert counts(db, user)[:3] == (3, 2, 1)
+
+    # Another user's write leaves this user's entry alone
+    create_task(TaskCreate(title="Elsewhere"), current_user=db.get(User, conftest.OTHER_USER_ID), db=db)
+    assert summary_cache.get(USER_ID) is not None
+    print(f"   Cache stats: {summary_cache.stats()}")
+
+
+if __name__ == "__main__":
+    print("1. Aggregate counts...")
+    test_counts()
+    print("2. Invalidation on create, toggle and delete...")
+    test_writes_invalidate_cached_summary()
+    print("All task summary tests passed!")
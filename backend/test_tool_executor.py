@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import asyncio
+import threading
+import time
+from agents.tool_executor import ToolExecutor, READ_ONLY_TOOLS
+
+
+class RecordingSession:
+    """Stands in for the turn session; only commit() is used by the executor."""
+
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def make_tool(log, delay=0.2):
+    lock = threading.Lock()
+
+    def execute_tool(name, parameters, user_id, db):
+        with lock:
+            log.append(("start", name, db is not None))
+        time.sleep(delay)
+        with lock:
+            log.append(("end", name, db is not None))
+        return {"tool": name}
+
+    return execute_tool
+
+
+def test_reads_run_concurrently():
+    log = []
+    executor = ToolExecutor(make_tool(log))
+    calls = [("list_tasks", {}), ("search_tasks", {"query": "milk"}), ("get_user_info", {})]
+
+    started = time.perf_counter()
+    results = asyncio.run(executor.run(calls, "user", RecordingSession()))
+    elapsed = time.perf_counter() - started
+    print(f"   3 reads took {elapsed:.2f}s")
+
+    assert elapsed < 0.5
+    assert [result["name"] for result in results] == ["list_tasks", "search_tasks", "get_user_info"]
+    assert all(result["duration_ms"] >= 150 for result in results)
+    # Concurrent readers get their own sessions
+    assert all(not uses_turn_session for _, _, uses_turn_session in log)
+
+
+def test_mutations_keep_their_order():
+    log = []
+    executor = ToolExecutor(make_tool(log, delay=0.05))
+    session = RecordingSession()
+    calls = [
+        ("add_task", {"title": "a"}),
+        ("list_tasks", {}),
+        ("search_tasks", {"query": "a"}),
+        ("complete_task", {"task_id": "1"}),
+        ("delete_task", {"task_id": "2"}),
+    ]
+
+    results = asyncio.run(executor.run(calls, "user", session))
+    print(f"   Log: {[(event, name) for event, name, _ in log]}")
+
+    assert [result["name"] for result in results] == [name for name, _ in calls]
+    starts = [name for event, name, _ in log if event == "start"]
+    ends = [name for event, name, _ in log if event == "end"]
+    assert starts[0] == "add_task" and ends[0] == "add_task"
+    assert starts[-2:] == ["complete_task", "delete_task"]
+    assert ends[-2:] == ["complete_task", "delete_task"]
+    # Mutations run in the turn session, and are committed before parallel reads
+    assert all(uses_turn_session for _, name, uses_turn_session in log if name not in READ_ONLY_TOOLS)
+    assert session.commits == 1
+
+
+if __name__ == "__main__":
+    print("1. Read-only tools in parallel...")
+    test_reads_run_concurrently()
+    print("2. Mutations in order...")
+    test_mutations_keep_their_order()
+    print("All tool executor tests passed!")
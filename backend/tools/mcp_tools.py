@@ -1,10 +1,77 @@
 from sqlmodel import Session, select
+from sqlalchemy import func
 from models.database import Task, User
-from typing import Optional, Any
-from datetime import datetime
+from typing import Optional, Any, List
+from contextlib import contextmanager
+import os
+from core.task_events import record_task_change
+from utils.task_helpers import update_owned_task, delete_owned_task
+from utils.task_search import search_owned_tasks
 
+# list_tasks / search_tasks results go into the LLM prompt; keep them bounded
+CHAT_TOOL_RESULT_LIMIT = int(os.getenv("CHAT_TOOL_RESULT_LIMIT", "25"))
+CHAT_TOOL_DESCRIPTION_CHARS = int(os.getenv("CHAT_TOOL_DESCRIPTION_CHARS", "80"))
 
-def add_task(user_id: str, title: str, description: Optional[str] = None) -> dict:
+
+@contextmanager
+def _session_scope(db: Optional[Session] = None):
+    """
+    Yield the caller's session, or open a dedicated one that is committed on exit.
+
+    When a session is passed in, writes are only flushed so the caller can
+    commit them together with the rest of its unit of work.
+    """
+    if db is not None:
+        yield db
+        db.flush()
+        return
+
+    from core.database import get_session  # Import here to avoid circular imports
+
+    with next(get_session()) as session:
+        yield session
+        session.commit()
+
+
+def _compact_task(task: Task) -> dict:
+    """
+    Task as seen by the model: no timestamps, description cut short.
+    """
+    item = {"id": str(task.id), "title": task.title, "completed": task.completed}
+    if task.description:
+        description = task.description
+        if len(description) > CHAT_TOOL_DESCRIPTION_CHARS:
+            description = description[:CHAT_TOOL_DESCRIPTION_CHARS].rstrip() + "..."
+        item["description"] = description
+    return item
+
+
+def _result_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return CHAT_TOOL_RESULT_LIMIT
+    return max(1, min(int(limit), CHAT_TOOL_RESULT_LIMIT))
+
+
+def _compact_page(tasks: List[Task], total: int) -> List[dict]:
+    """
+    Compact tasks, followed by a marker item if `total` says some were left out.
+
+    The {"omitted": N, "note": ...} item tells the model the list is
+    incomplete and how to narrow it down.
+    """
+    items = [_compact_task(task) for task in tasks]
+    omitted = total - len(tasks)
+    if omitted > 0:
+        items.append({
+            "omitted": omitted,
+            "note": f"{omitted} more tasks not shown. Use a status filter or search_tasks to narrow the list."
+        })
+    return items
+
+
+def add_task(
+    user_id: str, title: str, description: Optional[str] = None, db: Optional[Session] = None
+) -> dict:
     """
     Add a new task for the user.
     
@@ -12,13 +79,12 @@ def add_task(user_id: str, title: str, description: Optional[str] = None) -> dic
         user_id: ID of the user adding the task
         title: Title of the task
         description: Optional description of the task
+        db: Optional session of the caller's unit of work
         
     Returns:
         Dictionary with the created task details
     """
-    from core.database import get_session  # Import here to avoid circular imports
-    
-    with next(get_session()) as db:
+    with _session_scope(db) as db:
         # Create new task
         task = Task(
             user_id=user_id,
@@ -28,8 +94,8 @@ def add_task(user_id: str, title: str, description: Optional[str] = None) -> dic
         )
         
         db.add(task)
-        db.commit()
-        db.refresh(task)
+        record_task_change(db, user_id)
+        db.flush()
         
         return {
             "id": str(task.id),
@@ -41,50 +107,53 @@ def add_task(user_id: str, title: str, description: Optional[str] = None) -> dic
         }
 
 
-def list_tasks(user_id: str, status: Optional[str] = None) -> list:
+def list_tasks(
+    user_id: str, status: Optional[str] = None, limit: Optional[int] = None, db: Optional[Session] = None
+) -> list:
     """
     List tasks for the user with optional status filter.
+
+    Pending tasks come first, most recently updated first, and at most
+    CHAT_TOOL_RESULT_LIMIT tasks are returned in compact form.
     
     Args:
         user_id: ID of the user whose tasks to list
         status: Optional status filter ("all", "pending", "completed")
+        limit: Optional maximum number of tasks (capped at CHAT_TOOL_RESULT_LIMIT)
+        db: Optional session of the caller's unit of work
         
     Returns:
-        List of tasks matching the criteria
+        List of tasks matching the criteria, followed by an "omitted" marker
+        item if some were left out
     """
-    from core.database import get_session  # Import here to avoid circular imports
-    
-    with next(get_session()) as db:
+    with _session_scope(db) as db:
         # Build query with user isolation
-        query = select(Task).where(Task.user_id == user_id)
+        conditions = [Task.user_id == user_id]
 
         # Apply status filter if provided
         if status and status != "all":
             if status == "completed":
-                query = query.where(Task.completed == True)
+                conditions.append(Task.completed == True)
             elif status == "pending":
-                query = query.where(Task.completed == False)
+                conditions.append(Task.completed == False)
 
-        tasks = db.exec(query).all()
-        
-        # Convert tasks to dictionaries
-        tasks_list = []
-        for task in tasks:
-            tasks_list.append({
-                "id": str(task.id),
-                "title": task.title,
-                "description": task.description,
-                "completed": task.completed,
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat()
-            })
-        
-        return tasks_list
+        limit = _result_limit(limit)
+        tasks = db.exec(
+            select(Task).where(*conditions).order_by(
+                Task.completed, Task.updated_at.desc(), Task.id.desc()
+            ).limit(limit + 1)
+        ).all()
+
+        total = len(tasks)
+        if total > limit:
+            tasks = tasks[:limit]
+            total = db.exec(select(func.count()).select_from(Task).where(*conditions)).one()
+        return _compact_page(tasks, total)
 
 
 def update_task(
     user_id: str, task_id: Any, title: Optional[str] = None, 
-    description: Optional[str] = None
+    description: Optional[str] = None, db: Optional[Session] = None
 ) -> dict:
     """
     Update an existing task for the user.
@@ -94,40 +163,30 @@ def update_task(
         task_id: ID of the task to update (can be int or string)
         title: Optional new title
         description: Optional new description
+        db: Optional session of the caller's unit of work
         
     Returns:
         Updated task details or error message
     """
-    from core.database import get_session
-    
     try:
         task_id_int = int(task_id)
     except (ValueError, TypeError):
         return {"error": f"Invalid task ID format: {task_id}. ID must be a number."}
     
-    with next(get_session()) as db:
-        # Get the task
-        task = db.get(Task, task_id_int)
+    # Update fields if provided
+    values = {}
+    if title is not None:
+        values["title"] = title
+    if description is not None:
+        values["description"] = description
+
+    with _session_scope(db) as db:
+        # Single UPDATE ... WHERE id AND user_id ... RETURNING round-trip
+        task = update_owned_task(db, task_id_int, user_id, values)
 
         if not task:
             return {"error": "Task not found"}
 
-        # Verify user owns the task
-        if task.user_id != user_id:
-            return {"error": "Access denied: Task does not belong to user"}
-
-        # Update fields if provided
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
-
-        task.updated_at = datetime.utcnow()
-
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-
         return {
             "id": str(task.id),
             "title": task.title,
@@ -138,43 +197,30 @@ def update_task(
         }
 
 
-def complete_task(user_id: str, task_id: Any) -> dict:
+def complete_task(user_id: str, task_id: Any, db: Optional[Session] = None) -> dict:
     """
     Mark a task as completed for the user.
     
     Args:
         user_id: ID of the user whose task to complete
         task_id: ID of the task to complete
+        db: Optional session of the caller's unit of work
         
     Returns:
         Updated task details or error message
     """
-    from core.database import get_session
-    
     try:
         task_id_int = int(task_id)
     except (ValueError, TypeError):
         return {"error": f"Invalid task ID format: {task_id}. ID must be a number."}
     
-    with next(get_session()) as db:
-        # Get the task
-        task = db.get(Task, task_id_int)
+    with _session_scope(db) as db:
+        # Update completion status, checking ownership in the same statement
+        task = update_owned_task(db, task_id_int, user_id, {"completed": True})
 
         if not task:
             return {"error": "Task not found"}
 
-        # Verify user owns the task
-        if task.user_id != user_id:
-            return {"error": "Access denied: Task does not belong to user"}
-
-        # Update completion status
-        task.completed = True
-        task.updated_at = datetime.utcnow()
-
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-
         return {
             "id": str(task.id),
             "title": task.title,
@@ -185,54 +231,43 @@ def complete_task(user_id: str, task_id: Any) -> dict:
         }
 
 
-def delete_task(user_id: str, task_id: Any) -> dict:
+def delete_task(user_id: str, task_id: Any, db: Optional[Session] = None) -> dict:
     """
     Delete a task for the user.
 
     Args:
         user_id: ID of the user whose task to delete
         task_id: ID of the task to delete
+        db: Optional session of the caller's unit of work
 
     Returns:
         True if successful, False if task not found
     """
-    from core.database import get_session
-    
     try:
         task_id_int = int(task_id)
     except (ValueError, TypeError):
         return {"success": False, "error": f"Invalid task ID format: {task_id}. ID must be a number."}
 
-    with next(get_session()) as db:
-        # Get the task
-        task = db.get(Task, task_id_int)
-
-        if not task:
+    with _session_scope(db) as db:
+        # Single DELETE ... WHERE id AND user_id ... RETURNING round-trip
+        if not delete_owned_task(db, task_id_int, user_id):
             return {"success": False, "error": "Task not found"}
 
-        # Verify user owns the task
-        if task.user_id != user_id:
-            return {"success": False, "error": "Access denied: Task does not belong to user"}
-
-        db.delete(task)
-        db.commit()
-
         return {"success": True, "message": "Task deleted successfully"}
 
 
-def get_user_info(user_id: str) -> Optional[dict]:
+def get_user_info(user_id: str, db: Optional[Session] = None) -> Optional[dict]:
     """
     Get user information.
 
     Args:
         user_id: ID of the user to retrieve information for
+        db: Optional session of the caller's unit of work
 
     Returns:
         User information if found, None otherwise
     """
-    from core.database import get_session  # Import here to avoid circular imports
-
-    with next(get_session()) as db:
+    with _session_scope(db) as db:
         # Get the user
         user = db.get(User, user_id)
 
@@ -247,38 +282,24 @@ def get_user_info(user_id: str) -> Optional[dict]:
         }
 
 
-def search_tasks(user_id: str, query: str) -> list:
+def search_tasks(user_id: str, query: str, limit: Optional[int] = None, db: Optional[Session] = None) -> list:
     """
-    Search tasks for the user by title.
+    Search tasks for the user by title and description.
+
+    Uses the indexed full-text and fuzzy search of utils/task_search.py, so
+    misspelled or partial names still match. Best matches come first and at
+    most CHAT_TOOL_RESULT_LIMIT tasks are returned in compact form.
     
     Args:
         user_id: ID of the user whose tasks to search
         query: Search query string
+        limit: Optional maximum number of tasks (capped at CHAT_TOOL_RESULT_LIMIT)
+        db: Optional session of the caller's unit of work
         
     Returns:
-        List of tasks matching the query
+        List of tasks matching the query, followed by an "omitted" marker
+        item if some were left out
     """
-    from core.database import get_session
-    
-    with next(get_session()) as db:
-        # Build query with case-insensitive title search
-        from sqlalchemy import func
-        db_query = select(Task).where(
-            Task.user_id == user_id,
-            func.lower(Task.title).contains(query.lower())
-        )
-        
-        tasks = db.exec(db_query).all()
-        
-        tasks_list = []
-        for task in tasks:
-            tasks_list.append({
-                "id": str(task.id),
-                "title": task.title,
-                "description": task.description,
-                "completed": task.completed,
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat()
-            })
-            
-        return tasks_list
\ No newline at end of file
+    with _session_scope(db) as db:
+        tasks, total = search_owned_tasks(db, user_id, query, _result_limit(limit))
+        return _compact_page(tasks, total)
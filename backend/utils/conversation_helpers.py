@@ -1,6 +1,7 @@
 from sqlmodel import Session, select
+from sqlalchemy import insert
 from models.database import Conversation, Message
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 def get_conversation_history(
@@ -18,42 +19,136 @@ def get_conversation_history(
         List of messages in the conversation, or None if conversation doesn't exist
     """
     # Verify the conversation belongs to the user
-    conversation = db.get(Conversation, conversation_id)
-    if not conversation or conversation.user_id != user_id:
+    if not verify_conversation_owner(db, conversation_id, user_id):
         return None
     
-    # Get all messages in the conversation
+    return get_conversation_messages(db, conversation_id)
+
+
+def verify_conversation_owner(db: Session, conversation_id: int, user_id: str) -> bool:
+    """
+    Check that a conversation exists and belongs to the given user.
+    
+    Args:
+        db: Database session
+        conversation_id: ID of the conversation to check
+        user_id: ID of the user claiming the conversation
+        
+    Returns:
+        True if the conversation belongs to the user, False otherwise
+    """
+    conversation = db.get(Conversation, conversation_id)
+    return conversation is not None and conversation.user_id == user_id
+
+
+def get_conversation_messages(db: Session, conversation_id: int) -> List[Message]:
+    """
+    Retrieve all messages of a conversation whose ownership was already verified.
+    
+    Args:
+        db: Database session
+        conversation_id: ID of the conversation
+        
+    Returns:
+        List of messages in the conversation, oldest first
+    """
     statement = (
         select(Message)
         .where(Message.conversation_id == conversation_id)
         .order_by(Message.created_at)
     )
-    messages = db.exec(statement).all()
+    return db.exec(statement).all()
+
+
+def get_recent_messages(
+    db: Session, conversation_id: int, limit: int, after_id: Optional[int] = None
+) -> List[Message]:
+    """
+    Retrieve the most recent messages of a conversation whose ownership was already verified.
+    
+    Only the last `limit` rows are read (ORDER BY created_at DESC LIMIT n), so
+    the cost doesn't grow with the conversation's age.
+    
+    Args:
+        db: Database session
+        conversation_id: ID of the conversation
+        limit: Maximum number of messages to return
+        after_id: Only return messages with a greater ID (e.g. ones not yet
+            covered by the conversation summary)
+        
+    Returns:
+        List of at most `limit` messages, oldest first
+    """
+    statement = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(limit)
+    )
+    if after_id is not None:
+        statement = statement.where(Message.id > after_id)
+    return list(reversed(db.exec(statement).all()))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of LLM tokens in a piece of text.
+    
+    Uses the common ~4 characters per token heuristic plus a small fixed
+    per-message overhead for role markers.
+    """
+    return (len(text) + 3) // 4 + 4
+
+
+def fit_history_to_budget(chat_history: List[Dict[str, str]], token_budget: int) -> List[Dict[str, str]]:
+    """
+    Keep the most recent chat history entries that fit in a token budget.
     
-    return messages
+    Args:
+        chat_history: History entries (with a "message" key), oldest first
+        token_budget: Maximum estimated tokens for the returned history
+        
+    Returns:
+        The newest suffix of chat_history whose estimated size fits the budget
+    """
+    used = 0
+    start = len(chat_history)
+    while start > 0:
+        cost = estimate_tokens(chat_history[start - 1]["message"])
+        if used + cost > token_budget:
+            break
+        used += cost
+        start -= 1
+    return chat_history[start:]
 
 
-def create_new_conversation(db: Session, user_id: str) -> Conversation:
+def create_new_conversation(db: Session, user_id: str, commit: bool = True) -> Conversation:
     """
     Create a new conversation for a user.
     
     Args:
         db: Database session
         user_id: ID of the user creating the conversation
+        commit: Commit immediately; when False the insert is only flushed
+            so it can be committed with the caller's other writes
         
     Returns:
         The newly created conversation
     """
     conversation = Conversation(user_id=user_id)
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    if commit:
+        db.commit()
+        db.refresh(conversation)
+    else:
+        db.flush()
     
     return conversation
 
 
 def save_message_to_conversation(
-    db: Session, conversation_id: int, user_id: str, role: str, content: str
+    db: Session, conversation_id: int, user_id: str, role: str, content: str,
+    commit: bool = True
 ) -> Message:
     """
     Save a message to a conversation.
@@ -64,6 +159,8 @@ def save_message_to_conversation(
         user_id: ID of the user sending the message
         role: Role of the sender ('user' or 'assistant')
         content: Content of the message
+        commit: Commit immediately; when False the insert is only flushed
+            so it can be committed with the caller's other writes
         
     Returns:
         The saved message
@@ -75,7 +172,22 @@ def save_message_to_conversation(
         content=content
     )
     db.add(message)
-    db.commit()
-    db.refresh(message)
+    if commit:
+        db.commit()
+        db.refresh(message)
+    else:
+        db.flush()
     
-    return message
\ No newline at end of file
+    return message
+
+def insert_messages(db: Session, rows: List[Dict]) -> None:
+    """
+    Insert several messages with one multi-row INSERT (the caller commits).
+
+    Args:
+        db: Database session
+        rows: Column values per message (conversation_id, user_id, role,
+            content and created_at), in the order they were sent
+    """
+    if rows:
+        db.execute(insert(Message), rows)
@@ -0,0 +1,204 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.conversation_helpers import insert_messages
+
+CHAT_MESSAGE_WRITE_BEHIND = os.getenv("CHAT_MESSAGE_WRITE_BEHIND", "false").strip().lower() in ("1", "true", "yes", "on")
+CHAT_MESSAGE_BATCH_SIZE = int(os.getenv("CHAT_MESSAGE_BATCH_SIZE", "100"))
+CHAT_MESSAGE_FLUSH_INTERVAL = float(os.getenv("CHAT_MESSAGE_FLUSH_INTERVAL", "0.05"))
+
+
+def _default_session():
+    from sqlmodel import Session
+    from core.database import engine
+    return Session(engine)
+
+
+class MessageWriteBehindQueue:
+    """
+    Batches chat message inserts off the request path.
+
+    enqueue() returns immediately with a future; queued messages are written
+    with one multi-row INSERT once batch_size messages are waiting or
+    flush_interval seconds have passed, and the future resolves when the
+    batch is committed (or fails). Batches are written one at a time in
+    enqueue order, and created_at is stamped at enqueue time, so messages of
+    a conversation keep their order. If a batch fails, its messages are
+    retried one by one so a single bad row doesn't lose the others.
+
+    Callers that need durability await the future; callers that need to
+    read a conversation's messages await wait_for_conversation() first.
+    Pending messages are lost if the process dies before a flush, so
+    close() must run on shutdown.
+
+    Args:
+        batch_size: Flush as soon as this many messages are queued
+        flush_interval: Maximum seconds a message waits before being flushed
+        session_factory: Returns a new database session (for tests)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = CHAT_MESSAGE_BATCH_SIZE,
+        flush_interval: float = CHAT_MESSAGE_FLUSH_INTERVAL,
+        session_factory: Callable[[], Any] = _default_session,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._unsettled: Dict[int, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.flushed_batches = 0
+        self.flushed_messages = 0
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Scripts and test clients may run each turn in a fresh event loop
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Rows left behind by a loop that stopped before its flush timer
+            # fired: their futures can't be awaited any more, so queue them
+            # again on this loop (in their place, ahead of new rows) and
+            # flush them from here, off the loop thread like any batch
+            leftover = [row for row, _ in self._pending]
+            self._pending = []
+            self._unsettled.clear()
+            self._loop = loop
+            self._flush_lock = asyncio.Lock()
+            self._timer = None
+            for row in leftover:
+                self._track(loop, row)
+            if leftover:
+                self._schedule_flush()
+        return loop
+
+    def _track(self, loop: asyncio.AbstractEventLoop, row: Dict[str, Any]) -> asyncio.Future:
+        future = loop.create_future()
+        conversation_id = row["conversation_id"]
+        self._pending.append((row, future))
+        self._unsettled.setdefault(conversation_id, []).append(future)
+        future.add_done_callback(lambda done: self._settled(conversation_id, done))
+        return future
+
+    def enqueue(self, conversation_id: int, user_id: str, role: str, content: str) -> asyncio.Future:
+        """
+        Queue a message for insertion.
+
+        Returns:
+            Future resolved once the message is committed
+        """
+        loop = self._bind_loop()
+        future = self._track(loop, {
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "role": role,
+            "content": content,
+            "created_at": datetime.utcnow(),
+        })
+
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._schedule_flush)
+        return future
+
+    def _settled(self, conversation_id: int, future: asyncio.Future):
+        futures = self._unsettled.get(conversation_id)
+        if futures is not None:
+            futures.remove(future)
+            if not futures:
+                del self._unsettled[conversation_id]
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error saving chat message in conversation {conversation_id}: {future.exception()}")
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = self._loop.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """
+        Write every queued message now.
+        """
+        self._bind_loop()
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            errors = await asyncio.to_thread(self._write, [row for row, _ in batch])
+            for (_, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> List[Optional[BaseException]]:
+        """
+        Insert rows in one statement, falling back to one row per commit (worker thread).
+        """
+        with self.session_factory() as db:
+            try:
+                insert_messages(db, rows)
+                db.commit()
+                self.flushed_batches += 1
+                self.flushed_messages += len(rows)
+                return [None] * len(rows)
+            except Exception:
+                db.rollback()
+
+            errors: List[Optional[BaseException]] = []
+            for row in rows:
+                try:
+                    insert_messages(db, [row])
+                    db.commit()
+                    self.flushed_messages += 1
+                    errors.append(None)
+                except Exception as e:
+                    db.rollback()
+                    errors.append(e)
+            return errors
+
+    async def wait_for_conversation(self, conversation_id: int):
+        """
+        Wait until every queued message of a conversation is written.
+        """
+        self._bind_loop()
+        futures = list(self._unsettled.get(conversation_id, ()))
+        if not futures:
+            return
+        if any(row["conversation_id"] == conversation_id for row, _ in self._pending):
+            await self.flush()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+    async def close(self):
+        """
+        Flush what is left; call on application shutdown.
+        """
+        if self._pending:
+            await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": CHAT_MESSAGE_WRITE_BEHIND,
+            "pending": len(self._pending),
+            "flushed_batches": self.flushed_batches,
+            "flushed_messages": self.flushed_messages,
+        }
+
+
+message_queue = MessageWriteBehindQueue()
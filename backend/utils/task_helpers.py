@@ -0,0 +1,115 @@
+from sqlmodel import Session
+from sqlalchemy import delete, insert, not_, update
+from models.database import Task, TaskTombstone
+from core.task_events import record_task_change
+from typing import Any, Dict, Iterable, Optional
+from datetime import datetime, timedelta
+import os
+
+# Tombstones older than this are purged; sync cursors older than it expire
+TASK_TOMBSTONE_RETENTION_DAYS = float(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+def update_owned_task(
+    db: Session, task_id: int, user_id: str, values: Dict[str, Any]
+) -> Optional[Task]:
+    """
+    Update a user's task with a single UPDATE ... RETURNING statement.
+
+    The ownership check is part of the WHERE clause, so there is no separate
+    SELECT before the write and no refresh after it.
+
+    Args:
+        db: Database session (the caller commits)
+        task_id: ID of the task to update
+        user_id: ID of the user who must own the task
+        values: Column values to set; updated_at is always bumped
+
+    Returns:
+        The updated task, detached from the session so reading it after the
+        commit doesn't trigger a reload, or None if the user has no such task
+    """
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(Task)
+        # Overwrite any copy of the row already loaded in this session
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    task = db.execute(statement).scalars().first()
+    if task is None:
+        return None
+
+    db.expunge(task)
+    record_task_change(db, user_id)
+    return task
+
+
+def toggle_owned_task(db: Session, task_id: int, user_id: str) -> Optional[Task]:
+    """
+    Flip a user's task completion status in the database in one round-trip.
+
+    Args:
+        db: Database session (the caller commits)
+        task_id: ID of the task to toggle
+        user_id: ID of the user who must own the task
+
+    Returns:
+        The updated (detached) task, or None if the user has no such task
+    """
+    return update_owned_task(db, task_id, user_id, {"completed": not_(Task.completed)})
+
+
+def delete_owned_task(db: Session, task_id: int, user_id: str) -> bool:
+    """
+    Delete a user's task with a single DELETE ... RETURNING statement.
+
+    Args:
+        db: Database session (the caller commits)
+        task_id: ID of the task to delete
+        user_id: ID of the user who must own the task
+
+    Returns:
+        True if a task was deleted, False if the user has no such task
+    """
+    statement = (
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id = db.execute(statement).scalar()
+    if deleted_id is None:
+        return False
+
+    record_task_deletions(db, user_id, [deleted_id])
+    record_task_change(db, user_id)
+    return True
+
+
+def record_task_deletions(db: Session, user_id: str, task_ids: Iterable[int]):
+    """
+    Leave a tombstone for each deleted task so delta sync can report it.
+
+    The user's tombstones past the retention period are purged in the same
+    transaction, which keeps the table bounded without a background job.
+
+    Args:
+        db: Database session (the caller commits)
+        user_id: ID of the user who owned the tasks
+        task_ids: IDs of the deleted tasks
+    """
+    now = datetime.utcnow()
+    rows = [{"task_id": task_id, "user_id": user_id, "deleted_at": now} for task_id in task_ids]
+    if not rows:
+        return
+    db.execute(insert(TaskTombstone), rows)
+    db.execute(
+        delete(TaskTombstone)
+        .where(
+            TaskTombstone.user_id == user_id,
+            TaskTombstone.deleted_at < now - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS)
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,149 @@
+from sqlmodel import Session, select
+from sqlalchemy import case, func, literal, literal_column, or_, text
+from models.database import Task
+from typing import Dict, List, Tuple
+from difflib import SequenceMatcher
+import re
+
+# Same expressions as the indexes of migrations/versions/0004; Postgres only
+# uses an expression index when the query repeats the expression exactly
+SEARCH_CONFIG = "simple"
+SEARCH_DOCUMENT = func.to_tsvector(
+    literal(SEARCH_CONFIG, literal_execute=True),
+    func.coalesce(Task.title, literal_column("''")) + literal_column("' '")
+    + func.coalesce(Task.description, literal_column("''"))
+)
+SEARCH_TITLE = func.lower(Task.title)
+
+# Fuzzy matches below this similarity (0-1) are not results
+FUZZY_MIN_SIMILARITY = 0.75
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# pg_trgm availability per database URL, looked up once
+_trigram_available: Dict[str, bool] = {}
+
+
+def search_owned_tasks(
+    db: Session, user_id: str, query: str, limit: int
+) -> Tuple[List[Task], int]:
+    """
+    Search a user's tasks by title and description, best matches first.
+
+    On PostgreSQL the query runs against the full-text and trigram indexes
+    (prefix word matches, substrings and typos); on other databases, such as
+    the SQLite used in tests, the user's tasks are ranked in Python with the
+    same ordering rules. Exact titles rank first, then titles starting with
+    the query; pending and recently updated tasks break ties.
+
+    Args:
+        db: Database session
+        user_id: ID of the user whose tasks to search
+        query: Free-text search query
+        limit: Maximum number of tasks to return
+
+    Returns:
+        (matching tasks, up to limit; total number of matches)
+    """
+    needle = " ".join(query.lower().split())
+    if not needle:
+        return [], 0
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, user_id, needle, limit)
+    return _search_python(db, user_id, needle, limit)
+
+
+def _has_trigram(db: Session) -> bool:
+    bind = db.get_bind()
+    url = str(bind.url)
+    if url not in _trigram_available:
+        _trigram_available[url] = db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+    return _trigram_available[url]
+
+
+def _search_postgres(db: Session, user_id: str, needle: str, limit: int) -> Tuple[List[Task], int]:
+    words = _WORD.findall(needle)
+    matches = [SEARCH_TITLE.contains(needle, autoescape=True)]
+    score = literal(0.0)
+
+    if words:
+        # Every word, each as a prefix: "groc mil" finds "Buy groceries and milk"
+        ts_query = func.to_tsquery(
+            literal(SEARCH_CONFIG, literal_execute=True), " & ".join(f"{word}:*" for word in words)
+        )
+        matches.append(SEARCH_DOCUMENT.op("@@")(ts_query))
+        score = score + func.ts_rank(SEARCH_DOCUMENT, ts_query)
+
+    if _has_trigram(db):
+        # Typos: the query is close to some word sequence of the title
+        matches.append(literal(needle).op("<%")(SEARCH_TITLE))
+        score = score + func.word_similarity(needle, SEARCH_TITLE)
+
+    conditions = [Task.user_id == user_id, or_(*matches)]
+    relevance = case(
+        (SEARCH_TITLE == needle, 0),
+        (SEARCH_TITLE.startswith(needle, autoescape=True), 1),
+        else_=2
+    )
+    tasks = db.exec(
+        select(Task).where(*conditions).order_by(
+            relevance, score.desc(), Task.completed, Task.updated_at.desc(), Task.id.desc()
+        ).limit(limit)
+    ).all()
+
+    total = len(tasks)
+    if total == limit:
+        total = db.exec(select(func.count()).select_from(Task).where(*conditions)).one()
+    return list(tasks), total
+
+
+def _similarity(needle_words: List[str], words: List[str]) -> float:
+    """
+    Average, over the query words, of the best match among the text's words.
+    """
+    if not words:
+        return 0.0
+    total = 0.0
+    for needle_word in needle_words:
+        total += max(SequenceMatcher(None, needle_word, word).ratio() for word in words)
+    return total / len(needle_words)
+
+
+def _python_score(needle: str, needle_words: List[str], task: Task) -> float:
+    title = task.title.lower()
+    description = (task.description or "").lower()
+    if title == needle:
+        return 5.0
+    if title.startswith(needle):
+        return 4.0
+    if needle in title:
+        return 3.0
+
+    words = _WORD.findall(title) + _WORD.findall(description)
+    if needle_words and all(any(word.startswith(n) for word in words) for n in needle_words):
+        return 2.0
+    if needle in description:
+        return 1.5
+
+    # Typo tolerance for words long enough to compare meaningfully
+    if needle_words and all(len(word) >= 3 for word in needle_words):
+        similarity = _similarity(needle_words, words)
+        if similarity >= FUZZY_MIN_SIMILARITY:
+            return similarity
+    return 0.0
+
+
+def _search_python(db: Session, user_id: str, needle: str, limit: int) -> Tuple[List[Task], int]:
+    needle_words = _WORD.findall(needle)
+    scored = []
+    for task in db.exec(select(Task).where(Task.user_id == user_id)).all():
+        score = _python_score(needle, needle_words, task)
+        if score > 0:
+            scored.append((score, task))
+
+    scored.sort(key=lambda item: (
+        -item[0], item[1].completed, -item[1].updated_at.timestamp(), -(item[1].id or 0)
+    ))
+    return [task for _, task in scored[:limit]], len(scored)
@@ -0,0 +1,89 @@
+from sqlmodel import Session, select
+from models.database import Task, TaskTombstone
+from schemas.task import TaskChanges, TaskRead, TaskTombstoneRead
+from core.pagination import encode_cursor, decode_cursor, paginate
+from core.exceptions import SyncCursorExpiredException
+from utils.task_helpers import TASK_TOMBSTONE_RETENTION_DAYS
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+import os
+
+# updated_at is stamped before the commit, so a slow transaction can commit a
+# row older than rows already synced. Once a client is caught up, its cursor
+# is set this many seconds before the sync so such rows are sent on the next
+# one (clients apply changes idempotently, so repeats are harmless).
+TASK_SYNC_OVERLAP_SECONDS = float(os.getenv("TASK_SYNC_OVERLAP_SECONDS", "30"))
+
+_CURSOR_KEY = "changes"
+_CURSOR_TYPES = (datetime, int, datetime, int)
+
+TASK_CHANGE_ORDER = ((Task.updated_at, False), (Task.id, False))
+TOMBSTONE_ORDER = ((TaskTombstone.deleted_at, False), (TaskTombstone.id, False))
+
+Position = Tuple[datetime, int]
+
+
+def _advance(last: Optional[Position], truncated: bool, now: datetime) -> Position:
+    """
+    Next cursor position of one stream (tasks or tombstones).
+    """
+    if truncated:
+        # More rows follow; continue exactly after the last one sent
+        return last
+    # Caught up: everything up to now was read. Move to now (less the
+    # overlap) even when nothing changed, so an idle stream's cursor stays
+    # fresh and doesn't hit the retention expiry
+    return (now - timedelta(seconds=max(0.0, TASK_SYNC_OVERLAP_SECONDS)), 0)
+
+
+def fetch_task_changes(db: Session, user_id: str, since: Optional[str], limit: int) -> TaskChanges:
+    """
+    Tasks created or updated, and tasks deleted, since a sync cursor.
+
+    Without a cursor every task is returned (a full sync) and deletions are
+    tracked from now on. Both streams are read in (timestamp, id) keyset
+    order over the (user_id, updated_at, id) and (user_id, deleted_at, id)
+    indexes, at most `limit` rows each; has_more tells the client to call
+    again right away with the returned cursor. Clients should apply
+    `deleted` before `tasks`.
+
+    Raises:
+        SyncCursorExpiredException: If the cursor predates the tombstone
+            retention period, so deletions may have been purged
+    """
+    now = datetime.utcnow()
+    if since:
+        task_ts, task_id, tombstone_ts, tombstone_id = decode_cursor(since, _CURSOR_KEY, _CURSOR_TYPES)
+        if tombstone_ts < now - timedelta(days=TASK_TOMBSTONE_RETENTION_DAYS):
+            raise SyncCursorExpiredException()
+        task_after: Optional[Position] = (task_ts, task_id)
+        tombstone_after: Optional[Position] = (tombstone_ts, tombstone_id)
+    else:
+        task_after = None
+        tombstone_after = (now - timedelta(seconds=TASK_SYNC_OVERLAP_SECONDS), 0)
+
+    tasks = db.exec(paginate(
+        select(Task).where(Task.user_id == user_id), TASK_CHANGE_ORDER, limit, task_after
+    )).all()
+    tombstones = db.exec(paginate(
+        select(TaskTombstone).where(TaskTombstone.user_id == user_id), TOMBSTONE_ORDER, limit, tombstone_after
+    )).all()
+
+    tasks_truncated = len(tasks) > limit
+    tombstones_truncated = len(tombstones) > limit
+    tasks = tasks[:limit]
+    tombstones = tombstones[:limit]
+
+    task_position = _advance(
+        (tasks[-1].updated_at, tasks[-1].id) if tasks else None, tasks_truncated, now
+    )
+    tombstone_position = _advance(
+        (tombstones[-1].deleted_at, tombstones[-1].id) if tombstones else None, tombstones_truncated, now
+    )
+
+    return TaskChanges(
+        tasks=[TaskRead(**task.model_dump()) for task in tasks],
+        deleted=[TaskTombstoneRead(id=tombstone.task_id, deleted_at=tombstone.deleted_at) for tombstone in tombstones],
+        cursor=encode_cursor(_CURSOR_KEY, [*task_position, *tombstone_position]),
+        has_more=tasks_truncated or tombstones_truncated,
+    )
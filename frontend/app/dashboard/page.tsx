@@ -3,7 +3,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { useAuth } from '../../hooks/useAuth';
-import { getTasks, createTask, Task } from '../../lib/api';
+import { getTasks, createTask, subscribeToTaskChanges, Task } from '../../lib/api';
 import ProtectedRoute from '../../components/ProtectedRoute';
 import Navbar from '../../components/Navbar';
 import TaskCard from '../../components/TaskCard';
@@ -31,7 +31,10 @@ const DashboardPage = () => {
       }
     };
 
-    if (user) fetchTasks();
+    if (!user) return;
+    fetchTasks();
+    // Reload when tasks change elsewhere (e.g. through the chatbot) instead of polling
+    return subscribeToTaskChanges(fetchTasks);
   }, [user]);
 
   const handleCreateTask = async (taskData: { title: string; description?: string }) => {
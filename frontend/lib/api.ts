@@ -32,6 +32,9 @@ const authClient = createAuthClient({
   baseURL: process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000',
 });
 
+// Tasks fetched per request by getTasks (the backend allows up to 500)
+const TASK_PAGE_SIZE = 500;
+
 class ApiClient {
   private baseUrl: string;
   private token: string | null = null;
@@ -62,6 +65,12 @@ class ApiClient {
 
   // Generic request method with JWT handling
   async request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+    const { data } = await this.requestWithHeaders<T>(endpoint, options);
+    return data;
+  }
+
+  // Same as request, also returning the response headers (e.g. X-Next-Cursor)
+  async requestWithHeaders<T>(endpoint: string, options: RequestInit = {}): Promise<{ data: T; headers: Headers }> {
     // Robustly join base URL and endpoint (avoid double slashes or missing slashes)
     const normalizedBase = this.baseUrl.replace(/\/$/, '');
     const normalizedEndpoint = endpoint.startsWith('/') ? endpoint : `/${endpoint}`;
@@ -103,12 +112,12 @@ class ApiClient {
 
       // For 204 No Content responses, return null
       if (response.status === 204) {
-        return null as T;
+        return { data: null as T, headers: response.headers };
       }
 
       const data = await response.json();
       console.log(`✅ API Success: ${url}`, data);
-      return data;
+      return { data, headers: response.headers };
     } catch (error: any) {
       console.error(`💥 Fetch Exception for ${url}:`, {
         name: error.name,
@@ -149,10 +158,19 @@ class ApiClient {
     if (params?.status) searchParams.append('status', params.status);
     if (params?.sort) searchParams.append('sort', params.sort);
 
-    const queryString = searchParams.toString();
-    const endpoint = `/tasks${queryString ? `?${queryString}` : ''}`;
+    // Tasks come in pages; follow X-Next-Cursor until the last one
+    searchParams.append('limit', String(TASK_PAGE_SIZE));
+    const tasks: Task[] = [];
+    let cursor: string | null = null;
+    do {
+      const pageParams = new URLSearchParams(searchParams);
+      if (cursor) pageParams.append('cursor', cursor);
+      const { data, headers } = await this.requestWithHeaders<Task[]>(`/tasks?${pageParams.toString()}`);
+      tasks.push(...data);
+      cursor = headers.get('X-Next-Cursor');
+    } while (cursor);
 
-    return this.request<Task[]>(endpoint);
+    return tasks;
   }
 
   async createTask(taskData: { title: string; description?: string }) {
@@ -188,6 +206,56 @@ class ApiClient {
   async getTaskSummary() {
     return this.request<TaskSummary>('/tasks/summary');
   }
+
+  // Short-lived token for opening the task change feed (EventSource can't send headers)
+  async getTaskEventsToken() {
+    return this.request<{ token: string; expires_in: number }>('/tasks/events/token', {
+      method: 'POST',
+    });
+  }
+
+  // Call onChange whenever the user's tasks change (here, in the chat or in
+  // another tab); returns a function that closes the feed
+  subscribeToTaskChanges(onChange: () => void): () => void {
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | null = null;
+    let stopped = false;
+    let connected = false;
+
+    const reconnect = (delay: number) => {
+      if (!stopped) retry = setTimeout(connect, delay);
+    };
+
+    const connect = async () => {
+      try {
+        const { token } = await this.getTaskEventsToken();
+        if (stopped) return;
+        const normalizedBase = this.baseUrl.replace(/\/$/, '');
+        source = new EventSource(`${normalizedBase}/tasks/events?token=${encodeURIComponent(token)}`);
+        source.addEventListener('ready', () => {
+          // Changes made while disconnected were missed; reload once
+          if (connected) onChange();
+          connected = true;
+        });
+        source.addEventListener('tasks_changed', () => onChange());
+        source.onerror = () => {
+          // The token only opens the stream, so reconnect with a fresh one
+          source?.close();
+          reconnect(3000);
+        };
+      } catch (error) {
+        console.error('Task change feed unavailable:', error);
+        reconnect(10000);
+      }
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      source?.close();
+      if (retry) clearTimeout(retry);
+    };
+  }
 }
 
 // Create a singleton instance
@@ -203,4 +271,5 @@ export const getTask = apiClient.getTask.bind(apiClient);
 export const updateTask = apiClient.updateTask.bind(apiClient);
 export const deleteTask = apiClient.deleteTask.bind(apiClient);
 export const toggleTaskCompletion = apiClient.toggleTaskCompletion.bind(apiClient);
-export const getTaskSummary = apiClient.getTaskSummary.bind(apiClient);
\ No newline at end of file
+export const getTaskSummary = apiClient.getTaskSummary.bind(apiClient);
+export const subscribeToTaskChanges = apiClient.subscribeToTaskChanges.bind(apiClient);
\ No newline at end of file